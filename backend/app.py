@@ -1,46 +1,220 @@
 # backend/app.py
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from .inventory_management.api.auth import router as auth_router
-from .inventory_management.api.inventory import router as inventory_router
-from .inventory_management.api.shopping_list import router as shopping_router
+from contextlib import asynccontextmanager
+from threading import Thread
+
+from fastapi import FastAPI, Request
 from shared_utils.logging.logger import get_logger
 
 logger = get_logger("backend_app")
 
-app = FastAPI(
-    title="Inventory Management System",
-    description="API for inventory management, shopping lists, and users",
-    version="1.0.0",
-)
 
-# ---- Middleware ----
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Change to your frontend URL in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def _lifespan(with_event_listener: bool):
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # ---- Startup ----
+        from .inventory_management.core import config
+        from .inventory_management.db.indexes import ensure_indexes_in_background
+        from .inventory_management.db.mongo_queries import (
+            seed_email_filter_in_background,
+        )
+
+        logger.info("Backend starting up...")
+        ensure_indexes_in_background()
+        seed_email_filter_in_background(
+            config.SIGNUP_EMAIL_FILTER_CAPACITY, config.SIGNUP_EMAIL_FILTER_ERROR_RATE
+        )
+        from .inventory_management.event_sourcing.outbox import (
+            start_relay_in_background,
+        )
+
+        publish = None
+        if config.OUTBOX_PUBLISH:
+            from shared_utils.message_queue.mq_client import publish_events
+
+            publish = publish_events
+        start_relay_in_background(
+            config.OUTBOX_RELAY_INTERVAL_MS / 1000,
+            batch_size=config.OUTBOX_BATCH_SIZE,
+            delete_grace=config.OUTBOX_DELETE_GRACE_S,
+            publish=publish,
+        )
+        if config.PROJECTION_ENABLED:
+            from .inventory_management.event_sourcing.projector import (
+                start_projector_in_background,
+            )
+
+            start_projector_in_background(
+                config.PROJECTION_POLL_INTERVAL_MS / 1000,
+                batch_size=config.PROJECTION_BATCH_SIZE,
+                gap_timeout=config.PROJECTION_GAP_TIMEOUT_S,
+            )
+        from .inventory_management.cqrs.queries import (
+            clear_item_queries,
+            invalidate_item_queries,
+        )
+        from .inventory_management.event_sourcing.projector import (
+            start_follower_in_background,
+        )
+
+        # Every worker follows the view's changes, wherever the projector runs
+        start_follower_in_background(
+            config.QUERY_CACHE_FOLLOW_INTERVAL_MS / 1000,
+            on_change=invalidate_item_queries,
+            on_reset=clear_item_queries,
+        )
+        if config.CV_MODEL_WARMUP:
+            from .computer_vision.model.predict import warmup_in_background
+
+            warmup_in_background()
+        if with_event_listener:
+            from .inventory_management.api.event_listener import (
+                start_listener_blocking,
+            )
+
+            # Run the event listener in a separate daemon thread
+            Thread(target=start_listener_blocking, daemon=True).start()
+        yield
+        # ---- Shutdown ----
+        from shared_utils.db.mongo_client import close_clients
+        from .inventory_management.core.passwords import get_password_hasher
+        from .inventory_management.event_sourcing.outbox import stop_relay
+        from .inventory_management.event_sourcing.projector import (
+            stop_follower,
+            stop_projector,
+        )
+
+        logger.info("Backend shutting down...")
+        if with_event_listener:
+            from .inventory_management.api.event_listener import stop_listener
+
+            stop_listener()
+        stop_relay()
+        stop_projector()
+        stop_follower()
+        get_password_hasher().shutdown()
+        close_clients()
+
+    return lifespan
+
+
+def create_app(with_event_listener: bool = False) -> FastAPI:
+    """
+    Build the backend app. Routers, middleware and their dependencies are
+    imported here rather than at module import; settings, database clients,
+    caches and the write coalescer are created on first use.
+    """
+    from fastapi.middleware.cors import CORSMiddleware
+
+    from .inventory_management.api.admission import (
+        AdmissionControlMiddleware,
+        default_limiters,
+    )
+    from .inventory_management.api.auth import router as auth_router
+    from .inventory_management.api.compression import CompressionMiddleware
+    from .inventory_management.api.inventory import router as inventory_router
+    from .inventory_management.api.responses import FastJSONResponse
+    from .inventory_management.api.routes import router as api_router
+    from .inventory_management.api.shopping_list import router as shopping_router
+    from .inventory_management.core.passwords import get_password_hasher
+    from .inventory_management.core.security import token_cache_stats
+    from .inventory_management.cqrs.queries import query_cache_stats
+    from .inventory_management.db.mongo_queries import EMAIL_FILTER, cache_stats
+    from .inventory_management.event_sourcing.outbox import relay_stats
+    from .inventory_management.event_sourcing.projector import (
+        follower_stats,
+        projector_stats,
+    )
+    from shared_utils.db.mongo_client import get_pool_stats
+
+    app = FastAPI(
+        title="Inventory Management System",
+        description="API for inventory management, shopping lists, and users",
+        version="1.0.0",
+        default_response_class=FastJSONResponse,
+        lifespan=_lifespan(with_event_listener),
+    )
+
+    # ---- Middleware ----
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Change to your frontend URL in production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(CompressionMiddleware)
+    # Added last so it runs first: shed load before any other work is done
+    app.state.admission_limiters = default_limiters()
+    app.add_middleware(
+        AdmissionControlMiddleware, limiters=app.state.admission_limiters
+    )
+
+    # ---- Include Routers ----
+    app.include_router(auth_router, prefix="/auth", tags=["Auth"])
+    app.include_router(inventory_router, prefix="/inventory", tags=["Inventory"])
+    app.include_router(shopping_router, prefix="/shopping-list", tags=["Shopping List"])
+    app.include_router(api_router)  # already prefixed with /api
+
+    # ---- Root Endpoint ----
+    @app.get("/")
+    def root():
+        return {"message": "Inventory Management API is running!"}
+
+    @app.get("/ready")
+    def readiness():
+        from .computer_vision.model import predict
+        from .inventory_management.core import config
+
+        # The vision model only gates traffic where it is warmed at startup
+        ready = predict.is_ready() or not config.CV_MODEL_WARMUP
+        return FastJSONResponse(
+            {"ready": ready, "model": predict.model.status()},
+            status_code=200 if ready else 503,
+        )
+
+    @app.get("/metrics/mongo-pool")
+    def mongo_pool_stats():
+        return {"mongo_pool": get_pool_stats()}
+
+    @app.get("/metrics/admission")
+    def admission_stats(request: Request):
+        limiters = request.app.state.admission_limiters
+        return {"admission": {name: lim.stats() for name, lim in limiters.items()}}
+
+    @app.get("/metrics/passwords")
+    def password_hashing_stats():
+        return {"passwords": get_password_hasher().stats()}
 
-# ---- Include Routers ----
-app.include_router(auth_router, prefix="/auth", tags=["Auth"])
-app.include_router(inventory_router, prefix="/inventory", tags=["Inventory"])
-app.include_router(shopping_router, prefix="/shopping-list", tags=["Shopping List"])
+    @app.get("/metrics/email-filter")
+    def email_filter_stats():
+        return {"email_filter": EMAIL_FILTER.stats()}
 
+    @app.get("/metrics/outbox")
+    def outbox_stats():
+        return {"outbox": relay_stats()}
 
-# ---- Root Endpoint ----
-@app.get("/")
-def root():
-    return {"message": "Inventory Management API is running!"}
+    @app.get("/metrics/projection")
+    def projection_stats():
+        return {"projection": projector_stats()}
 
+    @app.get("/metrics/cache")
+    def read_cache_stats():
+        return {
+            "caches": {
+                **cache_stats(),
+                "tokens": token_cache_stats(),
+                "queries": query_cache_stats(),
+            },
+            "query_invalidation": follower_stats(),
+        }
 
-# ---- Startup / Shutdown events ----
-@app.on_event("startup")
-def startup_event():
-    logger.info("Backend starting up...")
+    return app
 
 
-@app.on_event("shutdown")
-def shutdown_event():
-    logger.info("Backend shutting down...")
+def __getattr__(name: str):
+    # `uvicorn backend.app:app` and `from backend.app import app` build the
+    # app on first access instead of at import
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
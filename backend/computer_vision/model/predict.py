@@ -1,12 +1,113 @@
+import threading
+import time
 from pathlib import Path
-from ultralytics import YOLO
-import cv2
+
+from shared_utils.logging.logger import get_logger
+
+logger = get_logger("predict")
 
 # Path to your trained YOLOv8 model
 MODEL_PATH = Path(__file__).parent / "runs/train/exp_yolov8_cuda2/weights/best.pt"
+WARMUP_IMAGE_SIZE = 640
+
+
+def _load_yolo(path):
+    from ultralytics import YOLO
+
+    return YOLO(str(path))
+
+
+def _blank_image(size: int):
+    import numpy as np
+
+    return np.zeros((size, size, 3), dtype=np.uint8)
+
+
+class LazyModel:
+    """
+    Handle to the YOLOv8 model that loads the weights on first use (or on
+    warmup()), so importing this module costs nothing. ready only becomes
+    True once warmup() has run a dummy inference.
+    """
+
+    def __init__(self, path, loader=_load_yolo):
+        self.path = Path(path)
+        self._loader = loader
+        self._model = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self.warmup_error = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
 
-# Load YOLOv8 model
-model = YOLO(str(MODEL_PATH))
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def get(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:  # another thread may have loaded it
+                    start = time.perf_counter()
+                    self._model = self._loader(self.path)
+                    self.load_seconds = time.perf_counter() - start
+        return self._model
+
+    def warmup(self, source=None, imgsz: int = WARMUP_IMAGE_SIZE):
+        """
+        Load the model and run one inference on a blank image so kernels and
+        allocators are primed before the first real request.
+        """
+        model = self.get()
+        if source is None:
+            source = _blank_image(imgsz)
+        start = time.perf_counter()
+        model.predict(source, imgsz=imgsz, verbose=False)
+        self.warmup_seconds = time.perf_counter() - start
+        self._ready.set()
+        return self
+
+    def status(self) -> dict:
+        return {
+            "path": str(self.path),
+            "loaded": self.loaded,
+            "ready": self.ready,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "warmup_error": self.warmup_error,
+        }
+
+
+# YOLOv8 model, loaded on first prediction or warmup()
+model = LazyModel(MODEL_PATH)
+
+
+def warmup():
+    """Load and prime the model; call at worker startup, before serving."""
+    return model.warmup()
+
+
+def _warmup_logged():
+    try:
+        warmup()
+    except Exception as e:  # missing weights or ultralytics: stay not ready
+        model.warmup_error = repr(e)
+        logger.exception("Model warmup failed")
+
+
+def warmup_in_background() -> threading.Thread:
+    """Warm the model on a daemon thread so startup is not blocked."""
+    thread = threading.Thread(target=_warmup_logged, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_ready() -> bool:
+    return model.ready
 
 
 def predict_image(
@@ -29,7 +130,8 @@ def predict_image(
         raise FileNotFoundError(f"Image not found: {image_path}")
 
     # Run inference
-    results = model.predict(str(image_path), conf=conf_threshold)
+    yolo = model.get()
+    results = yolo.predict(str(image_path), conf=conf_threshold)
 
     detections_list = []
     for result in results:
@@ -37,13 +139,15 @@ def predict_image(
             x1, y1, x2, y2 = box.xyxy[0].tolist()
             conf = box.conf[0].item()
             cls_id = int(box.cls[0].item())
-            label = model.names[cls_id]
+            label = yolo.names[cls_id]
             detections_list.append(
                 {"label": label, "confidence": float(conf), "bbox": [x1, y1, x2, y2]}
             )
 
     # Optionally save image with bounding boxes
     if save_result:
+        import cv2
+
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         img = cv2.imread(str(image_path))
@@ -0,0 +1,218 @@
+# backend/inventory_management/api/admission.py
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+from shared_utils.logging.logger import get_logger
+
+logger = get_logger("admission")
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+EXEMPT_PREFIXES = ("/metrics", "/docs", "/redoc", "/openapi.json")
+# main.py also serves the auth router under /api
+API_AUTH_PATHS = {"/api/signup", "/api/login", "/api/logout", "/api/me"}
+# Streamed for as long as the client takes to read them
+EXPORT_PATHS = {"/api/items/export"}
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit for one route class, with a bounded FIFO queue.
+
+    The limit adapts AIMD-style to an EWMA of request latency: it grows by
+    1/limit per fast completion and shrinks by 10% (at most once per latency
+    window) while the EWMA is above target_latency. Requests beyond the
+    limit wait in the queue for up to queue_timeout; once the queue holds
+    max_queue requests, new ones are shed immediately.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        target_latency: float,
+        queue_timeout: float = 2.0,
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.target_latency = target_latency
+        self.queue_timeout = queue_timeout
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.ewma_latency: Optional[float] = None
+        self._waiters = deque()
+        self._last_decrease = 0.0
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    async def acquire(self) -> bool:
+        """True once admitted; False if the request should be rejected."""
+        if self._has_capacity() and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            return False
+        except asyncio.CancelledError:
+            # Client went away after being handed a slot: give it back
+            if waiter.done() and not waiter.cancelled():
+                self.release(None)
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self, latency: Optional[float]) -> None:
+        self.in_flight -= 1
+        if latency is not None:
+            self._observe(latency)
+        self._wake()
+
+    def _observe(self, latency: float) -> None:
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = 0.8 * self.ewma_latency + 0.2 * latency
+
+        now = time.monotonic()
+        if self.ewma_latency > self.target_latency:
+            if now - self._last_decrease >= self.ewma_latency:
+                self.limit = max(self.min_limit, self.limit * 0.9)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _wake(self) -> None:
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            if waiter.done():  # timed out or cancelled while queued
+                continue
+            self.in_flight += 1
+            self.admitted += 1
+            waiter.set_result(True)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait: roughly one queue drain."""
+        latency = self.ewma_latency or self.target_latency
+        drain = latency * (len(self._waiters) + 1) / max(int(self.limit), 1)
+        return max(1, math.ceil(drain))
+
+    def stats(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+            "ewma_latency_ms": round((self.ewma_latency or 0.0) * 1000, 2),
+            "target_latency_ms": self.target_latency * 1000,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+        }
+
+
+def default_limiters() -> dict:
+    # auth gets its own pool (and the deepest queue) so a read or write
+    # backlog never delays logins; bcrypt makes its target latency higher.
+    # Exports hold their slot until the last row is sent, so they get a
+    # small pool of their own instead of starving ordinary reads
+    return {
+        "auth": AdaptiveLimiter(
+            "auth", min_limit=4, max_limit=32, max_queue=256, target_latency=1.0
+        ),
+        "read": AdaptiveLimiter(
+            "read", min_limit=4, max_limit=64, max_queue=128, target_latency=0.25
+        ),
+        "write": AdaptiveLimiter(
+            "write", min_limit=2, max_limit=32, max_queue=64, target_latency=0.5
+        ),
+        "export": AdaptiveLimiter(
+            "export", min_limit=1, max_limit=8, max_queue=16, target_latency=0.5
+        ),
+    }
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """auth / export / read / write, or None for routes that bypass admission."""
+    if path == "/" or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if path.startswith("/auth") or path in API_AUTH_PATHS:
+        return "auth"
+    if method == "GET" and path in EXPORT_PATHS:
+        return "export"
+    return "write" if method in WRITE_METHODS else "read"
+
+
+class AdmissionControlMiddleware:
+    """
+    Admits each HTTP request through its route class's AdaptiveLimiter and
+    answers 503 with Retry-After when the limiter rejects it. A request
+    holds its slot until its body is sent, but only its time to first byte
+    feeds the latency signal.
+    """
+
+    def __init__(self, app, limiters: dict = None):
+        self.app = app
+        self.limiters = limiters or default_limiters()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = route_class(scope["method"], scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[name]
+        if not await limiter.acquire():
+            logger.warning(f"Shedding {scope['method']} {scope['path']} ({name})")
+            response = JSONResponse(
+                {"detail": "Server is busy, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(limiter.retry_after())},
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        latency = None
+        completed = False
+
+        async def timed_send(message):
+            nonlocal latency
+            # Latency is time to first byte: a long streamed body (an NDJSON
+            # export, say) says nothing about how loaded the server is
+            if message["type"] == "http.response.start":
+                latency = time.perf_counter() - start
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+            completed = True
+        finally:
+            # Failed requests free their slot without skewing the latency signal
+            limiter.release(latency if completed else None)
+
+    def stats(self) -> dict:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
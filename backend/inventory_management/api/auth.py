@@ -1,15 +1,26 @@
-from fastapi import APIRouter, HTTPException, Response, status, Cookie
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Cookie
 from pydantic import BaseModel
 from typing import Optional
-from passlib.context import CryptContext
-
-from ..db.mongo_queries import insert_user, get_user_by_email
+from pymongo.errors import DuplicateKeyError
+from shared_utils.logging.logger import get_logger
+
+from ..db.async_mongo_queries import (
+    EMAIL_FILTER,
+    insert_user,
+    get_user_by_email,
+    update_user,
+)
 from ..db.models import User
-from ..core.security import create_access_token, verify_access_token
-from ..core.config import JWT_SECRET, ACCESS_TOKEN_EXPIRE_MINUTES
+from ..core.passwords import get_password_hasher
+from ..core.security import (
+    create_access_token,
+    revoke_access_token,
+    verify_access_token,
+)
+from ..core import config
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = get_logger("auth")
 
 
 # Models
@@ -25,24 +36,32 @@ class LoginRequest(BaseModel):
 
 
 @router.post("/signup")
-def signup(data: SignupRequest, response: Response):
-    if get_user_by_email(data.email):
-        raise HTTPException(status_code=400, detail="Email already registered")
-
-    hashed_password = pwd_context.hash(data.password)
+async def signup(data: SignupRequest, response: Response):
+    # Certainly-new emails skip the read; the rest check as before
+    if EMAIL_FILTER.may_contain(data.email):
+        if await get_user_by_email(data.email):
+            raise HTTPException(status_code=400, detail="Email already registered")
+        EMAIL_FILTER.record_miss()
+
+    # bcrypt is CPU-bound; it runs on the password process pool
+    hashed_password = await get_password_hasher().hash(data.password)
     user = User(
         email=data.email, full_name=data.full_name, password_hash=hashed_password
     )
-    inserted_id = insert_user(user)
+    try:
+        inserted_id = await insert_user(user)
+    except DuplicateKeyError:
+        # Registered by another worker, or in a race with a concurrent signup
+        raise HTTPException(status_code=400, detail="Email already registered")
 
     access_token = create_access_token(
-        data={"sub": str(inserted_id)}, secret_key=JWT_SECRET
+        data={"sub": str(inserted_id)}, secret_key=config.JWT_SECRET
     )
     response.set_cookie(
         key="access_token",
         value=access_token,
         httponly=True,
-        max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        max_age=config.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
         samesite="lax",
         secure=False,  # False for dev; True for prod HTTPS
     )
@@ -55,41 +74,69 @@ def signup(data: SignupRequest, response: Response):
 
 
 @router.post("/login")
-def login(data: LoginRequest, response: Response):
-    user = get_user_by_email(data.email)
-    if not user or not pwd_context.verify(data.password, user.password_hash):
+async def login(data: LoginRequest, response: Response):
+    user = await get_user_by_email(data.email)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    valid, new_hash = await get_password_hasher().verify(
+        data.password, user.password_hash
+    )
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid email or password")
+    if new_hash:
+        # Stored at an older bcrypt cost: upgrade while we have the password
+        await update_user(str(user.id), {"password_hash": new_hash})
+        logger.info(f"Rehashed password for user {user.id}")
 
     access_token = create_access_token(
-        data={"sub": str(user.id)}, secret_key=JWT_SECRET
+        data={"sub": str(user.id)}, secret_key=config.JWT_SECRET
     )
     response.set_cookie(
         key="access_token",
         value=access_token,
         httponly=True,
-        max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        max_age=config.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
         samesite="lax",
     )
     return {"message": "Login successful", "user_id": str(user.id)}
 
 
-@router.post("/logout")
-def logout(response: Response):
-    response.delete_cookie("access_token")
-    return {"message": "Logged out"}
-
-
-@router.get("/me")
-def get_current_user(access_token: Optional[str] = Cookie(None)):
+async def get_current_user(access_token: Optional[str] = Cookie(None)) -> str:
+    """The authenticated user's id, for every route that needs one."""
     if not access_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
         )
 
-    user_id = verify_access_token(access_token, secret_key=JWT_SECRET)
+    user_id = verify_access_token(access_token, secret_key=config.JWT_SECRET)
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
+    return user_id
+
+
+async def get_repository_user(
+    access_token: Optional[str] = Cookie(None),
+) -> Optional[str]:
+    """
+    Owner for the /inventory and /shopping-list repositories: the
+    authenticated user with the Mongo backend, None for the shared
+    in-memory demo store, which needs no login.
+    """
+    if config.REPOSITORY_BACKEND != "mongo":
+        return None
+    return await get_current_user(access_token)
+
+
+@router.post("/logout")
+async def logout(response: Response, access_token: Optional[str] = Cookie(None)):
+    if access_token:
+        revoke_access_token(access_token, secret_key=config.JWT_SECRET)
+    response.delete_cookie("access_token")
+    return {"message": "Logged out"}
 
+
+@router.get("/me")
+async def me(user_id: str = Depends(get_current_user)):
     return {"user_id": user_id}
@@ -0,0 +1,182 @@
+# backend/inventory_management/api/compression.py
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from .conditional import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # optional: without it we only offer gzip
+    brotli = None
+
+DEFAULT_MINIMUM_SIZE = 1024
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick "br" or "gzip" from an Accept-Encoding header by q-value, preferring
+    br on ties. Returns None when neither is acceptable.
+    """
+    qualities = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        qualities[name.strip()] = q
+    # "*" only covers encodings the client did not name explicitly
+    wildcard = qualities.get("*", 0.0)
+    offered = {
+        encoding: qualities.get(encoding, wildcard)
+        for encoding in (("br", "gzip") if brotli else ("gzip",))
+    }
+    best = max(offered, key=lambda encoding: offered[encoding])
+    return best if offered[best] > 0 else None
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        # wbits=31 writes a gzip header/trailer instead of raw zlib
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Negotiated br/gzip compression for responses of at least minimum_size
+    bytes. Streaming bodies are compressed chunk by chunk with a sync flush,
+    so NDJSON exports still reach the client incrementally.
+
+    A compressed response's strong ETag gets the coding as a suffix (see
+    conditional.encoded_etag), and a 304 answering a suffixed tag repeats it.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        excluded_media_types: tuple = ("text/event-stream",),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_media_types = excluded_media_types
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+        await self.app(
+            scope, receive, _CompressingSend(self, encoding, send, if_none_match)
+        )
+
+    def compressor(self, encoding: str):
+        if encoding == "br":
+            return _Brotli(self.brotli_quality)
+        return _Gzip(self.gzip_level)
+
+
+class _CompressingSend:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        encoding: str,
+        send,
+        if_none_match: str = "",
+    ):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.if_none_match = if_none_match
+        self.start_message = None
+        self.compressor = None
+        self.passthrough = False
+
+    def _should_compress(self, headers: MutableHeaders, body: bytes, more: bool):
+        media_type = headers.get("content-type", "").split(";")[0].strip()
+        return not (
+            "content-encoding" in headers
+            or media_type in self.middleware.excluded_media_types
+            or (not more and len(body) < self.middleware.minimum_size)
+        )
+
+    def _revalidated(self, start) -> None:
+        # A 304 has no body to compress; it repeats the tag the client sent
+        headers = MutableHeaders(raw=start["headers"])
+        etag = headers.get("etag")
+        if etag and encoded_etag(etag, self.encoding) in self.if_none_match:
+            headers["ETag"] = encoded_etag(etag, self.encoding)
+            headers.add_vary_header("Accept-Encoding")
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            if message["status"] == 304:
+                self._revalidated(message)
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            if self.start_message is not None:
+                await self.send(self.start_message)
+                self.start_message = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            if not self._should_compress(headers, body, more):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+            self.compressor = self.middleware.compressor(self.encoding)
+            if not more:
+                body = self.compressor.finish(body)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({**message, "body": body})
+                return
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self.send(start)
+
+        body = self.compressor.chunk(body) if more else self.compressor.finish(body)
+        await self.send({**message, "body": body})
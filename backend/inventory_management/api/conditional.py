@@ -0,0 +1,60 @@
+# backend/inventory_management/api/conditional.py
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def make_etag(version, request: Request, *scope) -> str:
+    """
+    Strong ETag for one representation: the collection version plus whatever
+    else shapes the body (query string, caller). Read the version before
+    the data so a concurrent write can only make the tag stale-low, which
+    costs the client one extra 200, never a wrong 304.
+    """
+    key = "|".join([str(version), request.url.query, *map(str, scope)])
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+# Content codings CompressionMiddleware may apply; each gets its own tag
+ENCODINGS = ("br", "gzip")
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    The tag of etag's representation after content coding: a compressed
+    body differs byte for byte, so it cannot share the strong tag.
+    """
+    if not etag.startswith('"'):
+        return etag  # weak tags may be shared by both
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _identity_tag(tag: str) -> str:
+    tag = tag.strip().removeprefix("W/")
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """
+    If-None-Match check (weak comparison, as RFC 9110 requires for GET).
+    Tags of compressed representations match the tag they were made from.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (_identity_tag(tag) for tag in header.split(","))
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def etag_headers(etag: str) -> dict:
+    # Let browsers keep the body but always revalidate it
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
@@ -1,45 +1,101 @@
-from fastapi import APIRouter, HTTPException
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from ..core import config
+from .auth import get_repository_user
+from .conditional import etag_headers, make_etag, not_modified, not_modified_response
+from .responses import FastJSONResponse
+from ..db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from ..db.repository import (
+    InMemoryRepository,
+    InvalidItemError,
+    Repository,
+    mongo_inventory_repository,
+)
 
 router = APIRouter()
 
-inventory_items = [
-    {"id": 1, "name": "Laptop", "quantity": 5},
-    {"id": 2, "name": "Phone", "quantity": 10},
+SEED_ITEMS = [
+    {"name": "Laptop", "quantity": 5},
+    {"name": "Phone", "quantity": 10},
 ]
 
 
+@lru_cache(maxsize=None)
+def get_repository() -> Repository:
+    if config.REPOSITORY_BACKEND == "mongo":
+        return mongo_inventory_repository()
+    return InMemoryRepository(SEED_ITEMS)
+
+
 @router.get("/", summary="Get all inventory items")
-def get_inventory():
-    return {"inventory": inventory_items}
+def get_inventory(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user_id: Optional[str] = Depends(get_repository_user),
+    repo: Repository = Depends(get_repository),
+):
+    etag = make_etag(repo.version(user_id), request, user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    try:
+        page = repo.list(user_id, cursor=cursor, limit=limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(
+        {"inventory": page["items"], "next_cursor": page["next_cursor"]},
+        headers=etag_headers(etag),
+    )
 
 
 @router.get("/{item_id}", summary="Get a specific inventory item")
-def get_inventory_item(item_id: int):
-    item = next((item for item in inventory_items if item["id"] == item_id), None)
+def get_inventory_item(
+    item_id: str,
+    user_id: Optional[str] = Depends(get_repository_user),
+    repo: Repository = Depends(get_repository),
+):
+    item = repo.get(item_id, user_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     return item
 
 
 @router.post("/", summary="Add a new inventory item")
-def add_inventory_item(item: dict):
-    item["id"] = len(inventory_items) + 1
-    inventory_items.append(item)
-    return item
+def add_inventory_item(
+    item: dict,
+    user_id: Optional[str] = Depends(get_repository_user),
+    repo: Repository = Depends(get_repository),
+):
+    try:
+        return repo.add(item, user_id)
+    except InvalidItemError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 
 @router.put("/{item_id}", summary="Update an existing inventory item")
-def update_inventory_item(item_id: int, updated_item: dict):
-    for idx, item in enumerate(inventory_items):
-        if item["id"] == item_id:
-            inventory_items[idx].update(updated_item)
-            inventory_items[idx]["id"] = item_id
-            return inventory_items[idx]
-    raise HTTPException(status_code=404, detail="Item not found")
+def update_inventory_item(
+    item_id: str,
+    updated_item: dict,
+    user_id: Optional[str] = Depends(get_repository_user),
+    repo: Repository = Depends(get_repository),
+):
+    try:
+        item = repo.update(item_id, updated_item, user_id)
+    except InvalidItemError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return item
 
 
 @router.delete("/{item_id}", summary="Delete an inventory item")
-def delete_inventory_item(item_id: int):
-    global inventory_items
-    inventory_items = [item for item in inventory_items if item["id"] != item_id]
+def delete_inventory_item(
+    item_id: str,
+    user_id: Optional[str] = Depends(get_repository_user),
+    repo: Repository = Depends(get_repository),
+):
+    repo.delete(item_id, user_id)
     return {"message": "Item deleted successfully"}
@@ -0,0 +1,33 @@
+# backend/inventory_management/api/responses.py
+from typing import Any
+
+import orjson
+from bson.objectid import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value):
+    """Types orjson does not handle natively (datetime and dataclasses it does)."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson-backed default response class. Endpoints that return one directly
+    also skip FastAPI's jsonable_encoder pass, which is most of the cost for
+    large listings.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,32 +1,205 @@
-from fastapi import APIRouter, HTTPException, Depends, Cookie, status
-from typing import Optional
-from ..db import mongo_queries as mq
-from .auth import verify_access_token
-from ..core.config import JWT_SECRET
+from functools import lru_cache
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    Query,
+    Request,
+)
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+from pydantic import AliasChoices, BaseModel, Field, model_validator
+from ..db import async_mongo_queries as amq
+from ..cqrs import comands, queries
+from ..db.coalescer import WriteCoalescer
+from ..db.loader import RequestLoaders, enrich_items
+from ..db.models import InventoryItem
+from ..db.mongo_queries import CATALOG_VERSION, ITEMS_VERSION, search_items
+from ..db.pagination import InvalidCursorError, MAX_PAGE_SIZE
+from .auth import get_current_user
+from .conditional import etag_headers, make_etag, not_modified, not_modified_response
+from .responses import FastJSONResponse, dumps
+from ..core import config
 
 router = APIRouter(prefix="/api", tags=["inventory"])
 
 
-def get_current_user(access_token: Optional[str] = Cookie(None)):
-    if not access_token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
-        )
-    user_id = verify_access_token(access_token, secret_key=JWT_SECRET)
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-        )
-    return user_id
+# Models
+class ItemCreateRequest(BaseModel):
+    name: str
+    category_id: Optional[str] = None
+    location_id: Optional[str] = None
+    quantity: int = 0
+
+
+class BulkOperation(BaseModel):
+    """One entry of POST /items/bulk; see mongo_queries.bulk_write_items."""
+
+    op: Literal["create", "update", "quantity", "delete"]
+    item_id: Optional[str] = Field(None, validation_alias=AliasChoices("item_id", "id"))
+    item: Optional[ItemCreateRequest] = None
+    fields: Optional[Dict[str, Any]] = None
+    delta: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_payload(self):
+        required = {
+            "create": ("item",),
+            "update": ("item_id", "fields"),
+            "quantity": ("item_id", "delta"),
+            "delete": ("item_id",),
+        }[self.op]
+        missing = [name for name in required if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"{self.op} needs {', '.join(missing)}")
+        return self
+
+
+@lru_cache(maxsize=None)
+def get_item_creates() -> Optional[WriteCoalescer]:
+    # Concurrent creates share one insert_many when enabled (see WriteCoalescer)
+    if not config.WRITE_COALESCING:
+        return None
+    return WriteCoalescer(
+        comands.create_items_batch,
+        max_batch=config.WRITE_COALESCE_MAX_BATCH,
+        max_delay=config.WRITE_COALESCE_MAX_DELAY_MS / 1000,
+    )
+
+
+def get_loaders() -> RequestLoaders:
+    return RequestLoaders()
 
 
 @router.get("/items")
-def list_items(current_user: str = Depends(get_current_user)):
-    items = mq.get_all_items()
-    return {"items": items}
+async def list_items(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    expand: bool = False,
+    current_user: str = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
+):
+    # Polling clients revalidate against the version counters alone;
+    # expanded items also carry category and location names
+    version = await amq.get_version(ITEMS_VERSION, current_user)
+    if expand:
+        version = f"{version}|{await amq.get_version(CATALOG_VERSION)}"
+    etag = make_etag(version, request, current_user)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+
+    try:
+        page = await amq.list_items_page(
+            {"user_id": current_user}, cursor=cursor, limit=limit
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if expand:
+        # category_name / location_name: 2 batched queries for the whole page
+        page["items"] = await enrich_items(page["items"], loaders)
+    return FastJSONResponse(page, headers=etag_headers(etag))
+
+
+@router.get("/items/view")
+def list_items_view(
+    category_id: Optional[str] = None,
+    current_user: str = Depends(get_current_user),
+):
+    # Sync route over the read model (cqrs/queries): whole lists from the
+    # query cache for dashboards. It may trail a write until the projector
+    # catches up, so it has no ETag; GET /items stays on the items
+    # collection because its ETag is the version the command just bumped.
+    filters = {"user_id": current_user}
+    if category_id:
+        filters["category_id"] = category_id
+    return FastJSONResponse({"items": queries.list_all_items(filters)})
+
+
+async def ndjson_stream(
+    docs: AsyncIterator[dict], flush_every: int = amq.EXPORT_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Encode documents as NDJSON with orjson (the FastJSONResponse encoder), one
+    chunk per flush_every rows. The first row is flushed on its own so
+    time-to-first-byte does not wait for a batch.
+    """
+    lines = []
+    first = True
+    async for doc in docs:
+        doc["id"] = str(doc.pop("_id"))
+        lines.append(dumps(doc))
+        if first or len(lines) >= flush_every:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+            first = False
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+@router.get("/items/export")
+async def export_items(current_user: str = Depends(get_current_user)):
+    return StreamingResponse(
+        ndjson_stream(amq.iter_items({"user_id": current_user})),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/items/search")
+def search_inventory(
+    q: str = Query(..., min_length=1, max_length=100),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    current_user: str = Depends(get_current_user),
+):
+    # Sync route: the first search for a user builds its index with a
+    # blocking name scan; later ones are in-memory lookups
+    try:
+        page = search_items(current_user, q, cursor=cursor, limit=limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(page)
+
+
+@router.get("/summary")
+async def inventory_summary(current_user: str = Depends(get_current_user)):
+    return await amq.get_inventory_summary(current_user)
+
+
+@router.post("/summary/rebuild")
+def rebuild_summary(current_user: str = Depends(get_current_user)):
+    comands.rebuild_inventory_summary(current_user)
+    return {"message": "Summary rebuilt"}
+
+
+@router.post("/items/bulk")
+def bulk_items(
+    operations: List[BulkOperation], current_user: str = Depends(get_current_user)
+):
+    # Sync route: the CQRS command does one blocking bulk_write (events ride
+    # along in each item's outbox; deletes write theirs ahead)
+    operations = [operation.model_dump(exclude_none=True) for operation in operations]
+    return {"results": comands.bulk_change_items(operations, user_id=current_user)}
+
+
+@router.post("/shopping-list/checkout")
+def checkout_shopping_list(current_user: str = Depends(get_current_user)):
+    # Sync route: the command does blocking bulk writes, events included
+    return comands.checkout_shopping_list(current_user)
 
 
 @router.post("/items")
-def create_item(item: dict, current_user: str = Depends(get_current_user)):
-    new_item = mq.insert_item(item)
-    return {"message": "Item created", "item_id": str(new_item.inserted_id)}
+async def create_item(
+    item: ItemCreateRequest, current_user: str = Depends(get_current_user)
+):
+    new_item = InventoryItem(**item.model_dump(), user_id=current_user)
+    item_creates = get_item_creates()
+    if item_creates is not None:
+        item_id = await item_creates.submit(new_item)
+    else:
+        # Same command as a coalesced batch of one, so the item gets its
+        # ItemCreated event and version bump here too
+        (item_id,) = await comands.create_items_batch([new_item])
+        if isinstance(item_id, Exception):
+            raise item_id
+    return {"message": "Item created", "item_id": item_id}
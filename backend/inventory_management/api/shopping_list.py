@@ -1,45 +1,101 @@
-from fastapi import APIRouter, HTTPException
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from ..core import config
+from .auth import get_repository_user
+from .conditional import etag_headers, make_etag, not_modified, not_modified_response
+from .responses import FastJSONResponse
+from ..db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from ..db.repository import (
+    InMemoryRepository,
+    InvalidItemError,
+    Repository,
+    mongo_shopping_repository,
+)
 
 router = APIRouter()
 
-shopping_list = [
-    {"id": 1, "name": "Batteries", "quantity": 2},
-    {"id": 2, "name": "Charger", "quantity": 1},
+SEED_ITEMS = [
+    {"name": "Batteries", "quantity": 2},
+    {"name": "Charger", "quantity": 1},
 ]
 
 
+@lru_cache(maxsize=None)
+def get_repository() -> Repository:
+    if config.REPOSITORY_BACKEND == "mongo":
+        return mongo_shopping_repository()
+    return InMemoryRepository(SEED_ITEMS)
+
+
 @router.get("/", summary="Get all shopping list items")
-def get_shopping_list():
-    return {"shopping_list": shopping_list}
+def get_shopping_list(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user_id: Optional[str] = Depends(get_repository_user),
+    repo: Repository = Depends(get_repository),
+):
+    etag = make_etag(repo.version(user_id), request, user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    try:
+        page = repo.list(user_id, cursor=cursor, limit=limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(
+        {"shopping_list": page["items"], "next_cursor": page["next_cursor"]},
+        headers=etag_headers(etag),
+    )
 
 
 @router.get("/{item_id}", summary="Get a specific shopping list item")
-def get_shopping_item(item_id: int):
-    item = next((item for item in shopping_list if item["id"] == item_id), None)
+def get_shopping_item(
+    item_id: str,
+    user_id: Optional[str] = Depends(get_repository_user),
+    repo: Repository = Depends(get_repository),
+):
+    item = repo.get(item_id, user_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     return item
 
 
 @router.post("/", summary="Add a new item to the shopping list")
-def add_shopping_item(item: dict):
-    item["id"] = len(shopping_list) + 1
-    shopping_list.append(item)
-    return item
+def add_shopping_item(
+    item: dict,
+    user_id: Optional[str] = Depends(get_repository_user),
+    repo: Repository = Depends(get_repository),
+):
+    try:
+        return repo.add(item, user_id)
+    except InvalidItemError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 
 @router.put("/{item_id}", summary="Update an existing shopping list item")
-def update_shopping_item(item_id: int, updated_item: dict):
-    for idx, item in enumerate(shopping_list):
-        if item["id"] == item_id:
-            shopping_list[idx].update(updated_item)
-            shopping_list[idx]["id"] = item_id
-            return shopping_list[idx]
-    raise HTTPException(status_code=404, detail="Item not found")
+def update_shopping_item(
+    item_id: str,
+    updated_item: dict,
+    user_id: Optional[str] = Depends(get_repository_user),
+    repo: Repository = Depends(get_repository),
+):
+    try:
+        item = repo.update(item_id, updated_item, user_id)
+    except InvalidItemError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return item
 
 
 @router.delete("/{item_id}", summary="Delete a shopping list item")
-def delete_shopping_item(item_id: int):
-    global shopping_list
-    shopping_list = [item for item in shopping_list if item["id"] != item_id]
+def delete_shopping_item(
+    item_id: str,
+    user_id: Optional[str] = Depends(get_repository_user),
+    repo: Repository = Depends(get_repository),
+):
+    repo.delete(item_id, user_id)
     return {"message": "Item deleted successfully"}
@@ -1,32 +1,82 @@
 import os
-from dotenv import load_dotenv
-from pathlib import Path
-
-# Load dev.env from root/config/environment/dev.env
-env_path = Path(__file__).resolve().parents[3] / "config/environment/dev.env"
-load_dotenv(dotenv_path=env_path)
-
-# General settings
-PROJECT_NAME = os.getenv("PROJECT_NAME", "inventory-management-system")
-ENV = os.getenv("ENV", "dev")
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-
-# MongoDB settings
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = int(os.getenv("DB_PORT", 27017))
-DB_NAME = os.getenv("DB_NAME", "inventory_db")
-DB_USER = os.getenv("DB_USER", "")
-DB_PASS = os.getenv("DB_PASS", "")
-
-# Authentication / JWT
-JWT_SECRET = os.getenv(
-    "JWT_SECRET", "15d8a8d55656ac3421cb936ea502d556ca365b743a01520b3c69b05abf4e5d9d"
-)
+
+# dev.env (root/config/environment/dev.env) is loaded on first use by the
+# same load_environment() the Mongo and message queue clients call
+from shared_utils.config.environment import load_environment
+
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day by default
 
-# Inventory API settings
-IM_API_HOST = os.getenv("IM_API_HOST", "0.0.0.0")
-IM_API_PORT = int(os.getenv("IM_API_PORT", 8001))
 
-# Logging
-LOG_FILE_PATH = os.getenv("LOG_FILE_PATH", "logs/inventory.log")
+def _flag(value: str) -> bool:
+    return str(value).lower() in ("1", "true")
+
+
+# Settings are read from the environment on first access, not at import time,
+# so importing this module (and everything that depends on it) stays free of
+# file I/O. name -> (default, type)
+_SETTINGS = {
+    # General settings
+    "PROJECT_NAME": ("inventory-management-system", str),
+    "ENV": ("dev", str),
+    "LOG_LEVEL": ("INFO", str),
+    # MongoDB settings
+    "DB_HOST": ("localhost", str),
+    "DB_PORT": (27017, int),
+    "DB_NAME": ("inventory_db", str),
+    "DB_USER": ("", str),
+    "DB_PASS": ("", str),
+    # Authentication / JWT
+    "JWT_SECRET": (
+        "15d8a8d55656ac3421cb936ea502d556ca365b743a01520b3c69b05abf4e5d9d",
+        str,
+    ),
+    # bcrypt cost; stored hashes at another cost are rehashed on login
+    "BCRYPT_ROUNDS": (12, int),
+    # Password hashing process pool: 0 workers means one per CPU
+    "PASSWORD_HASH_WORKERS": (0, int),
+    "PASSWORD_HASH_MAX_PENDING": (64, int),
+    # Signup email Bloom filter: expected registered users and false-positive rate
+    "SIGNUP_EMAIL_FILTER_CAPACITY": (1_000_000, int),
+    "SIGNUP_EMAIL_FILTER_ERROR_RATE": (0.01, float),
+    # Inventory read model projector: poll interval, events per batch, and
+    # how long a missing event position is waited for before it is skipped
+    "PROJECTION_ENABLED": ("true", _flag),
+    "PROJECTION_POLL_INTERVAL_MS": (500, float),
+    "PROJECTION_BATCH_SIZE": (500, int),
+    "PROJECTION_GAP_TIMEOUT_S": (5, float),
+    # Outbox relay: poll interval, entries per batch, whether to publish to
+    # the event exchange too, and how long a written-ahead delete or rename
+    # may wait for its change to show
+    "OUTBOX_RELAY_INTERVAL_MS": (100, float),
+    "OUTBOX_BATCH_SIZE": (500, int),
+    "OUTBOX_PUBLISH": ("false", _flag),
+    "OUTBOX_DELETE_GRACE_S": (30, float),
+    # How often each worker reads the projector's change log to drop cached
+    # item query results
+    "QUERY_CACHE_FOLLOW_INTERVAL_MS": (250, float),
+    # Load and prime the vision model at startup; GET /ready reports 503
+    # until it is done
+    "CV_MODEL_WARMUP": ("false", _flag),
+    # Inventory API settings
+    "IM_API_HOST": ("0.0.0.0", str),
+    "IM_API_PORT": (8001, int),
+    # Storage behind the /inventory and /shopping-list routers: "memory" or "mongo"
+    "REPOSITORY_BACKEND": ("memory", str),
+    # Opt-in coalescing of concurrent POST /api/items into one insert_many
+    "WRITE_COALESCING": ("false", _flag),
+    "WRITE_COALESCE_MAX_BATCH": (64, int),
+    "WRITE_COALESCE_MAX_DELAY_MS": (2, float),
+    # Logging
+    "LOG_FILE_PATH": ("logs/inventory.log", str),
+}
+
+
+def __getattr__(name: str):
+    try:
+        default, cast = _SETTINGS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    load_environment()
+    value = cast(os.getenv(name, default))
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
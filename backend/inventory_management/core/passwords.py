@@ -0,0 +1,137 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from . import config
+
+
+# -------------------- Worker side --------------------
+# These run inside the pool's processes, so they must be importable
+# top-level functions and only take/return picklable values.
+@lru_cache(maxsize=None)
+def _context(rounds: int):
+    from passlib.context import CryptContext
+
+    # min == max == default: any hash at another cost reports needs_update,
+    # so verify_and_update() rehashes it whether the cost went up or down
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def _hash(password: str, rounds: int) -> Tuple[str, float]:
+    started = time.monotonic()
+    return _context(rounds).hash(password), started
+
+
+def _verify(password: str, password_hash: str, rounds: int):
+    started = time.monotonic()
+    valid, new_hash = _context(rounds).verify_and_update(password, password_hash)
+    return (valid, new_hash), started
+
+
+# -------------------- Caller side --------------------
+class PasswordHasher:
+    """
+    bcrypt hashing and verification on a dedicated process pool, so password
+    work never holds a request thread or the GIL.
+
+    At most max_pending calls are submitted to the pool at once; the rest
+    wait their turn on the event loop. queue time (submit to a worker
+    picking the call up) and run time are tracked for /metrics/passwords.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_pending: int):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._slots = None
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.queue_ms_total = 0.0
+        self.queue_ms_max = 0.0
+        self.run_ms_total = 0.0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs Motor and uvicorn threads is
+            # unsafe, and the workers only need passlib
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        submitted = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started = await loop.run_in_executor(self._pool(), fn, *args)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+        finished = time.monotonic()
+        queue_ms = max(started - submitted, 0.0) * 1000
+        self.completed += 1
+        self.queue_ms_total += queue_ms
+        self.queue_ms_max = max(self.queue_ms_max, queue_ms)
+        self.run_ms_total += (finished - started) * 1000
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password, self.rounds)
+
+    async def verify(
+        self, password: str, password_hash: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Returns:
+            (valid, new_hash): new_hash is set when the stored hash used a
+            different cost and should replace it
+        """
+        return await self._run(_verify, password, password_hash, self.rounds)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        done = self.completed or 1
+        return {
+            "rounds": self.rounds,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "avg_queue_ms": round(self.queue_ms_total / done, 2),
+            "max_queue_ms": round(self.queue_ms_max, 2),
+            "avg_run_ms": round(self.run_ms_total / done, 2),
+        }
+
+
+@lru_cache(maxsize=None)
+def get_password_hasher() -> PasswordHasher:
+    return PasswordHasher(
+        rounds=config.BCRYPT_ROUNDS,
+        workers=config.PASSWORD_HASH_WORKERS or multiprocessing.cpu_count(),
+        max_pending=config.PASSWORD_HASH_MAX_PENDING,
+    )
@@ -1,35 +1,119 @@
+import hashlib
+import heapq
+import threading
+import time
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from typing import Optional
-from .config import (
-    JWT_SECRET,
-    ACCESS_TOKEN_EXPIRE_MINUTES,
-)
+from . import config
+from ..db.cache import MISSING, LRUCache
 
 ALGORITHM = "HS256"
 
+# Verified tokens -> (sub, exp), so a client's repeat requests skip the
+# signature check. Entries are dropped at the token's own exp; the cache TTL
+# is only an upper bound.
+TOKEN_CACHE = LRUCache(
+    "tokens", maxsize=10000, ttl=config.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+# Digests of logged-out tokens -> exp, kept until the token would have
+# expired anyway and never dropped before that, so the set is bounded by
+# logouts per token lifetime. A heap of (exp, digest) finds the expired
+# ones. Per process: other workers only see their own logouts.
+_revoked = {}
+_revoked_expiry = []
+_revoked_lock = threading.Lock()
+
 
 def create_access_token(
-    data: dict, expires_delta: timedelta = None, secret_key: str = JWT_SECRET
+    data: dict, expires_delta: timedelta = None, secret_key: str = None
 ) -> str:
     """
     Generate a JWT token.
     """
     to_encode = data.copy()
     expire = datetime.utcnow() + (
-        expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expires_delta or timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, secret_key, algorithm=ALGORITHM)
+    return jwt.encode(to_encode, secret_key or config.JWT_SECRET, algorithm=ALGORITHM)
+
+
+def _token_digest(token: str, secret_key: str) -> str:
+    # Keyed by the secret too, so a token is never served from the cache
+    # for a secret it was not verified against
+    return hashlib.blake2b(
+        token.encode(), key=secret_key.encode()[:64], digest_size=16
+    ).hexdigest()
+
+
+def _decode(token: str, secret_key: str) -> Optional[dict]:
+    try:
+        return jwt.decode(token, secret_key, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+
+
+def _is_revoked(digest: str, now: float) -> bool:
+    with _revoked_lock:
+        exp = _revoked.get(digest)
+        if exp is not None and exp <= now:
+            del _revoked[digest]
+            return False
+        return exp is not None
 
 
-def verify_access_token(token: str, secret_key: str = JWT_SECRET) -> Optional[str]:
+def verify_access_token(token: str, secret_key: str = None) -> Optional[str]:
     """
     Verify JWT token and return user_id (sub) if valid.
     """
-    try:
-        payload = jwt.decode(token, secret_key, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        return user_id
-    except JWTError:
+    secret_key = secret_key or config.JWT_SECRET
+    digest = _token_digest(token, secret_key)
+    now = time.time()
+    if _is_revoked(digest, now):
+        return None
+
+    cached = TOKEN_CACHE.get(digest)
+    if cached is not MISSING:
+        user_id, exp = cached
+        if exp is None or exp > now:
+            return user_id
+        TOKEN_CACHE.invalidate(digest)
+        return None
+
+    payload = _decode(token, secret_key)
+    if payload is None:
         return None
+    user_id: str = payload.get("sub")
+    TOKEN_CACHE.set(digest, (user_id, payload.get("exp")))
+    return user_id
+
+
+def revoke_access_token(token: str, secret_key: str = None) -> bool:
+    """
+    Reject token from now on (logout). Returns False for tokens that are
+    already invalid, which need no revoking.
+    """
+    secret_key = secret_key or config.JWT_SECRET
+    payload = _decode(token, secret_key)
+    if payload is None:
+        return False
+    digest = _token_digest(token, secret_key)
+    now = time.time()
+    # A token without exp is valid for good, and so is its revocation
+    exp = payload.get("exp") or float("inf")
+    with _revoked_lock:
+        while _revoked_expiry and _revoked_expiry[0][0] <= now:
+            _, expired = heapq.heappop(_revoked_expiry)
+            if _revoked.get(expired, now) <= now:
+                _revoked.pop(expired, None)
+        _revoked[digest] = exp
+        heapq.heappush(_revoked_expiry, (exp, digest))
+    TOKEN_CACHE.invalidate(digest)
+    return True
+
+
+def token_cache_stats() -> dict:
+    with _revoked_lock:
+        revoked = len(_revoked)
+    return {**TOKEN_CACHE.stats(), "revoked": revoked}
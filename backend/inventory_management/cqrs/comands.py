@@ -1,26 +1,55 @@
-from typing import Dict
+from typing import Dict, List
 from shared_utils.logging.logger import get_logger
 
-from components.inventory_management.db.models import (
+from ..db.models import (
     InventoryItem,
     User,
     ShoppingListItem,
 )
-from components.inventory_management.db.mongo_queries import (
-    delete_item,
+from ..db import async_mongo_queries as amq
+from ..db.mongo_queries import (
+    ITEMS_VERSION,
+    SHOPPING_LIST_VERSION,
+    bump_version,
+    bulk_write_items_with_previous,
+    checkout_shopping_list as checkout_purchased_lines,
+    delete_item_and_get_previous,
     insert_item,
-    update_item,
+    rebuild_inventory_summaries,
+    update_item_and_get_previous,
     update_quantity,
+    update_search_index,
     insert_user,
     update_user,
     insert_shopping_item,
     update_shopping_item,
-    delete_shopping_item,
+    delete_shopping_item_and_get_previous,
 )
-from components.inventory_management.event_sourcing.events import record_event
+from .queries import invalidate_item_queries
 
 logger = get_logger("commands")
 
+# Item events are recorded in the same write as the change itself (see the
+# Outbox section of mongo_queries) and relayed to the event store in
+# batches by event_sourcing/outbox.py. The projector counts them into the
+# inventory summaries, so a command's only other write is its version bump.
+# Commands also drop this process's cached item queries for the owner and
+# the categories touched; the change follower drops them again (and in every
+# other process) once the view has caught up with the write.
+
+
+def _invalidate_queries(user_id: str, changes: list) -> None:
+    """changes: (item_id, before, after) tuples, as for update_search_index."""
+    categories = {
+        state.get("category_id")
+        for _, before, after in changes
+        for state in (before, after)
+        if state
+    }
+    categories.discard(None)
+    invalidate_item_queries(users=[user_id], categories=categories)
+
+
 # ------------------- Inventory Commands -------------------
 
 
@@ -28,24 +57,68 @@ def create_item(item_data: Dict) -> str:
     try:
         item = InventoryItem(**item_data)
         logger.debug(f"Creating item with data: {item_data}")
-        item_id = insert_item(item)
+        item_id = insert_item(item, events=[("ItemCreated", item_data)])
         logger.info(f"Item created with ID: {item_id}")
-        record_event("ItemCreated", {"item_id": item_id, **item_data})
+        bump_version(ITEMS_VERSION, item.user_id)
+        changes = [(item_id, None, item.to_dict())]
+        update_search_index(item.user_id, changes)
+        _invalidate_queries(item.user_id, changes)
         return item_id
     except Exception as e:
         logger.error(f"Failed to create item: {item_data}, error: {e}", exc_info=True)
         raise
 
 
-def update_inventory_item(item_id: str, update_data: Dict):
+async def create_items_batch(items: List[InventoryItem]) -> list:
+    """
+    Async create_item for many items at once: one insert_many for the items
+    and their events, then one version bump per owner.
+    Used by the POST /api/items write coalescer.
+
+    Returns:
+        list: per item, its inserted id or the exception its insert failed with
+    """
+    try:
+        results = await amq.insert_items_batch(items, with_events=True)
+        created = 0
+        index_changes = {}
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Batched create failed for {item.name}: {result}")
+                continue
+            created += 1
+            index_changes.setdefault(item.user_id, []).append(
+                (result, None, item.to_dict())
+            )
+        for user_id, changes in index_changes.items():
+            await amq.bump_version(ITEMS_VERSION, user_id)
+            await amq.update_search_index(user_id, changes)
+            _invalidate_queries(user_id, changes)
+        logger.info(f"Batch created {created}/{len(items)} items")
+        return results
+    except Exception as e:
+        logger.error(f"Failed batch create of {len(items)} items: {e}", exc_info=True)
+        raise
+
+
+def update_inventory_item(item_id: str, update_data: Dict, user_id: str = None):
     try:
         logger.debug(f"Updating item {item_id} with data: {update_data}")
-        updated_item = update_item(item_id, update_data)
-        if updated_item:
+        previous = update_item_and_get_previous(
+            item_id,
+            update_data,
+            events=[("ItemUpdated", {"updated_fields": dict(update_data)})],
+            user_id=user_id,
+        )
+        updated_item = None
+        if previous:
+            current = {**previous, **update_data}
+            updated_item = InventoryItem(**{**current, "id": item_id})
             logger.info(f"Item updated successfully: {item_id}")
-            record_event(
-                "ItemUpdated", {"item_id": item_id, "updated_fields": update_data}
-            )
+            bump_version(ITEMS_VERSION, previous.get("user_id"))
+            changes = [(item_id, previous, current)]
+            update_search_index(previous.get("user_id"), changes)
+            _invalidate_queries(previous.get("user_id"), changes)
         else:
             logger.warning(f"Item not found for update: {item_id}")
         return updated_item
@@ -57,13 +130,19 @@ def update_inventory_item(item_id: str, update_data: Dict):
         raise
 
 
-def delete_inventory_item(item_id: str):
+def delete_inventory_item(item_id: str, user_id: str = None):
     try:
         logger.debug(f"Deleting item: {item_id}")
-        success = delete_item(item_id)
+        previous = delete_item_and_get_previous(
+            item_id, events=[("ItemDeleted", {})], user_id=user_id
+        )
+        success = previous is not None
         if success:
             logger.info(f"Item deleted successfully: {item_id}")
-            record_event("ItemDeleted", {"item_id": item_id})
+            bump_version(ITEMS_VERSION, previous.get("user_id"))
+            changes = [(item_id, previous, None)]
+            update_search_index(previous.get("user_id"), changes)
+            _invalidate_queries(previous.get("user_id"), changes)
         else:
             logger.warning(f"Item not found for deletion: {item_id}")
         return success
@@ -75,10 +154,17 @@ def delete_inventory_item(item_id: str):
 def change_item_quantity(item_id: str, delta: int):
     try:
         logger.debug(f"Changing quantity for item {item_id} by {delta}")
-        updated_item = update_quantity(item_id, delta)
+        updated_item = update_quantity(
+            item_id, delta, events=[("QuantityUpdated", {"delta": delta})]
+        )
         if updated_item:
             logger.info(f"Quantity updated for item {item_id} by {delta}")
-            record_event("QuantityUpdated", {"item_id": item_id, "delta": delta})
+            bump_version(ITEMS_VERSION, updated_item.user_id)
+            # Names are unchanged; this only moves the index past the bump
+            update_search_index(updated_item.user_id, [])
+            _invalidate_queries(
+                updated_item.user_id, [(item_id, None, updated_item.to_dict())]
+            )
         else:
             logger.warning(f"Item not found for quantity update: {item_id}")
         return updated_item
@@ -90,6 +176,71 @@ def change_item_quantity(item_id: str, delta: int):
         raise
 
 
+def bulk_change_items(operations: List[Dict], user_id: str) -> List[Dict]:
+    """
+    Apply a mixed batch of creates, field updates, quantity deltas and
+    deletes, and record their events, in one bulk write.
+    See mongo_queries.bulk_write_items for the operation format.
+    """
+    try:
+        logger.debug(f"Bulk changing {len(operations)} items for user {user_id}")
+        results, previous = bulk_write_items_with_previous(
+            operations, user_id=user_id, with_events=True
+        )
+
+        # Replay the applied ops over the pre-read state for the search index
+        states = dict(previous)
+        index_changes = []
+        for result in results:
+            if result["status"] != "ok":
+                continue
+            operation = operations[result["index"]]
+            item_id = result["item_id"]
+            before = states.get(item_id)
+            if result["op"] == "create":
+                after = InventoryItem(**{**operation["item"], "user_id": user_id})
+                after = after.to_dict()
+            elif result["op"] == "update":
+                after = {**before, **operation["fields"]}
+            elif result["op"] == "quantity":
+                after = {
+                    **before,
+                    "quantity": before.get("quantity", 0) + int(operation["delta"]),
+                }
+            else:
+                after = None
+            states[item_id] = after
+            index_changes.append((item_id, before, after))
+        if index_changes:
+            bump_version(ITEMS_VERSION, user_id)
+            update_search_index(user_id, index_changes)
+            _invalidate_queries(user_id, index_changes)
+
+        logger.info(
+            f"Bulk change for user {user_id}: "
+            f"{len(index_changes)}/{len(operations)} applied"
+        )
+        return results
+    except Exception as e:
+        logger.error(
+            f"Failed bulk change of {len(operations)} items for user {user_id}: {e}",
+            exc_info=True,
+        )
+        raise
+
+
+def rebuild_inventory_summary(user_id: str = None) -> int:
+    """Recompute inventory summaries from scratch (one user, or all)."""
+    try:
+        logger.info(f"Rebuilding inventory summary for {user_id or 'all users'}")
+        return rebuild_inventory_summaries(user_id)
+    except Exception as e:
+        logger.error(
+            f"Failed to rebuild inventory summary for {user_id}: {e}", exc_info=True
+        )
+        raise
+
+
 # ------------------- User Commands -------------------
 
 
@@ -125,6 +276,7 @@ def add_shopping_item(item_data: Dict) -> str:
         item = ShoppingListItem(**item_data)
         item_id = insert_shopping_item(item)
         logger.info(f"Shopping list item added with ID: {item_id}")
+        bump_version(SHOPPING_LIST_VERSION, item.user_id)
         return item_id
     except Exception as e:
         logger.error(
@@ -133,11 +285,12 @@ def add_shopping_item(item_data: Dict) -> str:
         raise
 
 
-def update_shopping_list_item(item_id: str, update_data: Dict):
+def update_shopping_list_item(item_id: str, update_data: Dict, user_id: str = None):
     try:
-        updated_item = update_shopping_item(item_id, update_data)
+        updated_item = update_shopping_item(item_id, update_data, user_id)
         if updated_item:
             logger.info(f"Shopping item updated: {item_id}")
+            bump_version(SHOPPING_LIST_VERSION, updated_item.user_id)
         else:
             logger.warning(f"Shopping item not found for update: {item_id}")
         return updated_item
@@ -146,14 +299,46 @@ def update_shopping_list_item(item_id: str, update_data: Dict):
         raise
 
 
-def remove_shopping_list_item(item_id: str):
+def remove_shopping_list_item(item_id: str, user_id: str = None):
     try:
-        success = delete_shopping_item(item_id)
+        previous = delete_shopping_item_and_get_previous(item_id, user_id)
+        success = previous is not None
         if success:
             logger.info(f"Shopping item removed: {item_id}")
+            bump_version(SHOPPING_LIST_VERSION, previous.get("user_id"))
         else:
             logger.warning(f"Shopping item not found for deletion: {item_id}")
         return success
     except Exception as e:
         logger.error(f"Failed to remove shopping item {item_id}: {e}", exc_info=True)
         raise
+
+
+def checkout_shopping_list(user_id: str) -> Dict:
+    """
+    Move all purchased shopping list lines into the user's inventory with one
+    bulk upsert that also records the resulting item events, and archive the
+    lines. See mongo_queries.checkout_shopping_list for the result format.
+    """
+    try:
+        logger.debug(f"Checking out shopping list for user {user_id}")
+        result, _ = checkout_purchased_lines(user_id)
+
+        index_changes = [
+            (item["item_id"], None, {"name": item["name"]})
+            for item in result["items"]
+            if item["created"]
+        ]
+        if result["lines"]:
+            bump_version(ITEMS_VERSION, user_id)
+            update_search_index(user_id, index_changes)
+            _invalidate_queries(user_id, index_changes)
+            bump_version(SHOPPING_LIST_VERSION, user_id)
+
+        logger.info(f"Checked out {result['lines']} shopping lines for user {user_id}")
+        return result
+    except Exception as e:
+        logger.error(
+            f"Failed to check out shopping list for user {user_id}: {e}", exc_info=True
+        )
+        raise
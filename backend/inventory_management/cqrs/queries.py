@@ -1,24 +1,119 @@
-from mongo_queries import (
-    get_item_by_id,
-    get_items_by_category,
-    list_items,
+import json
+
+from ..db.cache import MISSING, QueryCache
+from ..db.mongo_queries import (
+    SHOPPING_LIST_VERSION,
+    get_inventory_summary,
+    get_view_item,
+    get_view_items_by_category,
+    list_view_items,
+    list_view_items_page,
     get_user_by_id,
     list_users,
+    list_users_page,
     get_shopping_item_by_id,
     list_shopping_items,
+    list_shopping_items_page,
+    get_version,
 )
 from shared_utils.logging.logger import get_logger
 
 logger = get_logger("queries")
 
+# ------------------- Query Result Cache -------------------
+# Whole-list results of the dashboard's repeated reads, keyed by query name
+# plus normalized filter. Item entries are tagged user:<id> / category:<id>
+# and dropped by invalidate_item_queries(), which the app wires to the
+# projector's change log, i.e. once the view they were read from changes.
+# Shopping list entries are checked against the per-user version token the
+# commands bump, so they never outlive a write.
+ITEM_QUERIES = QueryCache("item_queries", maxsize=2000, ttl=300.0)
+SHOPPING_QUERIES = QueryCache("shopping_queries", maxsize=1000, ttl=300.0)
+_SET_OPERATORS = ("$in", "$nin", "$all")
+
+
+def _normalize(value):
+    if isinstance(value, dict):
+        return {
+            key: (
+                sorted(map(_normalize, inner), key=repr)
+                if key in _SET_OPERATORS and isinstance(inner, list)
+                else _normalize(inner)
+            )
+            for key, inner in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize(inner) for inner in value]
+    return value
+
+
+def query_key(name: str, filters: dict = None) -> str:
+    """Cache key that is the same for filters differing only in key or $in order."""
+    return json.dumps([name, _normalize(filters or {})], sort_keys=True, default=str)
+
+
+def _user_ids(filters: dict = None) -> list:
+    """The user_ids a filter is confined to, or [] if it is not."""
+    user_id = (filters or {}).get("user_id")
+    if isinstance(user_id, str):
+        return [user_id]
+    if isinstance(user_id, dict) and set(user_id) == {"$in"}:
+        return [str(value) for value in user_id["$in"]]
+    return []
+
+
+def filter_tags(filters: dict = None) -> set:
+    """
+    What a filtered item query depends on: its users, else its category,
+    else everything (QueryCache.ALL).
+    """
+    users = _user_ids(filters)
+    if users:
+        return {f"user:{user_id}" for user_id in users}
+    category_id = (filters or {}).get("category_id")
+    if isinstance(category_id, str):
+        return {f"category:{category_id}"}
+    return {QueryCache.ALL}
+
+
+def _cached(cache: QueryCache, key: str, tags: set, load, version=None) -> list:
+    value = cache.get(key, version)
+    if value is MISSING:
+        started = cache.begin()
+        value = load()
+        cache.set(key, value, tags, started, version)
+    # Callers get their own list to append to or sort
+    return list(value)
+
+
+def invalidate_item_queries(users=(), categories=()) -> int:
+    """Drop cached item queries that depend on any of users or categories."""
+    tags = {f"user:{user_id}" for user_id in users}
+    tags |= {f"category:{category_id}" for category_id in categories}
+    return ITEM_QUERIES.invalidate(tags)
+
+
+def clear_item_queries() -> None:
+    ITEM_QUERIES.clear()
+
+
+def query_cache_stats() -> dict:
+    return {
+        "items": ITEM_QUERIES.stats(),
+        "shopping_lists": SHOPPING_QUERIES.stats(),
+    }
+
+
 # ------------------- Inventory Queries -------------------
+# Item reads come from the inventory_view read model that
+# event_sourcing/projector.py builds from the command side's events.
 
 
 def get_item(item_id: str):
     """Fetch a single item by ID."""
     try:
         logger.debug(f"Fetching item with ID: {item_id}")
-        item = get_item_by_id(item_id)
+        item = get_view_item(item_id)
         if item:
             logger.info(f"Item found: {item_id}")
         else:
@@ -33,7 +128,12 @@ def list_all_items(filters: dict = None):
     """List all items optionally filtered by a dict."""
     try:
         logger.debug(f"Listing all items with filters: {filters}")
-        items = list_items(filters)
+        items = _cached(
+            ITEM_QUERIES,
+            query_key("list_all_items", filters),
+            filter_tags(filters),
+            lambda: list_view_items(filters),
+        )
         logger.info(f"Returned {len(items)} items")
         return items
     except Exception as e:
@@ -41,11 +141,30 @@ def list_all_items(filters: dict = None):
         raise
 
 
+def list_items_paginated(filters: dict = None, cursor: str = None, limit: int = None):
+    """Return one keyset page of items plus the cursor for the next page."""
+    try:
+        logger.debug(f"Listing items page with filters: {filters}, cursor: {cursor}")
+        page = list_view_items_page(filters, cursor=cursor, limit=limit)
+        logger.info(f"Returned page of {len(page['items'])} items")
+        return page
+    except Exception as e:
+        logger.error(
+            f"Failed to list items page with filters {filters}: {e}", exc_info=True
+        )
+        raise
+
+
 def list_items_by_category(category_id: str):
     """List all items for a specific category."""
     try:
         logger.debug(f"Fetching items by category: {category_id}")
-        items = get_items_by_category(category_id)
+        items = _cached(
+            ITEM_QUERIES,
+            query_key("list_items_by_category", {"category_id": category_id}),
+            {f"category:{category_id}"},
+            lambda: get_view_items_by_category(category_id),
+        )
         logger.info(f"Found {len(items)} items for category {category_id}")
         return items
     except Exception as e:
@@ -55,6 +174,16 @@ def list_items_by_category(category_id: str):
         raise
 
 
+def get_summary(user_id: str) -> dict:
+    """Fetch the precomputed inventory summary for a user (O(1))."""
+    try:
+        logger.debug(f"Fetching inventory summary for user: {user_id}")
+        return get_inventory_summary(user_id)
+    except Exception as e:
+        logger.error(f"Failed to fetch summary for user {user_id}: {e}", exc_info=True)
+        raise
+
+
 # ------------------- User Queries -------------------
 
 
@@ -85,6 +214,20 @@ def list_all_users(filters: dict = None):
         raise
 
 
+def list_users_paginated(filters: dict = None, cursor: str = None, limit: int = None):
+    """Return one keyset page of users plus the cursor for the next page."""
+    try:
+        logger.debug(f"Listing users page with filters: {filters}, cursor: {cursor}")
+        page = list_users_page(filters, cursor=cursor, limit=limit)
+        logger.info(f"Returned page of {len(page['items'])} users")
+        return page
+    except Exception as e:
+        logger.error(
+            f"Failed to list users page with filters {filters}: {e}", exc_info=True
+        )
+        raise
+
+
 # ------------------- Shopping List Queries -------------------
 
 
@@ -107,7 +250,18 @@ def list_all_shopping_items(filters: dict = None):
     """List all shopping list items optionally filtered by a dict."""
     try:
         logger.debug(f"Listing all shopping items with filters: {filters}")
-        items = list_shopping_items(filters)
+        # A point read of the version token instead of the whole list
+        users = _user_ids(filters)
+        version = get_version(
+            SHOPPING_LIST_VERSION, users[0] if len(users) == 1 else None
+        )
+        items = _cached(
+            SHOPPING_QUERIES,
+            query_key("list_all_shopping_items", filters),
+            set(),
+            lambda: list_shopping_items(filters),
+            version,
+        )
         logger.info(f"Returned {len(items)} shopping items")
         return items
     except Exception as e:
@@ -115,3 +269,22 @@ def list_all_shopping_items(filters: dict = None):
             f"Failed to list shopping items with filters {filters}: {e}", exc_info=True
         )
         raise
+
+
+def list_shopping_items_paginated(
+    filters: dict = None, cursor: str = None, limit: int = None
+):
+    """Return one keyset page of shopping list items plus the next cursor."""
+    try:
+        logger.debug(
+            f"Listing shopping items page with filters: {filters}, cursor: {cursor}"
+        )
+        page = list_shopping_items_page(filters, cursor=cursor, limit=limit)
+        logger.info(f"Returned page of {len(page['items'])} shopping items")
+        return page
+    except Exception as e:
+        logger.error(
+            f"Failed to list shopping items page with filters {filters}: {e}",
+            exc_info=True,
+        )
+        raise
@@ -0,0 +1,491 @@
+# backend/inventory_management/db/async_mongo_queries.py
+# Async (Motor) twin of mongo_queries: same function surface and return types,
+# but awaitable so FastAPI serves these routes on the event loop instead of
+# its threadpool. Document building is shared with mongo_queries.
+
+from datetime import datetime, timezone
+from typing import List, Optional
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, WriteError
+from bson.objectid import ObjectId
+from .models import (
+    InventoryItem,
+    Category,
+    Location,
+    User,
+    ShoppingListItem,
+    from_mongo,
+    projection_for,
+)
+from .cache import MISSING, LRUCache
+from .pagination import build_page, clamp_page_size, keyset_filter
+from .summary import empty_summary
+from .mongo_queries import (
+    ACTIVE_LINES,
+    CATALOG_VERSION,
+    CATEGORY_CACHE,
+    EMAIL_FILTER,
+    EXPORT_BATCH_SIZE,
+    ITEMS_VERSION,
+    ITEM_CACHE,
+    LOCATION_CACHE,
+    SEARCH_INDEXES,
+    USER_CACHE,
+    _batch_inventory_docs,
+    _default_inventory_docs,
+    _new_item_doc,
+    _object_ids,
+    _version_key,
+    _version_token,
+    _with_inserted_ids,
+    invalidate_item,
+    invalidate_user,
+)
+from shared_utils.db.mongo_client import get_async_collection
+from shared_utils.logging.logger import get_logger
+
+logger = get_logger("async_mongo_queries")
+
+# -------------------- Collections --------------------
+ITEMS_COLLECTION = get_async_collection("items")
+CATEGORIES_COLLECTION = get_async_collection("categories")
+LOCATIONS_COLLECTION = get_async_collection("locations")
+USERS_COLLECTION = get_async_collection("users")
+SHOPPING_LIST_COLLECTION = get_async_collection("shopping_lists")
+SUMMARY_COLLECTION = get_async_collection("inventory_summaries")
+VERSIONS_COLLECTION = get_async_collection("collection_versions")
+
+
+# -------------------- Read-through Caches --------------------
+# Shared with mongo_queries so sync and async paths invalidate each other
+async def _read_through(cache: LRUCache, key, load):
+    key = str(key)
+    value = cache.get(key)
+    if value is MISSING:
+        value = await load()
+        if value is None:
+            return None
+        cache.set(key, value)
+    return value.model_copy()
+
+
+async def _models_by_ids(collection, cache: LRUCache, model, ids) -> dict:
+    """See mongo_queries._models_by_ids."""
+    found = {}
+    missing = []
+    for oid in _object_ids(ids):
+        cached = cache.get(str(oid))
+        if cached is MISSING:
+            missing.append(oid)
+        else:
+            found[str(oid)] = cached.model_copy()
+    if missing:
+        async for doc in collection.find({"_id": {"$in": missing}}):
+            value = from_mongo(model, doc, validate=True)
+            cache.set(str(doc["_id"]), value)
+            found[str(doc["_id"])] = value.model_copy()
+    return found
+
+
+# -------------------- Inventory --------------------
+async def insert_item(item: InventoryItem, events=()) -> str:
+    result = await ITEMS_COLLECTION.insert_one(_new_item_doc(item, events))
+    logger.info(
+        f"Inserted inventory item: {item.name} for user {item.user_id} with ID {result.inserted_id}"
+    )
+    return str(result.inserted_id)
+
+
+async def insert_items_batch(
+    items: List[InventoryItem], with_events: bool = False
+) -> list:
+    """
+    Insert many items with one unordered insert_many, with_events recording
+    each one's ItemCreated in the same write.
+
+    Returns:
+        list: per item, in order, its inserted id (str) or the WriteError
+        that item failed with; the other items are still inserted
+    """
+    docs = [
+        _new_item_doc(item, [("ItemCreated", item.to_dict())] if with_events else ())
+        for item in items
+    ]
+    failed = {}
+    try:
+        await ITEMS_COLLECTION.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            failed[error["index"]] = WriteError(
+                error.get("errmsg", "write failed"), error.get("code"), error
+            )
+    logger.info(f"Inserted {len(docs) - len(failed)}/{len(docs)} items in batch")
+    # pymongo assigns _id on each document before sending it
+    return [failed.get(i) or str(doc["_id"]) for i, doc in enumerate(docs)]
+
+
+async def insert_inventory_for_user(user_id: str):
+    """
+    Insert default inventory items for a specific user.
+    """
+    result = await ITEMS_COLLECTION.insert_many(_default_inventory_docs(user_id))
+    await bump_version(ITEMS_VERSION, user_id)
+    logger.info(
+        f"[Inventory] Inserted {len(result.inserted_ids)} default items for user {user_id}"
+    )
+
+
+async def _load_item(item_id: str) -> Optional[InventoryItem]:
+    doc = await ITEMS_COLLECTION.find_one({"_id": ObjectId(item_id)})
+    return from_mongo(InventoryItem, doc, validate=True) if doc else None
+
+
+async def get_item_by_id(item_id: str) -> Optional[InventoryItem]:
+    return await _read_through(ITEM_CACHE, item_id, lambda: _load_item(item_id))
+
+
+async def get_items_by_ids(item_ids: list) -> dict:
+    return await _models_by_ids(ITEMS_COLLECTION, ITEM_CACHE, InventoryItem, item_ids)
+
+
+async def list_items(
+    filter: dict = None, validate: bool = False
+) -> List[InventoryItem]:
+    cursor = ITEMS_COLLECTION.find(filter or {}, projection_for(InventoryItem))
+    return [from_mongo(InventoryItem, doc, validate) async for doc in cursor]
+
+
+async def update_item(item_id: str, update_data: dict) -> Optional[InventoryItem]:
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    doc = await ITEMS_COLLECTION.find_one_and_update(
+        {"_id": ObjectId(item_id)},
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER,
+    )
+    invalidate_item(item_id)
+    return InventoryItem(**doc) if doc else None
+
+
+async def delete_item(item_id: str) -> bool:
+    result = await ITEMS_COLLECTION.delete_one({"_id": ObjectId(item_id)})
+    invalidate_item(item_id)
+    return result.deleted_count > 0
+
+
+async def update_quantity(item_id: str, delta: int) -> Optional[InventoryItem]:
+    doc = await ITEMS_COLLECTION.find_one_and_update(
+        {"_id": ObjectId(item_id)},
+        {"$inc": {"quantity": delta}, "$set": {"updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER,
+    )
+    invalidate_item(item_id)
+    return InventoryItem(**doc) if doc else None
+
+
+async def list_items_page(
+    filter: dict = None,
+    cursor: str = None,
+    limit: int = None,
+    validate: bool = False,
+) -> dict:
+    """
+    One keyset page of items, ordered by _id. Pass the previous
+    page's next_cursor to continue.
+
+    Returns:
+        dict: {"items": [...], "next_cursor": str | None}
+    """
+    limit = clamp_page_size(limit)
+    results = (
+        ITEMS_COLLECTION.find(
+            keyset_filter(filter, cursor), projection_for(InventoryItem)
+        )
+        .sort("_id", 1)
+        .limit(limit + 1)
+    )
+    return build_page(
+        await results.to_list(length=None), limit, InventoryItem, validate
+    )
+
+
+async def iter_items(filter: dict = None, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Stream raw item documents (projected to InventoryItem fields) in _id
+    order. See mongo_queries.iter_items.
+    """
+    cursor = ITEMS_COLLECTION.find(
+        filter or {}, projection_for(InventoryItem), batch_size=batch_size
+    ).sort("_id", 1)
+    try:
+        async for doc in cursor:
+            yield doc
+    finally:
+        await cursor.close()
+
+
+async def get_items_by_category(
+    category_id: str, validate: bool = False
+) -> List[InventoryItem]:
+    cursor = ITEMS_COLLECTION.find(
+        {"category_id": category_id}, projection_for(InventoryItem)
+    )
+    return [from_mongo(InventoryItem, doc, validate) async for doc in cursor]
+
+
+async def item_exists(item_id: str) -> bool:
+    count = await ITEMS_COLLECTION.count_documents({"_id": ObjectId(item_id)}, limit=1)
+    return count > 0
+
+
+# -------------------- Batch Inventory Insert --------------------
+async def add_inventory_batch(items: list[dict], user_id: str = None) -> list[dict]:
+    """
+    Inserts multiple inventory items at once. See
+    mongo_queries.add_inventory_batch for the accepted item keys.
+    """
+    if not items:
+        logger.info("No items provided for batch insert.")
+        return []
+
+    items_to_insert = _batch_inventory_docs(items, user_id)
+    result = await ITEMS_COLLECTION.insert_many(items_to_insert)
+    await bump_version(ITEMS_VERSION, user_id)
+    logger.info(f"Inserted {len(result.inserted_ids)} items in batch.")
+
+    return _with_inserted_ids(items_to_insert, result.inserted_ids)
+
+
+# -------------------- Inventory Summary --------------------
+async def get_inventory_summary(user_id: str) -> dict:
+    doc = await SUMMARY_COLLECTION.find_one({"_id": user_id}, {"last_seq": 0})
+    if not doc:
+        return empty_summary(user_id)
+    doc["user_id"] = doc.pop("_id")
+    return {**empty_summary(user_id), **doc}
+
+
+# -------------------- Collection Versions --------------------
+async def bump_version(scope: str, user_id: str = None) -> None:
+    """See mongo_queries.bump_version."""
+    keys = sorted({_version_key(scope), _version_key(scope, user_id)})
+    await VERSIONS_COLLECTION.bulk_write(
+        [
+            UpdateOne(
+                {"_id": key},
+                {"$inc": {"version": 1}, "$setOnInsert": {"epoch": str(ObjectId())}},
+                upsert=True,
+            )
+            for key in keys
+        ],
+        ordered=False,
+    )
+
+
+async def get_version(scope: str, user_id: str = None) -> str:
+    return _version_token(
+        await VERSIONS_COLLECTION.find_one({"_id": _version_key(scope, user_id)})
+    )
+
+
+# -------------------- Name Search --------------------
+async def update_search_index(user_id: str, changes: list) -> None:
+    """See mongo_queries.update_search_index."""
+    if SEARCH_INDEXES.tracks(user_id):
+        SEARCH_INDEXES.apply(
+            user_id, changes, await get_version(ITEMS_VERSION, user_id)
+        )
+
+
+# -------------------- Categories --------------------
+async def insert_category(category: Category) -> str:
+    result = await CATEGORIES_COLLECTION.insert_one(category.to_dict())
+    await bump_version(CATALOG_VERSION)
+    return str(result.inserted_id)
+
+
+async def _load_category(category_id: str) -> Optional[Category]:
+    doc = await CATEGORIES_COLLECTION.find_one({"_id": ObjectId(category_id)})
+    return Category(**doc) if doc else None
+
+
+async def get_category(category_id: str) -> Optional[Category]:
+    return await _read_through(
+        CATEGORY_CACHE, category_id, lambda: _load_category(category_id)
+    )
+
+
+async def get_categories_by_ids(category_ids: list) -> dict:
+    return await _models_by_ids(
+        CATEGORIES_COLLECTION, CATEGORY_CACHE, Category, category_ids
+    )
+
+
+# -------------------- Locations --------------------
+async def insert_location(location: Location) -> str:
+    result = await LOCATIONS_COLLECTION.insert_one(location.to_dict())
+    await bump_version(CATALOG_VERSION)
+    return str(result.inserted_id)
+
+
+async def _load_location(location_id: str) -> Optional[Location]:
+    doc = await LOCATIONS_COLLECTION.find_one({"_id": ObjectId(location_id)})
+    return Location(**doc) if doc else None
+
+
+async def get_location(location_id: str) -> Optional[Location]:
+    return await _read_through(
+        LOCATION_CACHE, location_id, lambda: _load_location(location_id)
+    )
+
+
+async def get_locations_by_ids(location_ids: list) -> dict:
+    return await _models_by_ids(
+        LOCATIONS_COLLECTION, LOCATION_CACHE, Location, location_ids
+    )
+
+
+# -------------------- Users --------------------
+async def insert_user(user: User) -> str:
+    """See mongo_queries.insert_user."""
+    result = await USERS_COLLECTION.insert_one(user.to_dict())
+    EMAIL_FILTER.add(user.email)
+    logger.info(f"Inserted user: {user.email} with ID {result.inserted_id}")
+    return str(result.inserted_id)
+
+
+async def get_user_by_email(email: str) -> Optional[User]:
+    doc = await USERS_COLLECTION.find_one({"email": email})
+    return User(**doc) if doc else None
+
+
+async def _load_user(user_id: str) -> Optional[User]:
+    doc = await USERS_COLLECTION.find_one({"_id": ObjectId(user_id)})
+    return User(**doc) if doc else None
+
+
+async def get_user_by_id(user_id: str) -> Optional[User]:
+    return await _read_through(USER_CACHE, user_id, lambda: _load_user(user_id))
+
+
+async def update_user(user_id: str, update_data: dict) -> Optional[User]:
+    doc = await USERS_COLLECTION.find_one_and_update(
+        {"_id": ObjectId(user_id)},
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER,
+    )
+    invalidate_user(user_id)
+    return User(**doc) if doc else None
+
+
+async def list_users(filter: dict = None, validate: bool = False) -> List[User]:
+    cursor = USERS_COLLECTION.find(filter or {}, projection_for(User))
+    return [from_mongo(User, doc, validate) async for doc in cursor]
+
+
+async def list_users_page(
+    filter: dict = None,
+    cursor: str = None,
+    limit: int = None,
+    validate: bool = False,
+) -> dict:
+    """
+    One keyset page of users, ordered by _id.
+
+    Returns:
+        dict: {"items": [...], "next_cursor": str | None}
+    """
+    limit = clamp_page_size(limit)
+    results = (
+        USERS_COLLECTION.find(keyset_filter(filter, cursor), projection_for(User))
+        .sort("_id", 1)
+        .limit(limit + 1)
+    )
+    return build_page(await results.to_list(length=None), limit, User, validate)
+
+
+# -------------------- Shopping List --------------------
+async def insert_shopping_item(item: ShoppingListItem) -> str:
+    result = await SHOPPING_LIST_COLLECTION.insert_one(item.to_dict())
+    logger.info(
+        f"Inserted shopping list item: {item.item_name} for user {item.user_id}"
+    )
+    return str(result.inserted_id)
+
+
+async def get_shopping_list(
+    user_id: str, validate: bool = False
+) -> List[ShoppingListItem]:
+    cursor = SHOPPING_LIST_COLLECTION.find(
+        {"user_id": user_id, **ACTIVE_LINES}, projection_for(ShoppingListItem)
+    )
+    return [from_mongo(ShoppingListItem, doc, validate) async for doc in cursor]
+
+
+async def get_shopping_item_by_id(item_id: str) -> Optional[ShoppingListItem]:
+    doc = await SHOPPING_LIST_COLLECTION.find_one(
+        {"_id": ObjectId(item_id), **ACTIVE_LINES}
+    )
+    return ShoppingListItem(**doc) if doc else None
+
+
+async def list_shopping_items(
+    filter: dict = None, validate: bool = False
+) -> List[ShoppingListItem]:
+    cursor = SHOPPING_LIST_COLLECTION.find(
+        {**(filter or {}), **ACTIVE_LINES}, projection_for(ShoppingListItem)
+    )
+    return [from_mongo(ShoppingListItem, doc, validate) async for doc in cursor]
+
+
+async def list_shopping_items_page(
+    filter: dict = None,
+    cursor: str = None,
+    limit: int = None,
+    validate: bool = False,
+) -> dict:
+    """
+    One keyset page of active (not checked out) shopping list items,
+    ordered by _id.
+
+    Returns:
+        dict: {"items": [...], "next_cursor": str | None}
+    """
+    limit = clamp_page_size(limit)
+    results = (
+        SHOPPING_LIST_COLLECTION.find(
+            keyset_filter({**(filter or {}), **ACTIVE_LINES}, cursor),
+            projection_for(ShoppingListItem),
+        )
+        .sort("_id", 1)
+        .limit(limit + 1)
+    )
+    return build_page(
+        await results.to_list(length=None), limit, ShoppingListItem, validate
+    )
+
+
+async def update_shopping_item(
+    item_id: str, update_data: dict
+) -> Optional[ShoppingListItem]:
+    doc = await SHOPPING_LIST_COLLECTION.find_one_and_update(
+        {"_id": ObjectId(item_id)},
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER,
+    )
+    return ShoppingListItem(**doc) if doc else None
+
+
+async def delete_shopping_item(item_id: str) -> bool:
+    result = await SHOPPING_LIST_COLLECTION.delete_one({"_id": ObjectId(item_id)})
+    return result.deleted_count > 0
+
+
+async def clear_inventory():
+    """
+    Deletes all documents in the inventory collection.
+    Useful for testing or resetting the DB.
+    """
+    result = await ITEMS_COLLECTION.delete_many({})
+    ITEM_CACHE.clear()
+    logger.info(f"Cleared {result.deleted_count} items from inventory.")
+    return result.deleted_count
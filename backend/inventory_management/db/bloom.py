@@ -0,0 +1,120 @@
+# backend/inventory_management/db/bloom.py
+import hashlib
+import math
+import threading
+from typing import Optional
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. A miss means the value was never
+    added; a hit only means it may have been. Sized for capacity values at
+    error_rate false positives; past capacity the rate climbs, which
+    stats() reports as estimated_error_rate.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be >= 1 and 0 < error_rate < 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def _positions(self, value: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, value: str) -> None:
+        positions = self._positions(value)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+    def stats(self) -> dict:
+        fill = 1 - math.exp(-self.num_hashes * self.count / self.num_bits)
+        return {
+            "capacity": self.capacity,
+            "count": self.count,
+            "error_rate": self.error_rate,
+            "estimated_error_rate": round(fill**self.num_hashes, 6),
+            "num_bits": self.num_bits,
+            "num_hashes": self.num_hashes,
+            "memory_bytes": len(self._bits),
+        }
+
+
+class EmailFilter:
+    """
+    Bloom filter of registered emails, in front of the signup duplicate
+    check. Until seed() has finished, every email "may be registered" so
+    callers fall back to reading. Emails added while a seed is running go
+    into the filter being built as well, so none are lost to the race.
+    """
+
+    def __init__(self):
+        self._active: Optional[BloomFilter] = None
+        self._seeding: Optional[BloomFilter] = None
+        self.checks = 0
+        self.skipped_reads = 0
+        self.false_positives = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._active is not None
+
+    def seed(self, emails, capacity: int, error_rate: float) -> BloomFilter:
+        bloom = self._seeding = BloomFilter(capacity, error_rate)
+        try:
+            for email in emails:
+                bloom.add(email)
+            self._active = bloom
+        finally:
+            self._seeding = None
+        return bloom
+
+    def add(self, email: str) -> None:
+        for bloom in (self._active, self._seeding):
+            if bloom is not None:
+                bloom.add(email)
+
+    def may_contain(self, email: str) -> bool:
+        self.checks += 1
+        bloom = self._active
+        if bloom is None or email in bloom:
+            return True
+        self.skipped_reads += 1
+        return False
+
+    def record_miss(self) -> None:
+        """may_contain() said maybe, and the read found no such user."""
+        if self.ready:
+            self.false_positives += 1
+
+    def stats(self) -> dict:
+        new_emails = self.skipped_reads + self.false_positives
+        return {
+            "ready": self.ready,
+            "checks": self.checks,
+            "skipped_reads": self.skipped_reads,
+            "false_positives": self.false_positives,
+            "observed_error_rate": (
+                self.false_positives / new_emails if new_emails else 0.0
+            ),
+            **(self._active.stats() if self._active else {}),
+        }
@@ -0,0 +1,184 @@
+# backend/inventory_management/db/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe in-process cache with LRU eviction and a per-cache
+    TTL. get() returns MISSING on a miss so None can never be confused with
+    a cached value.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 60.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of query results, each entry tagged with what its
+    answer depends on (see cqrs/queries.py for the tags), so a change can
+    drop exactly the entries it affects. An entry tagged ALL depends on
+    everything and goes on any invalidation.
+
+    Entries can also carry a version token; get() treats an entry stored
+    under another version as a miss.
+    """
+
+    ALL = "*"
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 300.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, version, tags, expires_at)
+        self._keys_by_tag = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; see begin()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.skipped_fills = 0
+
+    def _drop(self, key) -> None:
+        _, _, tags, _ = self._entries.pop(key)
+        for tag in tags:
+            keys = self._keys_by_tag[tag]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
+
+    def begin(self) -> int:
+        """
+        Call before running the query whose result will be set(). A result
+        read while an invalidation landed may already be out of date, so
+        set() does not cache it.
+        """
+        return self._generation
+
+    def get(self, key, version=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            value, stored_version, _, expires_at = entry
+            if expires_at <= now or stored_version != version:
+                if stored_version != version:
+                    self.stale += 1
+                self._drop(key)
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, tags, started: int, version=None) -> None:
+        tags = frozenset(tags) or frozenset([self.ALL])
+        with self._lock:
+            if started != self._generation:
+                self.skipped_fills += 1
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, version, tags, time.monotonic() + self.ttl)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags) -> int:
+        """Drop every entry tagged with any of tags (and every ALL entry)."""
+        with self._lock:
+            self._generation += 1
+            keys = set()
+            for tag in set(tags) | {self.ALL}:
+                keys |= self._keys_by_tag.get(tag, set())
+            for key in keys:
+                self._drop(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "skipped_fills": self.skipped_fills,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,78 @@
+# backend/inventory_management/db/coalescer.py
+import asyncio
+from typing import Awaitable, Callable, List
+
+
+class WriteCoalescer:
+    """
+    Gathers submit() calls that arrive within max_delay seconds (or until
+    max_batch are waiting) and hands them to flush_fn as one list.
+
+    flush_fn returns one result per value, in order; a result that is an
+    Exception is raised to that caller only. If flush_fn itself raises, every
+    caller in the batch gets the error.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[List], Awaitable[List]],
+        max_batch: int = 64,
+        max_delay: float = 0.002,
+    ):
+        self._flush_fn = flush_fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+        self.batches = 0
+        self.submitted = 0
+
+    async def submit(self, value):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((value, future))
+        self.submitted += 1
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        task = asyncio.ensure_future(self._run(batch))
+        # Hold a reference until done so the task is not garbage collected
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        try:
+            results = await self._flush_fn([value for value, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if future.done():  # caller went away; the write still happened
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "batches": self.batches,
+            "avg_batch": self.submitted / self.batches if self.batches else 0.0,
+            "max_batch": self.max_batch,
+            "max_delay_ms": self.max_delay * 1000,
+        }
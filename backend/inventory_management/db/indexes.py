@@ -0,0 +1,187 @@
+# backend/inventory_management/db/indexes.py
+import argparse
+import sys
+import threading
+from typing import List
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
+from shared_utils.db.mongo_client import get_database
+from shared_utils.logging.logger import get_logger
+
+logger = get_logger("indexes")
+
+# -------------------- Index Specifications --------------------
+# collection name -> indexes that must exist on it
+INDEX_SPECS = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "items": [
+        # (user_id, _id) also serves keyset pagination without an in-memory sort
+        IndexModel([("user_id", ASCENDING), ("_id", ASCENDING)], name="user_id__id"),
+        IndexModel([("category_id", ASCENDING)], name="category_id"),
+        # shopping-list checkout upserts by (user_id, name)
+        IndexModel([("user_id", ASCENDING), ("name", ASCENDING)], name="user_id_name"),
+        # Only items with events waiting for the outbox relay are indexed
+        IndexModel(
+            [("_pending", ASCENDING)],
+            name="pending_outbox",
+            partialFilterExpression={"_pending": True},
+        ),
+    ],
+    "outbox": [
+        IndexModel([("at", ASCENDING), ("_id", ASCENDING)], name="at__id"),
+    ],
+    "shopping_lists": [
+        IndexModel([("user_id", ASCENDING), ("_id", ASCENDING)], name="user_id__id"),
+    ],
+    "events": [
+        IndexModel(
+            [("payload.item_id", ASCENDING), ("timestamp", ASCENDING)],
+            name="payload_item_id_timestamp",
+        ),
+        IndexModel([("timestamp", ASCENDING)], name="timestamp"),
+        # Events recorded before positions existed have no seq
+        IndexModel(
+            [("seq", ASCENDING)],
+            name="seq_unique",
+            unique=True,
+            partialFilterExpression={"seq": {"$exists": True}},
+        ),
+    ],
+    "inventory_view": [
+        IndexModel([("user_id", ASCENDING), ("_id", ASCENDING)], name="user_id__id"),
+        IndexModel([("user_id", ASCENDING), ("name", ASCENDING)], name="user_id_name"),
+        IndexModel([("category_id", ASCENDING)], name="category_id"),
+    ],
+    # The projector's change log only has to outlive a follower's restart
+    "projection_changes": [
+        IndexModel([("at", ASCENDING)], name="at_ttl", expireAfterSeconds=86400),
+    ],
+}
+
+# -------------------- Registered Query Shapes --------------------
+# Every hot query and the index it must use; checked by verify_indexes().
+QUERY_SHAPES = [
+    {"collection": "users", "filter": {"email": "shape@example.com"}},
+    {"collection": "items", "filter": {"user_id": "shape-user"}},
+    {
+        "collection": "items",
+        "filter": {"user_id": "shape-user"},
+        "sort": [("_id", ASCENDING)],
+    },
+    {"collection": "items", "filter": {"category_id": "shape-category"}},
+    {"collection": "items", "filter": {"user_id": "shape-user", "name": "shape"}},
+    {"collection": "items", "filter": {"_pending": True}},
+    {
+        "collection": "outbox",
+        "filter": {},
+        "sort": [("at", ASCENDING), ("_id", ASCENDING)],
+    },
+    {"collection": "shopping_lists", "filter": {"user_id": "shape-user"}},
+    {
+        "collection": "shopping_lists",
+        "filter": {"user_id": "shape-user"},
+        "sort": [("_id", ASCENDING)],
+    },
+    {
+        "collection": "events",
+        "filter": {"payload.item_id": "shape-item"},
+        "sort": [("timestamp", ASCENDING)],
+    },
+    {"collection": "events", "filter": {}, "sort": [("timestamp", ASCENDING)]},
+    {
+        "collection": "events",
+        "filter": {"seq": {"$gt": 0}},
+        "sort": [("seq", ASCENDING)],
+    },
+    {
+        "collection": "inventory_view",
+        "filter": {"user_id": "shape-user"},
+        "sort": [("_id", ASCENDING)],
+    },
+    {"collection": "inventory_view", "filter": {"category_id": "shape-category"}},
+]
+
+
+def ensure_indexes(db=None) -> dict:
+    """
+    Create every index in INDEX_SPECS. create_indexes is a no-op for indexes
+    that already exist, so this is safe to run on every startup.
+
+    Returns:
+        dict: collection name -> list of index names ensured
+    """
+    db = db if db is not None else get_database()
+    ensured = {}
+    for collection_name, indexes in INDEX_SPECS.items():
+        try:
+            ensured[collection_name] = db[collection_name].create_indexes(indexes)
+            logger.info(
+                f"Ensured indexes on {collection_name}: {ensured[collection_name]}"
+            )
+        except PyMongoError as e:
+            logger.error(
+                f"Failed to ensure indexes on {collection_name}: {e}", exc_info=True
+            )
+    return ensured
+
+
+def ensure_indexes_in_background(db=None) -> threading.Thread:
+    """Build indexes on a daemon thread so startup is not blocked."""
+    thread = threading.Thread(
+        target=ensure_indexes, args=(db,), name="ensure-indexes", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def _plan_stages(plan: dict) -> List[str]:
+    """Collect every stage name in an explain() plan tree."""
+    stages = [plan.get("stage")]
+    if "inputStage" in plan:
+        stages += _plan_stages(plan["inputStage"])
+    for child in plan.get("inputStages", []):
+        stages += _plan_stages(child)
+    # Slot-based engine wraps the classic plan under queryPlan
+    if "queryPlan" in plan:
+        stages += _plan_stages(plan["queryPlan"])
+    return [stage for stage in stages if stage]
+
+
+def verify_indexes(db=None) -> List[dict]:
+    """
+    Run explain() on every registered query shape.
+
+    Returns:
+        List[dict]: the shapes whose winning plan contains a COLLSCAN
+    """
+    db = db if db is not None else get_database()
+    failures = []
+    for shape in QUERY_SHAPES:
+        cursor = db[shape["collection"]].find(shape["filter"])
+        if shape.get("sort"):
+            cursor = cursor.sort(shape["sort"])
+        winning_plan = cursor.explain()["queryPlanner"]["winningPlan"]
+        stages = _plan_stages(winning_plan)
+        if "COLLSCAN" in stages:
+            logger.error(f"COLLSCAN for query shape {shape}: {stages}")
+            failures.append({**shape, "stages": stages})
+        else:
+            logger.info(f"Query shape uses index: {shape} -> {stages}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inventory index bootstrapper")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Explain every registered query shape and fail on COLLSCAN",
+    )
+    args = parser.parse_args()
+
+    ensure_indexes()
+    if args.verify and verify_indexes():
+        sys.exit(1)
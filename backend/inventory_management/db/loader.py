@@ -0,0 +1,93 @@
+# backend/inventory_management/db/loader.py
+import asyncio
+from dataclasses import asdict, is_dataclass
+from typing import Awaitable, Callable, Dict, List
+
+from . import async_mongo_queries as amq
+
+
+class BatchLoader:
+    """
+    DataLoader-style batching for one request. Every load() issued in the
+    same event-loop tick is resolved by a single call to batch_fn, and each
+    key is fetched at most once per loader.
+
+    batch_fn takes a list of str keys and returns {key: value} for the keys
+    that exist; keys it leaves out resolve to None.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[str]], Awaitable[Dict]]):
+        self._batch_fn = batch_fn
+        self._futures = {}
+        self._queue = []
+        self._tasks = set()
+
+    def load(self, key) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if key is None:
+            future = loop.create_future()
+            future.set_result(None)
+            return future
+
+        key = str(key)
+        future = self._futures.get(key)
+        if future is None:
+            future = loop.create_future()
+            self._futures[key] = future
+            if not self._queue:
+                loop.call_soon(self._schedule_dispatch)
+            self._queue.append(key)
+        return future
+
+    async def load_many(self, keys) -> list:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _schedule_dispatch(self):
+        task = asyncio.ensure_future(self._dispatch())
+        # Hold a reference until done so the task is not garbage collected
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self):
+        keys, self._queue = self._queue, []
+        try:
+            found = await self._batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                # Drop failed keys so a later load() can retry them
+                self._futures.pop(key).set_exception(e)
+            return
+        for key in keys:
+            self._futures[key].set_result(found.get(key))
+
+
+class RequestLoaders:
+    """The loaders one request shares; create a fresh instance per request."""
+
+    def __init__(self):
+        self.items = BatchLoader(amq.get_items_by_ids)
+        self.categories = BatchLoader(amq.get_categories_by_ids)
+        self.locations = BatchLoader(amq.get_locations_by_ids)
+
+
+def _as_dict(item) -> dict:
+    return asdict(item) if is_dataclass(item) else item.model_dump()
+
+
+async def enrich_items(items: list, loaders: RequestLoaders) -> List[dict]:
+    """
+    Add category_name and location_name to each item. Costs one $in query
+    per collection no matter how many items are passed.
+    """
+    categories, locations = await asyncio.gather(
+        loaders.categories.load_many(item.category_id for item in items),
+        loaders.locations.load_many(item.location_id for item in items),
+    )
+    return [
+        {
+            **_as_dict(item),
+            "category_name": category.name if category else None,
+            "location_name": location.name if location else None,
+        }
+        for item, category, location in zip(items, categories, locations)
+    ]
@@ -1,6 +1,8 @@
+from dataclasses import make_dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class InventoryItem(BaseModel):
@@ -20,6 +22,20 @@ class InventoryItem(BaseModel):
         return data
 
 
+class InventoryItemView(BaseModel):
+    """One row of the inventory read model (see event_sourcing/projector.py)."""
+
+    id: Optional[str] = Field(None, alias="id")
+    user_id: str
+    name: str
+    quantity: int = 0
+    category_id: Optional[str] = None
+    category_name: Optional[str] = None
+    location_id: Optional[str] = None
+    location_name: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+
 class Category(BaseModel):
     id: Optional[str] = Field(None, alias="id")
     name: str
@@ -71,3 +87,83 @@ class ShoppingListItem(BaseModel):
         if "id" in data and data["id"] is None:
             del data["id"]
         return data
+
+
+# -------------------- Mongo Read Helpers --------------------
+def projection_for(model) -> dict:
+    """Mongo projection covering only the model's fields (_id is always returned)."""
+    return {name: 1 for name in model.model_fields if name != "id"}
+
+
+@lru_cache(maxsize=None)
+def record_type(model):
+    """
+    Slotted dataclass with the same fields as model, used for trusted bulk
+    reads. Attribute access matches the pydantic model, and FastAPI / orjson
+    serialize dataclasses natively.
+    """
+    return make_dataclass(
+        f"{model.__name__}Record",
+        [(name, object) for name in model.model_fields],
+        slots=True,
+    )
+
+
+@lru_cache(maxsize=None)
+def _record_defaults(model) -> tuple:
+    # default_factory fields (timestamps) fall back to None when missing
+    return tuple(
+        (name, None if field.default_factory else field.default)
+        for name, field in model.model_fields.items()
+        if name != "id"
+    )
+
+
+def from_mongo(model, doc: dict, validate: bool = False):
+    """
+    Build a result from a document read back from our own collections.
+
+    That data was validated on the way in, so by default this skips pydantic
+    and returns a record_type(model) instance. Pass validate=True to get a
+    fully validated pydantic model instead.
+    """
+    doc_id = str(doc["_id"]) if "_id" in doc else doc.get("id")
+    if validate:
+        return model(**{**doc, "id": doc_id})
+    # id is the first field on every model
+    return record_type(model)(
+        doc_id, *[doc.get(name, default) for name, default in _record_defaults(model)]
+    )
+
+
+# -------------------- Partial Updates --------------------
+# Set on insert or by the write itself, never by a caller's update
+IMMUTABLE_FIELDS = frozenset({"id", "user_id", "created_at", "updated_at"})
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model, name: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[name].annotation)
+
+
+def validate_update(model, fields: dict) -> dict:
+    """
+    Check a partial update against model: only its mutable fields, each
+    with a value of the field's type (coerced as pydantic would).
+
+    Raises:
+        ValueError: for an empty update, an unknown or immutable field, or
+            a value of the wrong type (pydantic's ValidationError is one)
+    """
+    if not fields:
+        raise ValueError("update needs at least one field")
+    allowed = model.model_fields.keys() - IMMUTABLE_FIELDS
+    unknown = sorted(set(fields) - allowed)
+    if unknown:
+        raise ValueError(
+            f"cannot update {', '.join(unknown)}; allowed: {', '.join(sorted(allowed))}"
+        )
+    return {
+        name: _field_adapter(model, name).validate_python(value)
+        for name, value in fields.items()
+    }
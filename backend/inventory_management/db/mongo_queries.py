@@ -1,62 +1,233 @@
-import os
+import threading
 from datetime import datetime, timezone
-from typing import List, Optional
-from pymongo import MongoClient, ReturnDocument
+from typing import Iterable, List, Optional, Tuple
+from pymongo import DeleteOne, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
 from .models import (
     InventoryItem,
+    InventoryItemView,
     Category,
     Location,
     User,
     ShoppingListItem,
+    from_mongo,
+    projection_for,
+    validate_update,
 )
+from .bloom import EmailFilter
+from .cache import MISSING, LRUCache
+from .pagination import (
+    build_page,
+    clamp_page_size,
+    decode_offset_cursor,
+    encode_offset_cursor,
+    keyset_filter,
+)
+from .search import NameIndex, SearchIndexes
+from .summary import category_key, empty_summary
+from shared_utils.db.mongo_client import get_collection
 from shared_utils.logging.logger import get_logger
-from dotenv import load_dotenv
-from pathlib import Path
-
-# Load dev.env from repo root
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[3] / "dev.env")
 
 logger = get_logger("mongo_queries")
 
-# -------------------- MongoDB Connection --------------------
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = int(os.getenv("DB_PORT", 27017))
-DB_NAME = os.getenv("DB_NAME", "inventory_db")
-DB_USER = os.getenv("DB_USER", "")
-DB_PASS = os.getenv("DB_PASS", "")
+# -------------------- Collections --------------------
+# Bound lazily to the shared process-wide client (see shared_utils.db.mongo_client)
+ITEMS_COLLECTION = get_collection("items")
+CATEGORIES_COLLECTION = get_collection("categories")
+LOCATIONS_COLLECTION = get_collection("locations")
+USERS_COLLECTION = get_collection("users")
+SHOPPING_LIST_COLLECTION = get_collection("shopping_lists")
+SUMMARY_COLLECTION = get_collection("inventory_summaries")
+VERSIONS_COLLECTION = get_collection("collection_versions")
+INVENTORY_VIEW_COLLECTION = get_collection("inventory_view")
+PROJECTION_CHECKPOINTS_COLLECTION = get_collection("projection_checkpoints")
+OUTBOX_COLLECTION = get_collection("outbox")
 
-if DB_USER and DB_PASS:
-    MONGO_URI = f"mongodb://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}"
-else:
-    MONGO_URI = f"mongodb://{DB_HOST}:{DB_PORT}"
 
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
+# -------------------- Read-through Caches --------------------
+# Hot single-document lookups by _id. Every write helper below that changes
+# one of these documents invalidates its entry; the TTL bounds staleness
+# from writers outside this process.
+ITEM_CACHE = LRUCache("items", maxsize=10000, ttl=30)
+CATEGORY_CACHE = LRUCache("categories", maxsize=1000, ttl=300)
+LOCATION_CACHE = LRUCache("locations", maxsize=1000, ttl=300)
+USER_CACHE = LRUCache("users", maxsize=10000, ttl=60)
+CACHES = (ITEM_CACHE, CATEGORY_CACHE, LOCATION_CACHE, USER_CACHE)
 
-# -------------------- Collections --------------------
-ITEMS_COLLECTION = db["items"]
-CATEGORIES_COLLECTION = db["categories"]
-LOCATIONS_COLLECTION = db["locations"]
-USERS_COLLECTION = db["users"]
-SHOPPING_LIST_COLLECTION = db["shopping_lists"]
+
+def _read_through(cache: LRUCache, key, load):
+    """
+    Serve key from cache, falling back to load() (a model or None). Misses
+    are not cached. Callers get a copy so they cannot mutate the cached model.
+    """
+    key = str(key)
+    value = cache.get(key)
+    if value is MISSING:
+        value = load()
+        if value is None:
+            return None
+        cache.set(key, value)
+    return value.model_copy()
+
+
+def invalidate_item(item_id) -> None:
+    ITEM_CACHE.invalidate(str(item_id))
+
+
+def invalidate_user(user_id) -> None:
+    USER_CACHE.invalidate(str(user_id))
+
+
+def cache_stats() -> dict:
+    return {cache.name: cache.stats() for cache in CACHES}
+
+
+def _object_ids(ids) -> list:
+    """Distinct, valid ObjectIds from ids; anything else cannot match."""
+    oids = {}
+    for value in ids:
+        try:
+            oids[str(value)] = ObjectId(value)
+        except (InvalidId, TypeError):
+            continue
+    return list(oids.values())
+
+
+def _models_by_ids(collection, cache: LRUCache, model, ids) -> dict:
+    """
+    Resolve many ids with at most one $in query; ids already cached are
+    served from cache and the rest are cached on the way back.
+
+    Returns:
+        dict: str id -> model, for the ids that exist
+    """
+    found = {}
+    missing = []
+    for oid in _object_ids(ids):
+        cached = cache.get(str(oid))
+        if cached is MISSING:
+            missing.append(oid)
+        else:
+            found[str(oid)] = cached.model_copy()
+    if missing:
+        for doc in collection.find({"_id": {"$in": missing}}):
+            value = from_mongo(model, doc, validate=True)
+            cache.set(str(doc["_id"]), value)
+            found[str(doc["_id"])] = value.model_copy()
+    return found
+
+
+# Documents per getMore round trip when streaming whole inventories
+EXPORT_BATCH_SIZE = 1000
+
+
+# -------------------- Outbox --------------------
+# Item events are written by the same operation as the change they record:
+# appended to the item's _outbox array (and _pending set) in the one insert
+# or update, so state and events cannot diverge. A deleted item has no
+# document to carry its event, so deletes write theirs ahead to the outbox
+# collection instead, and so do category and location renames, which the
+# projector fans out to every view row that carries the name.
+# event_sourcing/outbox.py relays both to the event store.
+ItemEvents = Iterable[Tuple[str, dict]]
+
+
+def outbox_entry(event_type: str, payload: dict) -> dict:
+    return {
+        "_id": ObjectId(),
+        "type": event_type,
+        "payload": payload,
+        "at": datetime.now(timezone.utc),
+    }
+
+
+def _item_entries(item_id, events: ItemEvents) -> list:
+    # Every item event payload starts with the item's id
+    return [
+        outbox_entry(event_type, {"item_id": str(item_id), **payload})
+        for event_type, payload in events
+    ]
+
+
+def _with_entries(update: dict, entries: list) -> dict:
+    """Add entries to an update document's outbox."""
+    if not entries:
+        return update
+    return {
+        **update,
+        "$set": {**update.get("$set", {}), "_pending": True},
+        "$push": {"_outbox": {"$each": entries}},
+    }
+
+
+def _new_item_doc(item: InventoryItem, events: ItemEvents = ()) -> dict:
+    doc = item.to_dict()
+    if events:
+        # Assign the id up front so the events can carry it
+        doc["_id"] = ObjectId()
+        doc["_outbox"] = _item_entries(doc["_id"], events)
+        doc["_pending"] = True
+    return doc
+
+
+def _write_ahead(entries: list) -> None:
+    """
+    Insert entries into the outbox collection. Entries already there (from
+    an earlier attempt or a concurrent delete of the same item) are kept.
+    """
+    if not entries:
+        return
+    try:
+        OUTBOX_COLLECTION.insert_many(entries, ordered=False)
+    except BulkWriteError as e:
+        if any(error.get("code") != 11000 for error in e.details["writeErrors"]):
+            raise
+
+
+def _outbox_guard(doc: Optional[dict]) -> dict:
+    """
+    Selector part matching a document only while its outbox is as read in
+    doc: a delete guarded by it cannot take entries appended since then.
+    """
+    pending = (doc or {}).get("_outbox")
+    return {"_outbox": pending} if pending else {"_pending": {"$exists": False}}
+
+
+def _owned(oid, user_id: str = None) -> dict:
+    """Selector for one document, limited to user_id's when given."""
+    return {"_id": oid, "user_id": user_id} if user_id else {"_id": oid}
+
+
+def _discard_outbox(entries: list) -> None:
+    """Remove written-ahead entries whose change did not happen."""
+    OUTBOX_COLLECTION.delete_many({"_id": {"$in": [entry["_id"] for entry in entries]}})
+
+
+def _rename_entries(event_type: str, field: str, model_id: str, fields: dict) -> list:
+    """The rename event to write ahead of a catalog update, if it sets a name."""
+    if "name" not in fields:
+        return []
+    return [outbox_entry(event_type, {field: model_id, "name": fields["name"]})]
 
 
 # -------------------- Inventory --------------------
-def insert_item(item: InventoryItem) -> str:
-    result = ITEMS_COLLECTION.insert_one(item.to_dict())
+def insert_item(item: InventoryItem, events: ItemEvents = ()) -> str:
+    """
+    Insert an item. events are (event_type, payload) pairs recorded in the
+    same write; see the Outbox section.
+    """
+    result = ITEMS_COLLECTION.insert_one(_new_item_doc(item, events))
     logger.info(
         f"Inserted inventory item: {item.name} for user {item.user_id} with ID {result.inserted_id}"
     )
     return str(result.inserted_id)
 
 
-def insert_inventory_for_user(user_id: str):
-    """
-    Insert default inventory items for a specific user.
-    """
+def _default_inventory_docs(user_id: str) -> list[dict]:
     now = datetime.utcnow()
-    default_items = [
+    return [
         InventoryItem(
             user_id=user_id,
             name="Sample Item 1",
@@ -72,20 +243,36 @@ def insert_inventory_for_user(user_id: str):
             updated_at=now,
         ).to_dict(),
     ]
-    result = ITEMS_COLLECTION.insert_many(default_items)
+
+
+def insert_inventory_for_user(user_id: str):
+    """
+    Insert default inventory items for a specific user.
+    """
+    result = ITEMS_COLLECTION.insert_many(_default_inventory_docs(user_id))
+    bump_version(ITEMS_VERSION, user_id)
     logger.info(
         f"[Inventory] Inserted {len(result.inserted_ids)} default items for user {user_id}"
     )
 
 
-def get_item_by_id(item_id: str) -> Optional[InventoryItem]:
+def _load_item(item_id: str) -> Optional[InventoryItem]:
     doc = ITEMS_COLLECTION.find_one({"_id": ObjectId(item_id)})
-    return InventoryItem(**doc) if doc else None
+    # ITEM_CACHE is shared with _models_by_ids: both carry the id
+    return from_mongo(InventoryItem, doc, validate=True) if doc else None
 
 
-def list_items(filter: dict = None) -> List[InventoryItem]:
-    cursor = ITEMS_COLLECTION.find(filter or {})
-    return [InventoryItem(**doc) for doc in cursor]
+def get_item_by_id(item_id: str) -> Optional[InventoryItem]:
+    return _read_through(ITEM_CACHE, item_id, lambda: _load_item(item_id))
+
+
+def get_items_by_ids(item_ids: list) -> dict:
+    return _models_by_ids(ITEMS_COLLECTION, ITEM_CACHE, InventoryItem, item_ids)
+
+
+def list_items(filter: dict = None, validate: bool = False) -> List[InventoryItem]:
+    cursor = ITEMS_COLLECTION.find(filter or {}, projection_for(InventoryItem))
+    return [from_mongo(InventoryItem, doc, validate) for doc in cursor]
 
 
 def update_item(item_id: str, update_data: dict) -> Optional[InventoryItem]:
@@ -95,26 +282,137 @@ def update_item(item_id: str, update_data: dict) -> Optional[InventoryItem]:
         {"$set": update_data},
         return_document=ReturnDocument.AFTER,
     )
+    invalidate_item(item_id)
     return InventoryItem(**doc) if doc else None
 
 
+def update_item_and_get_previous(
+    item_id: str, update_data: dict, events: ItemEvents = (), user_id: str = None
+) -> Optional[dict]:
+    """
+    Like update_item, but returns the raw document as it was before the
+    update. With user_id, only that user's item is updated.
+    """
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    doc = ITEMS_COLLECTION.find_one_and_update(
+        _owned(ObjectId(item_id), user_id),
+        _with_entries({"$set": update_data}, _item_entries(item_id, events)),
+        return_document=ReturnDocument.BEFORE,
+    )
+    invalidate_item(item_id)
+    return doc
+
+
+def delete_item_and_get_previous(
+    item_id: str, events: ItemEvents = (), user_id: str = None
+) -> Optional[dict]:
+    """
+    Like delete_item, but returns the deleted raw document (None if missing
+    or item_id is not a valid id). With user_id, only that user's item is
+    deleted.
+
+    Without transactions the delete and its events cannot share one write:
+    events are written ahead to the outbox collection and removed again if
+    there was nothing to delete. Should the process die in between, the
+    relay holds them back while the item exists and drops them after its
+    grace period.
+
+    The item's own unrelayed events are copied ahead too, before the delete,
+    and the delete only matches while its outbox is exactly what was copied.
+    So they are never lost with the document, and being older they reach
+    the event store ahead of the ItemDeleted. An item without pending events
+    takes two writes; one with them costs a read and a write more.
+    """
+    try:
+        oid = ObjectId(item_id)
+    except (InvalidId, TypeError):
+        return None
+    entries = _item_entries(oid, events)
+    _write_ahead(entries)
+    current = None
+    while True:
+        doc = ITEMS_COLLECTION.find_one_and_delete(
+            {**_owned(oid, user_id), **_outbox_guard(current)}
+        )
+        if doc is not None:
+            break
+        # Missing, or its outbox changed since it was read (or copied)
+        current = ITEMS_COLLECTION.find_one(_owned(oid, user_id), {"_outbox": 1})
+        if current is None:
+            break
+        _write_ahead(current.get("_outbox") or [])
+    invalidate_item(item_id)
+    if doc is None and entries:
+        # Only this call's own rows: copies may be shared with another delete
+        _discard_outbox(entries)
+    return doc
+
+
 def delete_item(item_id: str) -> bool:
     result = ITEMS_COLLECTION.delete_one({"_id": ObjectId(item_id)})
+    invalidate_item(item_id)
     return result.deleted_count > 0
 
 
-def update_quantity(item_id: str, delta: int) -> Optional[InventoryItem]:
+def update_quantity(
+    item_id: str, delta: int, events: ItemEvents = ()
+) -> Optional[InventoryItem]:
     doc = ITEMS_COLLECTION.find_one_and_update(
         {"_id": ObjectId(item_id)},
-        {"$inc": {"quantity": delta}, "$set": {"updated_at": datetime.utcnow()}},
+        _with_entries(
+            {"$inc": {"quantity": delta}, "$set": {"updated_at": datetime.utcnow()}},
+            _item_entries(item_id, events),
+        ),
         return_document=ReturnDocument.AFTER,
     )
+    invalidate_item(item_id)
     return InventoryItem(**doc) if doc else None
 
 
-def get_items_by_category(category_id: str) -> List[InventoryItem]:
-    cursor = ITEMS_COLLECTION.find({"category_id": category_id})
-    return [InventoryItem(**doc) for doc in cursor]
+def list_items_page(
+    filter: dict = None,
+    cursor: str = None,
+    limit: int = None,
+    validate: bool = False,
+) -> dict:
+    """
+    One keyset page of items, ordered by _id. Pass the previous
+    page's next_cursor to continue.
+
+    Returns:
+        dict: {"items": [...], "next_cursor": str | None}
+    """
+    limit = clamp_page_size(limit)
+    results = (
+        ITEMS_COLLECTION.find(
+            keyset_filter(filter, cursor), projection_for(InventoryItem)
+        )
+        .sort("_id", 1)
+        .limit(limit + 1)
+    )
+    return build_page(list(results), limit, InventoryItem, validate)
+
+
+def iter_items(filter: dict = None, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Stream raw item documents (projected to InventoryItem fields) in _id
+    order without materializing the result set. Memory is bounded by
+    batch_size regardless of how many items match.
+    """
+    cursor = ITEMS_COLLECTION.find(
+        filter or {}, projection_for(InventoryItem), batch_size=batch_size
+    ).sort("_id", 1)
+    with cursor:
+        yield from cursor
+
+
+def get_items_by_category(
+    category_id: str, validate: bool = False
+) -> List[InventoryItem]:
+    cursor = ITEMS_COLLECTION.find(
+        {"category_id": category_id}, projection_for(InventoryItem)
+    )
+    return [from_mongo(InventoryItem, doc, validate) for doc in cursor]
 
 
 def item_exists(item_id: str) -> bool:
@@ -141,6 +439,15 @@ def add_inventory_batch(items: list[dict], user_id: str = None) -> list[dict]:
         logger.info("No items provided for batch insert.")
         return []
 
+    items_to_insert = _batch_inventory_docs(items, user_id)
+    result = ITEMS_COLLECTION.insert_many(items_to_insert)
+    bump_version(ITEMS_VERSION, user_id)
+    logger.info(f"Inserted {len(result.inserted_ids)} items in batch.")
+
+    return _with_inserted_ids(items_to_insert, result.inserted_ids)
+
+
+def _batch_inventory_docs(items: list[dict], user_id: str = None) -> list[dict]:
     now = datetime.utcnow()
     items_to_insert = []
 
@@ -159,43 +466,585 @@ def add_inventory_batch(items: list[dict], user_id: str = None) -> list[dict]:
             item_doc["confidence"] = item["confidence"]
         items_to_insert.append(item_doc)
 
-    result = ITEMS_COLLECTION.insert_many(items_to_insert)
-    logger.info(f"Inserted {len(result.inserted_ids)} items in batch.")
+    return items_to_insert
 
+
+def _with_inserted_ids(docs: list[dict], inserted_ids: list) -> list[dict]:
     # Return inserted items with MongoDB _id
     inserted_items = []
-    for item_doc, _id in zip(items_to_insert, result.inserted_ids):
+    for item_doc, _id in zip(docs, inserted_ids):
         item_doc["_id"] = str(_id)
         inserted_items.append(item_doc)
 
     return inserted_items
 
 
+# -------------------- Bulk Mixed Writes --------------------
+BULK_OPS = ("create", "update", "quantity", "delete")
+
+
+def _parse_bulk_ops(operations: list[dict], user_id: str = None):
+    """
+    Validate each operation up front. Returns (parsed, results) where parsed
+    holds (index, op, ObjectId | None, payload) for the valid operations and
+    results is pre-filled with an entry per input operation.
+    """
+    parsed = []
+    results = []
+    for index, operation in enumerate(operations):
+        op = operation.get("op")
+        results.append({"index": index, "op": op, "status": "ok"})
+        try:
+            if op not in BULK_OPS:
+                raise ValueError(f"Unknown op {op!r}; expected one of {BULK_OPS}")
+            if op == "create":
+                item_data = dict(operation.get("item") or {})
+                if user_id:
+                    item_data["user_id"] = user_id
+                item = InventoryItem(**item_data)
+                parsed.append((index, op, None, item.to_dict()))
+                continue
+
+            oid = ObjectId(operation.get("item_id"))
+            results[index]["item_id"] = str(oid)
+            if op == "update":
+                fields = validate_update(InventoryItem, operation.get("fields") or {})
+                parsed.append((index, op, oid, fields))
+            elif op == "quantity":
+                parsed.append((index, op, oid, int(operation["delta"])))
+            else:
+                parsed.append((index, op, oid, None))
+        except (InvalidId, KeyError, TypeError, ValueError) as e:
+            results[index].update(status="error", error=str(e))
+    return parsed, results
+
+
+def _bulk_requests(
+    parsed,
+    existing_ids: set,
+    results: list,
+    user_id: str = None,
+    with_events: bool = False,
+    previous: dict = None,
+):
+    """
+    Build pymongo write models; returns (requests, request position -> index).
+    With events, deletes are guarded by the outbox each item had in previous
+    (item_id -> document as read), whose entries are written ahead.
+    """
+    now = datetime.now(timezone.utc)
+    requests = []
+    positions = []
+    for index, op, oid, payload in parsed:
+        if op == "create":
+            if with_events:
+                created = dict(payload)
+                payload["_id"] = ObjectId()
+                payload["_outbox"] = _item_entries(
+                    payload["_id"], [("ItemCreated", created)]
+                )
+                payload["_pending"] = True
+            requests.append(InsertOne(payload))
+            positions.append(index)
+            continue
+        if oid not in existing_ids:
+            results[index]["status"] = "not_found"
+            continue
+
+        selector = _owned(oid, user_id)
+        if op == "update":
+            update = {"$set": {**payload, "updated_at": now}}
+            events = [("ItemUpdated", {"updated_fields": payload})]
+        elif op == "quantity":
+            update = {"$inc": {"quantity": payload}, "$set": {"updated_at": now}}
+            events = [("QuantityUpdated", {"delta": payload})]
+        else:
+            if with_events:
+                selector.update(_outbox_guard((previous or {}).get(str(oid))))
+            requests.append(DeleteOne(selector))
+            positions.append(index)
+            continue
+        if with_events:
+            update = _with_entries(update, _item_entries(oid, events))
+        requests.append(UpdateOne(selector, update))
+        positions.append(index)
+    return requests, positions
+
+
+def _finish_bulk_results(parsed, positions, results, write_errors):
+    failed = {}
+    for error in write_errors:
+        failed[positions[error["index"]]] = error.get("errmsg", "write failed")
+    for index, op, _, payload in parsed:
+        if index in failed:
+            results[index].update(status="error", error=failed[index])
+        elif op == "create":
+            # pymongo assigns _id on the document before sending it
+            results[index]["item_id"] = str(payload["_id"])
+    return results
+
+
+def bulk_write_items(operations: list[dict], user_id: str = None) -> list[dict]:
+    """
+    Apply a mixed list of item changes with one unordered bulk_write.
+    See bulk_write_items_with_previous for the operation format.
+    """
+    results, _ = bulk_write_items_with_previous(operations, user_id)
+    return results
+
+
+def bulk_write_items_with_previous(
+    operations: list[dict], user_id: str = None, with_events: bool = False
+):
+    """
+    Apply a mixed list of item changes with one unordered bulk_write.
+
+    Args:
+        operations (list[dict]): each one of
+            - {"op": "create", "item": {...InventoryItem fields}}
+            - {"op": "update", "item_id": str, "fields": {...}}
+            - {"op": "quantity", "item_id": str, "delta": int}
+            - {"op": "delete", "item_id": str}
+        user_id (str, optional): owner; scopes every operation to this user
+        with_events (bool): record each change's item event in the same
+            write (deletes: written ahead to the outbox collection)
+
+    Returns:
+        tuple: (results, previous) where results has one entry per operation,
+        in input order, with status "ok", "not_found" or "error" (plus "error"
+        message), and previous maps item_id -> the document before the write
+        (quantity and category_id only) for every referenced existing item
+    """
+    parsed, results = _parse_bulk_ops(operations, user_id)
+
+    # One read to tell "not found" apart per op; bulk_write only gives totals
+    lookup = [oid for _, _, oid, _ in parsed if oid is not None]
+    previous = {}
+    if lookup:
+        selector = {"_id": {"$in": lookup}}
+        if user_id:
+            selector["user_id"] = user_id
+        fields = {"quantity": 1, "category_id": 1}
+        if with_events:
+            fields["_outbox"] = 1
+        previous = {
+            str(doc["_id"]): doc for doc in ITEMS_COLLECTION.find(selector, fields)
+        }
+    existing_ids = {ObjectId(item_id) for item_id in previous}
+
+    requests, positions = _bulk_requests(
+        parsed, existing_ids, results, user_id, with_events, previous
+    )
+    deleting = {
+        index: oid
+        for index, op, oid, _ in parsed
+        if op == "delete" and oid in existing_ids
+    }
+    deletes = []
+    if with_events and deleting:
+        # Written ahead: a deleted item has no document to carry its event,
+        # nor its own unrelayed events (older, so they are relayed first)
+        deletes = [
+            entry
+            for oid in deleting.values()
+            for entry in _item_entries(oid, [("ItemDeleted", {})])
+        ]
+        _write_ahead(
+            [
+                entry
+                for oid in deleting.values()
+                for entry in previous[str(oid)].get("_outbox") or ()
+            ]
+            + deletes
+        )
+    write_errors = []
+    if requests:
+        try:
+            ITEMS_COLLECTION.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+    for item_id in previous:
+        invalidate_item(item_id)
+    if deletes:
+        # A guarded delete matches nothing if the item's outbox changed
+        # after the read; such an item is still there
+        survivors = {
+            str(doc["_id"])
+            for doc in ITEMS_COLLECTION.find(
+                {"_id": {"$in": list(deleting.values())}}, {"_id": 1}
+            )
+        }
+        for index, oid in deleting.items():
+            if str(oid) in survivors and results[index]["status"] == "ok":
+                results[index].update(
+                    status="error", error="item changed while deleting; retry"
+                )
+        undone = [e for e in deletes if e["payload"]["item_id"] in survivors]
+        if undone:
+            _discard_outbox(undone)
+    logger.info(
+        f"Bulk write of {len(operations)} operations ({len(requests)} sent, "
+        f"{len(write_errors)} failed)"
+    )
+    return _finish_bulk_results(parsed, positions, results, write_errors), previous
+
+
+# -------------------- Collection Versions --------------------
+# One counter per (collection scope, user) plus one per scope for all users,
+# bumped by every write command. Lets readers answer "has anything changed?"
+# (ETag / If-None-Match) without reading the collection itself.
+ALL_USERS = "*"
+ITEMS_VERSION = "items"
+SHOPPING_LIST_VERSION = "shopping_lists"
+# Categories and locations, whose names expanded item listings carry
+CATALOG_VERSION = "catalog"
+
+
+def _version_key(scope: str, user_id: str = None) -> str:
+    return f"{scope}:{user_id or ALL_USERS}"
+
+
+def _version_token(doc: Optional[dict]) -> str:
+    # The epoch changes if the counter document is ever recreated, so a
+    # restarted count can never repeat an old token
+    if not doc:
+        return "0"
+    return f"{doc['epoch']}.{doc['version']}"
+
+
+def bump_version(scope: str, user_id: str = None) -> None:
+    """Increment the user's and the all-users counter for scope in one round trip."""
+    keys = sorted({_version_key(scope), _version_key(scope, user_id)})
+    VERSIONS_COLLECTION.bulk_write(
+        [
+            UpdateOne(
+                {"_id": key},
+                {"$inc": {"version": 1}, "$setOnInsert": {"epoch": str(ObjectId())}},
+                upsert=True,
+            )
+            for key in keys
+        ],
+        ordered=False,
+    )
+
+
+def get_version(scope: str, user_id: str = None) -> str:
+    """Opaque token that changes whenever scope changes for user_id (or anyone)."""
+    return _version_token(
+        VERSIONS_COLLECTION.find_one({"_id": _version_key(scope, user_id)})
+    )
+
+
+# -------------------- Signup Email Filter --------------------
+# Lets signup skip the duplicate-email read for addresses that are certainly
+# new. The email_unique index stays the source of truth: emails registered
+# by other processes are not in this filter and surface as DuplicateKeyError.
+EMAIL_FILTER = EmailFilter()
+EMAIL_SEED_BATCH_SIZE = 10_000
+
+
+def seed_email_filter(capacity: int, error_rate: float) -> dict:
+    cursor = USERS_COLLECTION.find(
+        {}, {"email": 1, "_id": 0}, batch_size=EMAIL_SEED_BATCH_SIZE
+    )
+    with cursor:
+        EMAIL_FILTER.seed(
+            (doc["email"] for doc in cursor if doc.get("email")), capacity, error_rate
+        )
+    stats = EMAIL_FILTER.stats()
+    logger.info(f"Seeded signup email filter: {stats}")
+    return stats
+
+
+def seed_email_filter_in_background(
+    capacity: int, error_rate: float
+) -> threading.Thread:
+    """Seed on a daemon thread; signups read as before until it is done."""
+
+    def run():
+        try:
+            seed_email_filter(capacity, error_rate)
+        except PyMongoError as e:
+            logger.error(f"Failed to seed signup email filter: {e}", exc_info=True)
+
+    thread = threading.Thread(target=run, name="seed-email-filter", daemon=True)
+    thread.start()
+    return thread
+
+
+# -------------------- Name Search --------------------
+# Built per user on first search from a name-only scan, then kept current by
+# the item commands (update_search_index); the items version tells a search
+# whether writes it has not seen happened since.
+SEARCH_INDEXES = SearchIndexes(max_users=16)
+SEARCH_SCAN_BATCH_SIZE = 10_000
+
+
+def _build_name_index(user_id: str) -> NameIndex:
+    cursor = ITEMS_COLLECTION.find(
+        {"user_id": user_id}, {"name": 1}, batch_size=SEARCH_SCAN_BATCH_SIZE
+    )
+    with cursor:
+        return NameIndex.from_items(
+            (str(doc["_id"]), doc.get("name", "")) for doc in cursor
+        )
+
+
+def search_items(
+    user_id: str, query: str, cursor: Optional[str] = None, limit: int = None
+) -> dict:
+    """
+    Page of a user's items whose names match query: exact, then prefix,
+    then substring, then typo-tolerant (trigram similarity) matches.
+
+    Raises:
+        InvalidCursorError: if cursor is not one we issued
+    """
+    limit = clamp_page_size(limit)
+    offset = decode_offset_cursor(cursor) if cursor else 0
+    # Read the version before any rebuild scan: a write that lands during the
+    # scan bumps it again, so the next search rebuilds rather than miss it
+    version = get_version(ITEMS_VERSION, user_id)
+    index = SEARCH_INDEXES.get_or_build(
+        user_id, version, lambda: _build_name_index(user_id)
+    )
+    ids = index.search(query, limit=limit + 1, offset=offset)
+    found = get_items_by_ids(ids[:limit])
+    return {
+        "items": [found[item_id] for item_id in ids[:limit] if item_id in found],
+        "next_cursor": (
+            encode_offset_cursor(offset + limit) if len(ids) > limit else None
+        ),
+    }
+
+
+def update_search_index(user_id: str, changes: list) -> None:
+    """
+    Feed (item_id, before, after) changes from a write that has already
+    bumped the user's items version into their search index, if one is loaded.
+    """
+    if SEARCH_INDEXES.tracks(user_id):
+        SEARCH_INDEXES.apply(user_id, changes, get_version(ITEMS_VERSION, user_id))
+
+
+# -------------------- Inventory Read Model --------------------
+# One document per item, shaped for the inventory screens (category and
+# location names included) and maintained from the event stream by
+# event_sourcing/projector.py. It trails the items collection by up to the
+# projector's poll interval.
+def get_view_item(item_id: str) -> Optional[InventoryItemView]:
+    doc = INVENTORY_VIEW_COLLECTION.find_one(
+        {"_id": ObjectId(item_id)}, projection_for(InventoryItemView)
+    )
+    return from_mongo(InventoryItemView, doc) if doc else None
+
+
+def list_view_items(
+    filter: dict = None, validate: bool = False
+) -> List[InventoryItemView]:
+    cursor = INVENTORY_VIEW_COLLECTION.find(
+        filter or {}, projection_for(InventoryItemView)
+    )
+    return [from_mongo(InventoryItemView, doc, validate) for doc in cursor]
+
+
+def list_view_items_page(
+    filter: dict = None,
+    cursor: str = None,
+    limit: int = None,
+    validate: bool = False,
+) -> dict:
+    """list_items_page() over the read model."""
+    limit = clamp_page_size(limit)
+    results = (
+        INVENTORY_VIEW_COLLECTION.find(
+            keyset_filter(filter, cursor), projection_for(InventoryItemView)
+        )
+        .sort("_id", 1)
+        .limit(limit + 1)
+    )
+    return build_page(list(results), limit, InventoryItemView, validate)
+
+
+def get_view_items_by_category(
+    category_id: str, validate: bool = False
+) -> List[InventoryItemView]:
+    return list_view_items({"category_id": category_id}, validate)
+
+
+# -------------------- Inventory Summary --------------------
+# Per-user counts maintained by event_sourcing/projector.py from the event
+# stream, alongside the read model; last_seq is the last position counted.
+def get_projection_position() -> int:
+    """Stream position the read model (and the summaries) have reached."""
+    doc = PROJECTION_CHECKPOINTS_COLLECTION.find_one(
+        {"_id": "inventory_view"}, {"position": 1}
+    )
+    return (doc or {}).get("position") or 0
+
+
+def get_inventory_summary(user_id: str) -> dict:
+    doc = SUMMARY_COLLECTION.find_one({"_id": user_id}, {"last_seq": 0})
+    if not doc:
+        return empty_summary(user_id)
+    doc["user_id"] = doc.pop("_id")
+    return {**empty_summary(user_id), **doc}
+
+
+def rebuild_inventory_summaries(user_id: str = None, position: int = None) -> int:
+    """
+    Recompute summaries from the read model (all users, or one) as of
+    position, by default the projector's checkpoint read before the scan.
+    A summary the projector has counted past position meanwhile is left
+    as it is. Returns the number of summaries written.
+    """
+    if position is None:
+        position = get_projection_position()
+    pipeline = [
+        {"$match": {"user_id": user_id} if user_id else {}},
+        {
+            "$group": {
+                "_id": {"user_id": "$user_id", "category_id": "$category_id"},
+                "item_count": {"$sum": 1},
+                "total_units": {"$sum": {"$ifNull": ["$quantity", 0]}},
+                "zero_stock_count": {
+                    "$sum": {
+                        "$cond": [{"$lte": [{"$ifNull": ["$quantity", 0]}, 0]}, 1, 0]
+                    }
+                },
+            }
+        },
+    ]
+    summaries = {}
+    for group in INVENTORY_VIEW_COLLECTION.aggregate(pipeline):
+        owner = group["_id"].get("user_id")
+        if owner is None:
+            continue
+        summary = summaries.setdefault(owner, empty_summary(owner))
+        summary["item_count"] += group["item_count"]
+        summary["total_units"] += group["total_units"]
+        summary["zero_stock_count"] += group["zero_stock_count"]
+        key = category_key(group["_id"].get("category_id"))
+        units = summary["units_by_category"].get(key, 0) + group["total_units"]
+        summary["units_by_category"][key] = units
+
+    if user_id and user_id not in summaries:
+        summaries[user_id] = empty_summary(user_id)
+    now = datetime.now(timezone.utc)
+    for owner, summary in summaries.items():
+        summary.pop("user_id")
+        try:
+            SUMMARY_COLLECTION.replace_one(
+                {
+                    "_id": owner,
+                    "$or": [
+                        {"last_seq": {"$lte": position}},
+                        {"last_seq": {"$exists": False}},
+                    ],
+                },
+                {**summary, "last_seq": position, "updated_at": now},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            pass  # counted past position while the scan ran
+    if not user_id:
+        SUMMARY_COLLECTION.delete_many({"_id": {"$nin": list(summaries)}})
+
+    logger.info(f"Rebuilt {len(summaries)} inventory summaries")
+    return len(summaries)
+
+
 # -------------------- Categories --------------------
 def insert_category(category: Category) -> str:
     result = CATEGORIES_COLLECTION.insert_one(category.to_dict())
+    bump_version(CATALOG_VERSION)
     return str(result.inserted_id)
 
 
-def get_category(category_id: str) -> Optional[Category]:
+def update_category(category_id: str, update_data: dict) -> Optional[Category]:
+    """
+    Rename or describe a category; expanded item listings see it at once,
+    the inventory view once the projector applies its CategoryRenamed.
+    """
+    oid = ObjectId(category_id)
+    fields = validate_update(Category, update_data)
+    entries = _rename_entries("CategoryRenamed", "category_id", category_id, fields)
+    _write_ahead(entries)
+    doc = CATEGORIES_COLLECTION.find_one_and_update(
+        {"_id": oid}, {"$set": fields}, return_document=ReturnDocument.AFTER
+    )
+    CATEGORY_CACHE.invalidate(category_id)
+    if not doc:
+        if entries:
+            _discard_outbox(entries)
+        return None
+    bump_version(CATALOG_VERSION)
+    return from_mongo(Category, doc, validate=True)
+
+
+def _load_category(category_id: str) -> Optional[Category]:
     doc = CATEGORIES_COLLECTION.find_one({"_id": ObjectId(category_id)})
     return Category(**doc) if doc else None
 
 
+def get_category(category_id: str) -> Optional[Category]:
+    return _read_through(
+        CATEGORY_CACHE, category_id, lambda: _load_category(category_id)
+    )
+
+
+def get_categories_by_ids(category_ids: list) -> dict:
+    return _models_by_ids(CATEGORIES_COLLECTION, CATEGORY_CACHE, Category, category_ids)
+
+
 # -------------------- Locations --------------------
 def insert_location(location: Location) -> str:
     result = LOCATIONS_COLLECTION.insert_one(location.to_dict())
+    bump_version(CATALOG_VERSION)
     return str(result.inserted_id)
 
 
-def get_location(location_id: str) -> Optional[Location]:
+def update_location(location_id: str, update_data: dict) -> Optional[Location]:
+    """See update_category."""
+    oid = ObjectId(location_id)
+    fields = validate_update(Location, update_data)
+    entries = _rename_entries("LocationRenamed", "location_id", location_id, fields)
+    _write_ahead(entries)
+    doc = LOCATIONS_COLLECTION.find_one_and_update(
+        {"_id": oid}, {"$set": fields}, return_document=ReturnDocument.AFTER
+    )
+    LOCATION_CACHE.invalidate(location_id)
+    if not doc:
+        if entries:
+            _discard_outbox(entries)
+        return None
+    bump_version(CATALOG_VERSION)
+    return from_mongo(Location, doc, validate=True)
+
+
+def _load_location(location_id: str) -> Optional[Location]:
     doc = LOCATIONS_COLLECTION.find_one({"_id": ObjectId(location_id)})
     return Location(**doc) if doc else None
 
 
+def get_location(location_id: str) -> Optional[Location]:
+    return _read_through(
+        LOCATION_CACHE, location_id, lambda: _load_location(location_id)
+    )
+
+
+def get_locations_by_ids(location_ids: list) -> dict:
+    return _models_by_ids(LOCATIONS_COLLECTION, LOCATION_CACHE, Location, location_ids)
+
+
 # -------------------- Users --------------------
 def insert_user(user: User) -> str:
+    """
+    Raises:
+        DuplicateKeyError: if the email is already registered (email_unique)
+    """
     result = USERS_COLLECTION.insert_one(user.to_dict())
+    EMAIL_FILTER.add(user.email)
     logger.info(f"Inserted user: {user.email} with ID {result.inserted_id}")
     return str(result.inserted_id)
 
@@ -205,17 +1054,56 @@ def get_user_by_email(email: str) -> Optional[User]:
     return User(**doc) if doc else None
 
 
-def get_user_by_id(user_id: str) -> Optional[User]:
+def _load_user(user_id: str) -> Optional[User]:
     doc = USERS_COLLECTION.find_one({"_id": ObjectId(user_id)})
     return User(**doc) if doc else None
 
 
-def list_users(filter: dict = None) -> List[User]:
-    cursor = USERS_COLLECTION.find(filter or {})
-    return [User(**doc) for doc in cursor]
+def get_user_by_id(user_id: str) -> Optional[User]:
+    return _read_through(USER_CACHE, user_id, lambda: _load_user(user_id))
+
+
+def update_user(user_id: str, update_data: dict) -> Optional[User]:
+    doc = USERS_COLLECTION.find_one_and_update(
+        {"_id": ObjectId(user_id)},
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER,
+    )
+    invalidate_user(user_id)
+    return User(**doc) if doc else None
+
+
+def list_users(filter: dict = None, validate: bool = False) -> List[User]:
+    cursor = USERS_COLLECTION.find(filter or {}, projection_for(User))
+    return [from_mongo(User, doc, validate) for doc in cursor]
+
+
+def list_users_page(
+    filter: dict = None,
+    cursor: str = None,
+    limit: int = None,
+    validate: bool = False,
+) -> dict:
+    """
+    One keyset page of users, ordered by _id.
+
+    Returns:
+        dict: {"items": [...], "next_cursor": str | None}
+    """
+    limit = clamp_page_size(limit)
+    results = (
+        USERS_COLLECTION.find(keyset_filter(filter, cursor), projection_for(User))
+        .sort("_id", 1)
+        .limit(limit + 1)
+    )
+    return build_page(list(results), limit, User, validate)
 
 
 # -------------------- Shopping List --------------------
+# Checked-out lines stay in the collection, flagged archived
+ACTIVE_LINES = {"archived": {"$ne": True}}
+
+
 def insert_shopping_item(item: ShoppingListItem) -> str:
     result = SHOPPING_LIST_COLLECTION.insert_one(item.to_dict())
     logger.info(
@@ -224,28 +1112,70 @@ def insert_shopping_item(item: ShoppingListItem) -> str:
     return str(result.inserted_id)
 
 
-def get_shopping_list(user_id: str) -> List[ShoppingListItem]:
-    cursor = SHOPPING_LIST_COLLECTION.find({"user_id": user_id})
-    return [ShoppingListItem(**doc) for doc in cursor]
+def get_shopping_list(user_id: str, validate: bool = False) -> List[ShoppingListItem]:
+    cursor = SHOPPING_LIST_COLLECTION.find(
+        {"user_id": user_id, **ACTIVE_LINES}, projection_for(ShoppingListItem)
+    )
+    return [from_mongo(ShoppingListItem, doc, validate) for doc in cursor]
 
 
 def get_shopping_item_by_id(item_id: str) -> Optional[ShoppingListItem]:
-    doc = SHOPPING_LIST_COLLECTION.find_one({"_id": ObjectId(item_id)})
+    doc = SHOPPING_LIST_COLLECTION.find_one({"_id": ObjectId(item_id), **ACTIVE_LINES})
     return ShoppingListItem(**doc) if doc else None
 
 
-def list_shopping_items(filter: dict = None) -> List[ShoppingListItem]:
-    cursor = SHOPPING_LIST_COLLECTION.find(filter or {})
-    return [ShoppingListItem(**doc) for doc in cursor]
+def list_shopping_items(
+    filter: dict = None, validate: bool = False
+) -> List[ShoppingListItem]:
+    cursor = SHOPPING_LIST_COLLECTION.find(
+        {**(filter or {}), **ACTIVE_LINES}, projection_for(ShoppingListItem)
+    )
+    return [from_mongo(ShoppingListItem, doc, validate) for doc in cursor]
 
 
-def update_shopping_item(item_id: str, update_data: dict) -> Optional[ShoppingListItem]:
+def list_shopping_items_page(
+    filter: dict = None,
+    cursor: str = None,
+    limit: int = None,
+    validate: bool = False,
+) -> dict:
+    """
+    One keyset page of active (not checked out) shopping list items,
+    ordered by _id.
+
+    Returns:
+        dict: {"items": [...], "next_cursor": str | None}
+    """
+    limit = clamp_page_size(limit)
+    results = (
+        SHOPPING_LIST_COLLECTION.find(
+            keyset_filter({**(filter or {}), **ACTIVE_LINES}, cursor),
+            projection_for(ShoppingListItem),
+        )
+        .sort("_id", 1)
+        .limit(limit + 1)
+    )
+    return build_page(list(results), limit, ShoppingListItem, validate)
+
+
+def update_shopping_item(
+    item_id: str, update_data: dict, user_id: str = None
+) -> Optional[ShoppingListItem]:
     doc = SHOPPING_LIST_COLLECTION.find_one_and_update(
-        {"_id": ObjectId(item_id)},
+        _owned(ObjectId(item_id), user_id),
         {"$set": update_data},
         return_document=ReturnDocument.AFTER,
     )
-    return ShoppingListItem(**doc) if doc else None
+    return from_mongo(ShoppingListItem, doc, validate=True) if doc else None
+
+
+def delete_shopping_item_and_get_previous(
+    item_id: str, user_id: str = None
+) -> Optional[dict]:
+    """Like delete_shopping_item, but returns the deleted raw document."""
+    return SHOPPING_LIST_COLLECTION.find_one_and_delete(
+        _owned(ObjectId(item_id), user_id)
+    )
 
 
 def delete_shopping_item(item_id: str) -> bool:
@@ -253,11 +1183,196 @@ def delete_shopping_item(item_id: str) -> bool:
     return result.deleted_count > 0
 
 
+def _claim_purchased_lines(user_id: str, now: datetime) -> list[dict]:
+    """
+    Atomically flag this user's purchased lines as archived under a fresh
+    checkout id, then read back exactly those lines. A concurrent checkout
+    cannot claim the same line twice.
+    """
+    checkout_id = ObjectId()
+    SHOPPING_LIST_COLLECTION.update_many(
+        {"user_id": user_id, "purchased": True, **ACTIVE_LINES},
+        {"$set": {"archived": True, "archived_at": now, "checkout_id": checkout_id}},
+    )
+    return list(
+        SHOPPING_LIST_COLLECTION.find(
+            {"user_id": user_id, "checkout_id": checkout_id},
+            {"item_name": 1, "quantity": 1},
+        )
+    )
+
+
+def _release_lines(lines: list) -> None:
+    """Give claimed lines back so their checkout can be retried."""
+    if lines:
+        SHOPPING_LIST_COLLECTION.update_many(
+            {"_id": {"$in": [line["_id"] for line in lines]}},
+            {
+                "$set": {"archived": False},
+                "$unset": {"checkout_id": "", "archived_at": ""},
+            },
+        )
+
+
+def _checkout_request(
+    user_id: str, name: str, delta: int, existing, now, new_id: ObjectId = None
+):
+    """
+    $inc upsert for one checked-out name, recording ItemCreated for a name
+    not in inventory yet (inserted as new_id) and QuantityUpdated for one
+    that is.
+    """
+    if existing is None:
+        item_id = new_id or ObjectId()
+        events = [
+            ("ItemCreated", {"user_id": user_id, "name": name, "quantity": delta})
+        ]
+    else:
+        item_id = existing["_id"]
+        events = [("QuantityUpdated", {"delta": delta})]
+    return UpdateOne(
+        {"user_id": user_id, "name": name},
+        _with_entries(
+            {
+                "$inc": {"quantity": delta},
+                "$set": {"updated_at": now},
+                "$setOnInsert": {
+                    "_id": item_id,
+                    "category_id": None,
+                    "location_id": None,
+                    "created_at": now,
+                },
+            },
+            _item_entries(item_id, events),
+        ),
+        upsert=True,
+    )
+
+
+def _fix_raced_checkout(user_id: str, names: list, deltas: dict, new_ids: dict):
+    """
+    Names another request created between the checkout's read and its
+    upsert: the $inc landed on that item, together with an ItemCreated for
+    an id that was never inserted. Turn that entry into the item's
+    QuantityUpdated and return the items as they were before the $inc.
+    """
+    found = {}
+    for doc in ITEMS_COLLECTION.find(
+        {"user_id": user_id, "name": {"$in": names}},
+        {"name": 1, "quantity": 1, "category_id": 1},
+    ):
+        name = doc["name"]
+        ITEMS_COLLECTION.update_one(
+            {"_id": doc["_id"]},
+            {
+                "$set": {
+                    "_outbox.$[entry].type": "QuantityUpdated",
+                    "_outbox.$[entry].payload": {
+                        "item_id": str(doc["_id"]),
+                        "delta": deltas[name],
+                    },
+                }
+            },
+            array_filters=[{"entry.payload.item_id": str(new_ids[name])}],
+        )
+        found[name] = {**doc, "quantity": doc.get("quantity", 0) - deltas[name]}
+    return found
+
+
+def checkout_shopping_list(user_id: str):
+    """
+    Move every purchased shopping list line into inventory: quantities are
+    summed per name and upserted onto the user's items with $inc in one
+    bulk write (which also records each item's event), and the lines are
+    archived. The lines of a name whose upsert fails are given back, so
+    retrying the checkout moves just those.
+
+    Returns:
+        tuple: (result, previous) where result is {"lines": int, "items":
+        [{"name", "delta", "item_id", "created"}]} and previous maps item
+        name -> the existing item (_id, quantity, category_id) before the
+        checkout, for names that were already in inventory
+    """
+    now = datetime.now(timezone.utc)
+    lines = _claim_purchased_lines(user_id, now)
+    if not lines:
+        return {"lines": 0, "items": []}, {}
+
+    deltas = {}
+    for line in lines:
+        deltas[line["item_name"]] = deltas.get(line["item_name"], 0) + line.get(
+            "quantity", 0
+        )
+
+    names = list(deltas)
+    failed = set()
+    try:
+        previous = {
+            doc["name"]: doc
+            for doc in ITEMS_COLLECTION.find(
+                {"user_id": user_id, "name": {"$in": names}},
+                {"name": 1, "quantity": 1, "category_id": 1},
+            )
+        }
+        new_ids = {name: ObjectId() for name in deltas if name not in previous}
+        requests = [
+            _checkout_request(
+                user_id, name, delta, previous.get(name), now, new_ids.get(name)
+            )
+            for name, delta in deltas.items()
+        ]
+        upserted = ITEMS_COLLECTION.bulk_write(requests, ordered=False).upserted_ids
+    except BulkWriteError as e:
+        # Unordered: the other upserts were applied, only these names were not
+        failed = {names[error["index"]] for error in e.details["writeErrors"]}
+        upserted = {doc["index"]: doc["_id"] for doc in e.details.get("upserted", [])}
+        logger.warning(
+            f"Checkout for user {user_id} failed for {sorted(failed)}; "
+            "their lines stay on the list"
+        )
+        _release_lines([line for line in lines if line["item_name"] in failed])
+        lines = [line for line in lines if line["item_name"] not in failed]
+    except Exception:
+        # Give the lines back so the checkout can be retried
+        _release_lines(lines)
+        raise
+
+    raced = [
+        name
+        for position, name in enumerate(deltas)
+        if position not in upserted and name not in previous and name not in failed
+    ]
+    if raced:
+        previous.update(_fix_raced_checkout(user_id, raced, deltas, new_ids))
+
+    items = []
+    for position, (name, delta) in enumerate(deltas.items()):
+        if name in failed:
+            continue
+        created = position in upserted
+        if not created and name not in previous:
+            # Created and deleted again by others while we checked out
+            logger.warning(f"Checked-out item {name!r} of user {user_id} is gone")
+            continue
+        item_id = upserted[position] if created else previous[name]["_id"]
+        invalidate_item(item_id)
+        items.append(
+            {"name": name, "delta": delta, "item_id": str(item_id), "created": created}
+        )
+    logger.info(
+        f"Checked out {len(lines)} shopping lines into {len(items)} items "
+        f"for user {user_id}"
+    )
+    return {"lines": len(lines), "items": items}, previous
+
+
 def clear_inventory():
     """
     Deletes all documents in the inventory collection.
     Useful for testing or resetting the DB.
     """
     result = ITEMS_COLLECTION.delete_many({})
+    ITEM_CACHE.clear()
+    SEARCH_INDEXES.clear()
     logger.info(f"Cleared {result.deleted_count} items from inventory.")
     return result.deleted_count
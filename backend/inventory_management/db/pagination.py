@@ -0,0 +1,82 @@
+# backend/inventory_management/db/pagination.py
+import base64
+from typing import Optional
+
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
+
+from .models import from_mongo
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a pagination cursor we did not issue."""
+
+
+def encode_cursor(last_id) -> str:
+    """Opaque cursor for the page that starts after last_id."""
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> ObjectId:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return ObjectId(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (InvalidId, ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor}") from e
+
+
+def decode_int_cursor(cursor: str) -> int:
+    """Last id from encode_cursor for stores keyed by integers."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor}") from e
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Opaque cursor for ranked results, which have no keyset to resume from."""
+    return encode_cursor(f"offset:{offset}")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, _, offset = (
+            base64.urlsafe_b64decode(padded.encode()).decode().partition(":")
+        )
+        if prefix == "offset" and offset.isdigit():
+            return int(offset)
+    except (ValueError, UnicodeDecodeError):
+        pass
+    raise InvalidCursorError(f"Invalid pagination cursor: {cursor}")
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def keyset_filter(filter: Optional[dict], cursor: Optional[str]) -> dict:
+    """Add the _id > last-seen condition to the caller's filter."""
+    query = dict(filter or {})
+    if cursor:
+        query["_id"] = {"$gt": decode_cursor(cursor)}
+    return query
+
+
+def build_page(docs: list, limit: int, model, validate: bool = False) -> dict:
+    """
+    Turn up to limit + 1 docs (sorted by _id) into a page. The extra doc
+    only signals that another page exists and is not returned.
+    """
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    return {
+        "items": [from_mongo(model, doc, validate) for doc in docs],
+        "next_cursor": encode_cursor(docs[-1]["_id"]) if has_more else None,
+    }
@@ -0,0 +1,239 @@
+# backend/inventory_management/db/repository.py
+import bisect
+import itertools
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict, is_dataclass
+from typing import Callable, List, Optional
+
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
+from pydantic import ValidationError
+
+from ..cqrs import comands
+from . import mongo_queries as mq
+from .models import InventoryItem, ShoppingListItem, validate_update
+from .pagination import clamp_page_size, decode_int_cursor, encode_cursor
+
+
+class InvalidItemError(ValueError):
+    """Raised when an item to add, or an update, does not fit the model."""
+
+
+class Repository(ABC):
+    """
+    Storage behind the /inventory and /shopping-list routers. Items are
+    plain dicts carrying their id under "id"; ids are opaque strings to
+    callers.
+
+    user_id is the caller: a multi-tenant backend only shows and changes
+    that user's items. The in-memory store is one shared demo list and
+    ignores it.
+    """
+
+    @abstractmethod
+    def list(self, user_id: str = None, cursor: str = None, limit: int = None) -> dict:
+        """One page: {"items": [...], "next_cursor": str | None}."""
+
+    @abstractmethod
+    def get(self, item_id: str, user_id: str = None) -> Optional[dict]: ...
+
+    @abstractmethod
+    def add(self, data: dict, user_id: str = None) -> dict: ...
+
+    @abstractmethod
+    def update(
+        self, item_id: str, data: dict, user_id: str = None
+    ) -> Optional[dict]: ...
+
+    @abstractmethod
+    def delete(self, item_id: str, user_id: str = None) -> bool: ...
+
+    @abstractmethod
+    def version(self, user_id: str = None):
+        """Token that changes on every successful write."""
+
+
+class InMemoryRepository(Repository):
+    """
+    Dict-indexed store: get/update/delete are O(1) and ids come from a
+    monotonic counter, so they are never reused after a delete. A page
+    starts with a binary search of the ascending key list for its cursor
+    and reads just limit + 1 live items from there. Versions
+    carry a per-instance epoch, so two workers (or one restarted) never
+    hand out the same token for different contents.
+    """
+
+    def __init__(self, seed: List[dict] = None):
+        self._items = {}
+        # Every key added, ascending; deleted ones are skipped until compacted
+        self._keys = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._epoch = str(ObjectId())
+        self._version = 0
+        for data in seed or []:
+            self.add(data)
+
+    @staticmethod
+    def _key(item_id) -> Optional[int]:
+        try:
+            return int(item_id)
+        except (TypeError, ValueError):
+            return None
+
+    def list(self, user_id: str = None, cursor: str = None, limit: int = None) -> dict:
+        limit = clamp_page_size(limit)
+        after = decode_int_cursor(cursor) if cursor else 0
+        with self._lock:
+            keys = self._keys
+            live = (
+                self._items[keys[index]]
+                for index in range(bisect.bisect_right(keys, after), len(keys))
+                if keys[index] in self._items
+            )
+            items = list(itertools.islice(live, limit + 1))
+        page = items[:limit]
+        return {
+            "items": page,
+            "next_cursor": (
+                encode_cursor(page[-1]["id"]) if len(items) > limit else None
+            ),
+        }
+
+    def get(self, item_id: str, user_id: str = None) -> Optional[dict]:
+        return self._items.get(self._key(item_id))
+
+    def add(self, data: dict, user_id: str = None) -> dict:
+        with self._lock:
+            key = next(self._ids)
+            item = {**data, "id": key}
+            self._items[key] = item
+            self._keys.append(key)
+            self._version += 1
+        return item
+
+    def update(self, item_id: str, data: dict, user_id: str = None) -> Optional[dict]:
+        key = self._key(item_id)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            item.update(data)
+            item["id"] = key
+            self._version += 1
+        return item
+
+    def delete(self, item_id: str, user_id: str = None) -> bool:
+        with self._lock:
+            deleted = self._items.pop(self._key(item_id), None) is not None
+            if deleted:
+                self._version += 1
+                if len(self._keys) > 2 * len(self._items) + 64:
+                    self._keys = [key for key in self._keys if key in self._items]
+            return deleted
+
+    def version(self, user_id: str = None) -> str:
+        return f"{self._epoch}.{self._version}"
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def _as_dict(item) -> dict:
+    return asdict(item) if is_dataclass(item) else item.model_dump()
+
+
+class MongoRepository(Repository):
+    """
+    Mongo-backed store for one model. Reads go to mongo_queries, scoped to
+    the caller; writes go through the CQRS commands, so they keep the
+    search index, versions and item events up to date exactly as the /api
+    routes do. Every call needs a user_id.
+    """
+
+    def __init__(
+        self,
+        model,
+        scope: str,
+        create: Callable,
+        get: Callable,
+        list_page: Callable,
+        update: Callable,
+        delete: Callable,
+    ):
+        self.model = model
+        self.scope = scope
+        self._create = create
+        self._get = get
+        self._list_page = list_page
+        self._update = update
+        self._delete = delete
+
+    def list(self, user_id: str = None, cursor: str = None, limit: int = None) -> dict:
+        page = self._list_page({"user_id": user_id}, cursor=cursor, limit=limit)
+        return {**page, "items": [_as_dict(item) for item in page["items"]]}
+
+    def get(self, item_id: str, user_id: str = None) -> Optional[dict]:
+        try:
+            item = self._get(item_id)
+        except InvalidId:
+            return None
+        if not item or item.user_id != user_id:
+            return None
+        return {**_as_dict(item), "id": item_id}
+
+    def add(self, data: dict, user_id: str = None) -> dict:
+        fields = {k: v for k, v in data.items() if k != "id"}
+        try:
+            item = self.model(**{**fields, "user_id": user_id})
+        except ValidationError as e:
+            raise InvalidItemError(str(e)) from e
+        item_id = self._create(item.to_dict())
+        return {**_as_dict(item), "id": item_id}
+
+    def update(self, item_id: str, data: dict, user_id: str = None) -> Optional[dict]:
+        try:
+            fields = validate_update(
+                self.model, {k: v for k, v in data.items() if k != "id"}
+            )
+        except ValueError as e:
+            raise InvalidItemError(str(e)) from e
+        try:
+            item = self._update(item_id, fields, user_id)
+        except InvalidId:
+            return None
+        return {**_as_dict(item), "id": item_id} if item else None
+
+    def delete(self, item_id: str, user_id: str = None) -> bool:
+        try:
+            return bool(self._delete(item_id, user_id))
+        except InvalidId:
+            return False
+
+    def version(self, user_id: str = None) -> str:
+        return mq.get_version(self.scope, user_id)
+
+
+def mongo_inventory_repository() -> MongoRepository:
+    return MongoRepository(
+        InventoryItem,
+        mq.ITEMS_VERSION,
+        create=comands.create_item,
+        get=mq.get_item_by_id,
+        list_page=mq.list_items_page,
+        update=comands.update_inventory_item,
+        delete=comands.delete_inventory_item,
+    )
+
+
+def mongo_shopping_repository() -> MongoRepository:
+    return MongoRepository(
+        ShoppingListItem,
+        mq.SHOPPING_LIST_VERSION,
+        create=comands.add_shopping_item,
+        get=mq.get_shopping_item_by_id,
+        list_page=mq.list_shopping_items_page,
+        update=comands.update_shopping_list_item,
+        delete=comands.remove_shopping_list_item,
+    )
@@ -0,0 +1,361 @@
+# backend/inventory_management/db/search.py
+import bisect
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Minimum trigram similarity (|shared| / |union|) for a typo-tolerant match
+MIN_SIMILARITY = 0.3
+# Tokens shorter than this only match the start of words: no inner
+# substrings and no typo tolerance, which would match nearly everything
+MIN_FUZZY_LENGTH = 3
+
+# How a query token matched a vocabulary word, best first
+EXACT, PREFIX, SUBSTRING, FUZZY = range(4)
+
+_WORDS = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse everything that is not a word character."""
+    return " ".join(_WORDS.findall((text or "").lower()))
+
+
+def trigrams(text: str, padded: bool = True) -> set:
+    """
+    Character trigrams of an already normalized string. Padding marks the
+    start and end of the word, so "apple" yields "  a", " ap", ..., "le ".
+    """
+    if padded:
+        text = f"  {text} "
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    """
+    In-process search index over one user's item names.
+
+    Names are normalized and split into words. Each vocabulary word keeps
+    the sorted list of names that contain it, and the vocabulary itself is
+    kept sorted (prefix matches are a bisect range scan) and posted under
+    its trigrams (substring and typo-tolerant matches). Matching query
+    tokens against the vocabulary rather than against every name keeps
+    lookups proportional to the vocabulary, which grows far slower than the
+    item count.
+    """
+
+    def __init__(self):
+        # Writes come from command threads while searches run; neither is
+        # long enough for finer-grained locking to pay off
+        self._lock = threading.RLock()
+        self._name_by_id = {}
+        self._ids_by_name = defaultdict(set)
+        self._sorted = []
+        self._names_by_word = {}
+        self._vocab = []
+        self._postings = defaultdict(set)
+        self._gram_count = {}
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[str, str]]) -> "NameIndex":
+        """Build from (item_id, name) pairs, sorting once instead of per insert."""
+        index = cls()
+        for item_id, name in items:
+            key = normalize(name)
+            index._name_by_id[item_id] = key
+            index._ids_by_name[key].add(item_id)
+        index._sorted = sorted(index._ids_by_name)
+        names_by_word = defaultdict(list)
+        for key in index._sorted:  # sorted, so every word list comes out sorted
+            for word in set(key.split()):
+                names_by_word[word].append(key)
+        index._names_by_word = dict(names_by_word)
+        index._vocab = sorted(names_by_word)
+        for word in index._vocab:
+            index._post(word)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._name_by_id)
+
+    def _post(self, word: str) -> None:
+        grams = trigrams(word)
+        for gram in grams:
+            self._postings[gram].add(word)
+        self._gram_count[word] = len(grams)
+
+    def _unpost(self, word: str) -> None:
+        for gram in trigrams(word):
+            words = self._postings[gram]
+            words.discard(word)
+            if not words:
+                del self._postings[gram]
+        del self._gram_count[word]
+
+    def _add_name(self, key: str) -> None:
+        bisect.insort(self._sorted, key)
+        for word in set(key.split()):
+            names = self._names_by_word.get(word)
+            if names is None:
+                names = self._names_by_word[word] = []
+                bisect.insort(self._vocab, word)
+                self._post(word)
+            bisect.insort(names, key)
+
+    def _remove_name(self, key: str) -> None:
+        del self._sorted[bisect.bisect_left(self._sorted, key)]
+        for word in set(key.split()):
+            names = self._names_by_word[word]
+            del names[bisect.bisect_left(names, key)]
+            if not names:
+                del self._names_by_word[word]
+                del self._vocab[bisect.bisect_left(self._vocab, word)]
+                self._unpost(word)
+
+    def add(self, item_id: str, name: str) -> None:
+        key = normalize(name)
+        with self._lock:
+            old = self._name_by_id.get(item_id)
+            if old == key:
+                return
+            if old is not None:
+                self.remove(item_id)
+            self._name_by_id[item_id] = key
+            ids = self._ids_by_name[key]
+            if not ids:  # first item with this name
+                self._add_name(key)
+            ids.add(item_id)
+
+    def remove(self, item_id: str) -> None:
+        with self._lock:
+            key = self._name_by_id.pop(item_id, None)
+            if key is None:
+                return
+            ids = self._ids_by_name[key]
+            ids.discard(item_id)
+            if not ids:
+                del self._ids_by_name[key]
+                self._remove_name(key)
+
+    def apply(self, changes: Iterable[Tuple[str, Optional[dict], Optional[dict]]]):
+        """
+        Apply (item_id, before, after) item changes as the commands see
+        them; after=None is a delete.
+        """
+        with self._lock:
+            for item_id, _, after in changes:
+                if after is None:
+                    self.remove(item_id)
+                elif "name" in after:
+                    self.add(item_id, after["name"])
+
+    # -------------------- Matching --------------------
+    def _name_prefix(self, query: str) -> Iterator[str]:
+        position = bisect.bisect_left(self._sorted, query)
+        while position < len(self._sorted):
+            key = self._sorted[position]
+            if not key.startswith(query):
+                return
+            yield key
+            position += 1
+
+    def _word_matches(self, token: str) -> List[Tuple[int, str]]:
+        """Vocabulary words token matches, as (EXACT..FUZZY, word), best first."""
+        matches = [(EXACT, token)] if token in self._names_by_word else []
+        prefixed = []
+        position = bisect.bisect_left(self._vocab, token)
+        while position < len(self._vocab) and self._vocab[position].startswith(token):
+            if self._vocab[position] != token:
+                prefixed.append(self._vocab[position])
+            position += 1
+        matches += [(PREFIX, word) for word in sorted(prefixed, key=len)]
+        if len(token) < MIN_FUZZY_LENGTH:
+            return matches
+
+        postings = sorted(
+            (self._postings.get(gram, set()) for gram in trigrams(token, False)),
+            key=len,
+        )
+        inner = set(postings[0]).intersection(*postings[1:])
+        matches += [
+            (SUBSTRING, word)
+            for word in sorted(inner, key=len)
+            if token in word and not word.startswith(token)
+        ]
+
+        grams = trigrams(token)
+        shared = defaultdict(int)
+        for gram in grams:
+            for word in self._postings.get(gram, ()):
+                shared[word] += 1
+        matched = {word for _, word in matches}
+        scored = []
+        for word, count in shared.items():
+            similarity = count / (len(grams) + self._gram_count[word] - count)
+            if similarity >= MIN_SIMILARITY and word not in matched:
+                scored.append((-similarity, word))
+        return matches + [(FUZZY, word) for _, word in sorted(scored)]
+
+    def _ranked_names(self, query: str) -> Iterator[str]:
+        """
+        Names starting with the whole query (exact match first), then names
+        where every token matches a word exactly, by prefix or as a
+        substring, then names that need a typo-tolerant match for a token.
+        """
+        seen = set()
+        for key in self._name_prefix(query):
+            seen.add(key)
+            yield key
+
+        matches = {token: self._word_matches(token) for token in query.split()}
+        if not all(matches.values()):
+            return
+        # Walk the names of the token with the fewest, checking the others
+        driver = min(
+            matches,
+            key=lambda t: sum(len(self._names_by_word[w]) for _, w in matches[t]),
+        )
+        others = [token for token in matches if token != driver]
+        for max_kind in (SUBSTRING, FUZZY):
+            allowed = {
+                token: {word for kind, word in matches[token] if kind <= max_kind}
+                for token in others
+            }
+            for kind, word in matches[driver]:
+                if kind > max_kind:
+                    break
+                for key in self._names_by_word[word]:
+                    if key in seen:
+                        continue
+                    words = key.split()
+                    if all(not allowed[t].isdisjoint(words) for t in others):
+                        seen.add(key)
+                        yield key
+
+    def search(self, query: str, limit: int, offset: int = 0) -> List[str]:
+        """
+        Item ids whose names match query, best first. Names are generated
+        lazily, so only as many are ranked as it takes to fill offset + limit.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        wanted = offset + limit
+        ids = []
+        with self._lock:
+            for key in self._ranked_names(query):
+                ids.extend(sorted(self._ids_by_name[key]))
+                if len(ids) >= wanted:
+                    break
+        return ids[offset:wanted]
+
+
+def next_version(token: str) -> Optional[str]:
+    """The token bump_version() produces next, if nothing else writes first."""
+    epoch, _, version = token.rpartition(".")
+    if not epoch:
+        return None
+    return f"{epoch}.{int(version) + 1}"
+
+
+class SearchIndexes:
+    """
+    Per-user NameIndex instances, each tagged with the items version token
+    (see mongo_queries.get_version) it reflects, least recently used first
+    out once max_users are held.
+
+    Commands in this process keep an index current through apply(). A write
+    this process did not see (another worker, a direct write) leaves the tag
+    behind the stored version; the next search is then answered from the
+    stale index while a background thread rebuilds it. Only a user's first
+    search waits for a build.
+    """
+
+    def __init__(self, max_users: int = 16):
+        self.max_users = max_users
+        self._entries = OrderedDict()  # user_id -> [version, NameIndex]
+        self._lock = threading.Lock()
+        self._build_locks = defaultdict(threading.Lock)
+        self._rebuilding = set()
+        self.builds = 0
+        self.stale_reads = 0
+
+    def tracks(self, user_id: str) -> bool:
+        return user_id in self._entries
+
+    def _build(self, user_id: str, version: str, build) -> NameIndex:
+        index = build()
+        with self._lock:
+            self.builds += 1
+            self._entries[user_id] = [version, index]
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return index
+
+    def _rebuild(self, user_id: str, version: str, build) -> None:
+        try:
+            with self._build_locks[user_id]:
+                self._build(user_id, version, build)
+        finally:
+            with self._lock:
+                self._rebuilding.discard(user_id)
+
+    def get_or_build(
+        self, user_id: str, version: str, build: Callable[[], NameIndex]
+    ) -> NameIndex:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+                if entry[0] != version:
+                    self.stale_reads += 1
+                    if user_id not in self._rebuilding:
+                        self._rebuilding.add(user_id)
+                        threading.Thread(
+                            target=self._rebuild,
+                            args=(user_id, version, build),
+                            name=f"search-index-{user_id}",
+                            daemon=True,
+                        ).start()
+                return entry[1]
+        # First search for this user: build now; concurrent ones wait for it
+        with self._build_locks[user_id]:
+            with self._lock:
+                entry = self._entries.get(user_id)
+            if entry is not None:
+                return entry[1]
+            return self._build(user_id, version, build)
+
+    def apply(self, user_id: str, changes: list, version: str) -> bool:
+        """
+        Apply changes made by this process's write, which moved the user's
+        version to version. The index only takes the new version if no other
+        write got in between; otherwise it stays due for a rebuild. Returns
+        whether the index is current.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return False
+            entry[1].apply(changes)
+            if version != next_version(entry[0]):
+                return False
+            entry[0] = version
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._entries),
+                "max_users": self.max_users,
+                "items": sum(len(index) for _, index in self._entries.values()),
+                "builds": self.builds,
+                "stale_reads": self.stale_reads,
+                "rebuilding": len(self._rebuilding),
+            }
@@ -0,0 +1,52 @@
+# backend/inventory_management/db/summary.py
+from typing import Dict, Optional
+
+UNCATEGORIZED = "uncategorized"
+
+
+def category_key(category_id: Optional[str]) -> str:
+    """Field-name-safe key for units_by_category ('.' and '$' are reserved)."""
+    if not category_id:
+        return UNCATEGORIZED
+    return str(category_id).replace(".", "_").replace("$", "_")
+
+
+def empty_summary(user_id: str) -> dict:
+    return {
+        "user_id": user_id,
+        "item_count": 0,
+        "total_units": 0,
+        "zero_stock_count": 0,
+        "units_by_category": {},
+    }
+
+
+def _contribution(item: Optional[dict]) -> Dict[str, int]:
+    """What a single item state adds to its owner's summary."""
+    if not item:
+        return {}
+    quantity = item.get("quantity", 0) or 0
+    return {
+        "item_count": 1,
+        "total_units": quantity,
+        "zero_stock_count": 1 if quantity <= 0 else 0,
+        f"units_by_category.{category_key(item.get('category_id'))}": quantity,
+    }
+
+
+def summary_delta(before: Optional[dict], after: Optional[dict]) -> Dict[str, int]:
+    """
+    $inc document that moves a summary from an item's before-state to its
+    after-state. None means the item does not exist (create / delete).
+    """
+    delta = dict(_contribution(after))
+    for field, value in _contribution(before).items():
+        delta[field] = delta.get(field, 0) - value
+    return {field: value for field, value in delta.items() if value}
+
+
+def merge_deltas(total: Dict[str, int], delta: Dict[str, int]) -> Dict[str, int]:
+    merged = dict(total)
+    for field, value in delta.items():
+        merged[field] = merged.get(field, 0) + value
+    return {field: value for field, value in merged.items() if value}
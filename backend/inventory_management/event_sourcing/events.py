@@ -1,38 +1,93 @@
-import os
 from datetime import datetime
-from typing import Dict
-from pymongo import MongoClient
+from typing import Dict, List, Tuple
+from pymongo import ReturnDocument
+from shared_utils.db.mongo_client import get_async_collection, get_collection
 from shared_utils.logging.logger import get_logger
-from dotenv import load_dotenv
-from pathlib import Path
-
-# Load dev.env from repo root
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[3] / "dev.env")
 
 logger = get_logger("events")
 
-# -------------------- MongoDB Connection from dev.env --------------------
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = int(os.getenv("DB_PORT", 27017))
-DB_NAME = os.getenv("DB_NAME", "inventory_db")
-DB_USER = os.getenv("DB_USER", "")
-DB_PASS = os.getenv("DB_PASS", "")
+events_collection = get_collection("events")  # default collection name
+async_events_collection = get_async_collection("events")
+counters_collection = get_collection("counters")
+async_counters_collection = get_async_collection("counters")
+
+# Every event gets the next position in one global sequence, so consumers
+# (see projector.py) can read the stream in order and checkpoint where they
+# stopped. Positions are reserved before the insert, so two writers can
+# commit out of order; readers treat a missing position as in flight.
+POSITION_COUNTER = "events"
+
+
+def _reserve_positions(count: int) -> int:
+    """Reserve count consecutive positions and return the first."""
+    doc = counters_collection.find_one_and_update(
+        {"_id": POSITION_COUNTER},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["seq"] - count + 1
+
+
+async def _reserve_positions_async(count: int) -> int:
+    doc = await async_counters_collection.find_one_and_update(
+        {"_id": POSITION_COUNTER},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["seq"] - count + 1
+
 
-if DB_USER and DB_PASS:
-    MONGO_URI = f"mongodb://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}"
-else:
-    MONGO_URI = f"mongodb://{DB_HOST}:{DB_PORT}"
+def _event_docs(events: List[Tuple[str, Dict]], first: int) -> List[Dict]:
+    now = datetime.utcnow()
+    return [
+        {
+            "seq": first + offset,
+            "type": event_type,
+            "payload": payload,
+            "timestamp": now,
+        }
+        for offset, (event_type, payload) in enumerate(events)
+    ]
+
+
+def outbox_event_docs(entries: List[Dict]) -> List[Dict]:
+    """
+    Event documents for relayed outbox entries, numbered with the next
+    positions in the stream. Each keeps its entry's _id, so storing the
+    same entry twice is rejected by the _id index.
+    """
+    first = _reserve_positions(len(entries))
+    return [
+        {
+            "_id": entry["_id"],
+            "seq": first + offset,
+            "type": entry["type"],
+            "payload": entry["payload"],
+            "timestamp": entry["at"],
+        }
+        for offset, entry in enumerate(entries)
+    ]
 
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
 
-events_collection = db["events"]  # default collection name
+def store_events(event_docs: List[Dict]) -> None:
+    """Insert prepared event documents with one unordered insert_many."""
+    if not event_docs:
+        return
+    try:
+        events_collection.insert_many(event_docs, ordered=False)
+        logger.info(f"Stored {len(event_docs)} relayed events")
+    except Exception as e:
+        logger.error(f"Failed to store {len(event_docs)} events: {e}", exc_info=True)
+        raise
 
 
 def record_event(event_type: str, payload: Dict):
     """Record an event in MongoDB with logging."""
     try:
         event_doc = {
+            "seq": _reserve_positions(1),
             "type": event_type,
             "payload": payload,
             "timestamp": datetime.utcnow(),
@@ -45,3 +100,30 @@ def record_event(event_type: str, payload: Dict):
             exc_info=True,
         )
         raise
+
+
+def record_events(events: List[Tuple[str, Dict]]):
+    """Record several (event_type, payload) events with one insert_many."""
+    if not events:
+        return
+    try:
+        event_docs = _event_docs(events, _reserve_positions(len(events)))
+        result = events_collection.insert_many(event_docs)
+        logger.info(f"Recorded {len(result.inserted_ids)} events in batch")
+    except Exception as e:
+        logger.error(f"Failed to record {len(events)} events: {e}", exc_info=True)
+        raise
+
+
+async def record_events_async(events: List[Tuple[str, Dict]]):
+    """Motor version of record_events for code running on the event loop."""
+    if not events:
+        return
+    try:
+        first = await _reserve_positions_async(len(events))
+        event_docs = _event_docs(events, first)
+        result = await async_events_collection.insert_many(event_docs)
+        logger.info(f"Recorded {len(result.inserted_ids)} events in batch")
+    except Exception as e:
+        logger.error(f"Failed to record {len(events)} events: {e}", exc_info=True)
+        raise
@@ -0,0 +1,68 @@
+# backend/inventory_management/event_sourcing/lease.py
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from shared_utils.logging.logger import get_logger
+
+logger = get_logger("lease")
+
+
+class Lease:
+    """
+    Time-limited ownership of a named background job, kept in one document
+    so that only one process across all workers runs the job at a time.
+
+    The holder renews by calling acquire() again before seconds pass; once
+    a lease lapses anyone may take it over. The same document carries the
+    job's own state (a checkpoint, say), written through update() so that
+    a process which lost the lease cannot overwrite its successor's.
+    """
+
+    def __init__(self, collection, name: str, seconds: float = 30.0):
+        self.collection = collection
+        self.name = name
+        self.seconds = seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.held = False
+
+    def acquire(self) -> Optional[dict]:
+        """Take or renew the lease; returns its document, or None if held elsewhere."""
+        now = datetime.now(timezone.utc)
+        try:
+            doc = self.collection.find_one_and_update(
+                {
+                    "_id": self.name,
+                    "$or": [{"owner": self.owner}, {"lease_until": {"$lt": now}}],
+                },
+                {
+                    "$set": {
+                        "owner": self.owner,
+                        "lease_until": now + timedelta(seconds=self.seconds),
+                    }
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # The document exists with someone else's live lease
+            self.held = False
+            return None
+        if not self.held:
+            logger.info(f"{self.owner} took the {self.name} lease")
+        self.held = True
+        return doc
+
+    def update(self, fields: dict) -> bool:
+        """Set fields on the lease document, only while still holding it."""
+        result = self.collection.update_one(
+            {"_id": self.name, "owner": self.owner}, {"$set": fields}
+        )
+        if result.matched_count != 1:
+            logger.warning(f"{self.owner} lost the {self.name} lease")
+            self.held = False
+            return False
+        return True
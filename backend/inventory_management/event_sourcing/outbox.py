@@ -0,0 +1,346 @@
+# backend/inventory_management/event_sourcing/outbox.py
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+from shared_utils.db.mongo_client import get_collection
+from shared_utils.logging.logger import get_logger
+
+from ..db.mongo_queries import (
+    CATEGORIES_COLLECTION,
+    ITEMS_COLLECTION,
+    LOCATIONS_COLLECTION,
+    OUTBOX_COLLECTION,
+    _object_ids,
+)
+from .events import events_collection, outbox_event_docs, store_events
+from .lease import Lease
+
+logger = get_logger("outbox")
+
+RELAY = "outbox_relay"
+
+
+def _age_seconds(at: datetime) -> float:
+    # pymongo hands back naive UTC datetimes unless the client is tz_aware
+    return (datetime.utcnow() - at.replace(tzinfo=None)).total_seconds()
+
+
+def _ack_pipeline(entry_ids: list, seq: int) -> list:
+    """
+    Update pipeline that drops relayed entries from an item's outbox and
+    clears _pending once nothing is left. Entries appended after the relay
+    read the item are kept. The item keeps the highest position its events
+    were relayed at (_relayed_seq), which a projector snapshot reads to tell
+    which events the item already reflects.
+    """
+    remaining = {
+        "$filter": {
+            "input": {"$ifNull": ["$_outbox", []]},
+            "as": "entry",
+            "cond": {"$not": [{"$in": ["$$entry._id", entry_ids]}]},
+        }
+    }
+    empty = {"$eq": [{"$size": "$_outbox"}, 0]}
+    relayed = {"$max": [{"$ifNull": ["$_relayed_seq", 0]}, seq]}
+    return [
+        {"$set": {"_outbox": remaining, "_relayed_seq": relayed}},
+        {
+            "$set": {
+                "_outbox": {"$cond": [empty, "$$REMOVE", "$_outbox"]},
+                "_pending": {"$cond": [empty, "$$REMOVE", True]},
+            }
+        },
+    ]
+
+
+def order_entries(items: List[dict], rows: List[dict]) -> List[dict]:
+    """
+    One flat list of outbox entries to relay: each item's entries in the
+    order they were appended (items by their oldest entry), then the outbox
+    collection rows. Entries seen twice (copied ahead of an item delete) are
+    kept once.
+    """
+    items = sorted(items, key=lambda doc: doc["_outbox"][0]["at"])
+    seen = set()
+    ordered = []
+    for entry in [entry for doc in items for entry in doc["_outbox"]] + rows:
+        if entry["_id"] not in seen:
+            seen.add(entry["_id"])
+            ordered.append(entry)
+    return ordered
+
+
+class OutboxRelay:
+    """
+    Moves outbox entries to the event store, and to the message exchange
+    when publish is given, in batches.
+
+    Each run reads up to batch_size items with pending entries and up to
+    batch_size outbox rows, reserves positions for the whole batch at once,
+    publishes, stores, and only then removes the entries. A crash anywhere
+    in between relays the batch again: entries already in the store are
+    skipped by _id, and the exchange is at-least-once.
+
+    A delete's ItemDeleted row is written before the item is deleted, so a
+    row whose item still exists is held back; after delete_grace seconds
+    the delete is taken to have failed and the row is dropped. Rename rows
+    are written ahead the same way and held until the category or location
+    has the new name.
+
+    Only the holder of the relay lease runs, so positions are handed out
+    by one process at a time and the stream has no gaps from racing relays.
+    """
+
+    def __init__(
+        self,
+        items=None,
+        outbox=None,
+        events=None,
+        leases=None,
+        categories=None,
+        locations=None,
+        publish: Optional[Callable[[list], None]] = None,
+        batch_size: int = 500,
+        delete_grace: float = 30.0,
+        lease_seconds: float = 30.0,
+    ):
+        self.items = items if items is not None else ITEMS_COLLECTION
+        self.outbox = outbox if outbox is not None else OUTBOX_COLLECTION
+        self.events = events if events is not None else events_collection
+        self.catalog = {
+            "CategoryRenamed": (
+                "category_id",
+                categories if categories is not None else CATEGORIES_COLLECTION,
+            ),
+            "LocationRenamed": (
+                "location_id",
+                locations if locations is not None else LOCATIONS_COLLECTION,
+            ),
+        }
+        leases = leases if leases is not None else get_collection("leases")
+        self.lease = Lease(leases, RELAY, lease_seconds)
+        self.publish = publish
+        self.batch_size = batch_size
+        self.delete_grace = delete_grace
+        self.relayed = 0
+        self.published = 0
+        self.batches = 0
+        self.held_deletes = 0
+        self.dropped_deletes = 0
+        self.held_renames = 0
+        self.dropped_renames = 0
+        self.last_batch_ms = 0.0
+
+    def _read(self):
+        items = list(
+            self.items.find({"_pending": True}, {"_outbox": 1}).limit(self.batch_size)
+        )
+        items = [doc for doc in items if doc.get("_outbox")]
+        rows = list(
+            self.outbox.find().sort([("at", 1), ("_id", 1)]).limit(self.batch_size)
+        )
+        return items, rows
+
+    def _alive(self, rows: List[dict]) -> set:
+        """Ids of items whose ItemDeleted row is in rows but which still exist."""
+        ids = _object_ids(
+            row["payload"]["item_id"] for row in rows if row["type"] == "ItemDeleted"
+        )
+        if not ids:
+            return set()
+        return {
+            str(doc["_id"])
+            for doc in self.items.find({"_id": {"$in": ids}}, {"_id": 1})
+        }
+
+    def _unrenamed(self, rows: List[dict]) -> set:
+        """Ids of rename rows whose category or location does not have the name yet."""
+        pending = set()
+        for kind, (field, collection) in self.catalog.items():
+            renames = [row for row in rows if row["type"] == kind]
+            if not renames:
+                continue
+            ids = _object_ids(row["payload"][field] for row in renames)
+            names = {
+                str(doc["_id"]): doc.get("name")
+                for doc in collection.find({"_id": {"$in": ids}}, {"name": 1})
+            }
+            pending.update(
+                row["_id"]
+                for row in renames
+                if names.get(row["payload"][field]) != row["payload"]["name"]
+            )
+        return pending
+
+    def _ready_rows(self, rows: List[dict]):
+        """Split outbox rows into (ready to relay, rows of failed changes to drop)."""
+        alive = self._alive(rows)
+        unrenamed = self._unrenamed(rows)
+        ready, dropped = [], []
+        self.held_deletes = 0
+        self.held_renames = 0
+        for row in rows:
+            payload = row["payload"]
+            if row["type"] == "ItemDeleted" and payload["item_id"] in alive:
+                deleted = True
+                reason = f"ItemDeleted for {payload['item_id']}: the item still exists"
+            elif row["_id"] in unrenamed:
+                deleted = False
+                reason = f"{row['type']} to {payload['name']!r}: the name was not set"
+            else:
+                ready.append(row)
+                continue
+            if _age_seconds(row["at"]) >= self.delete_grace:
+                logger.warning(f"Dropping {reason} after {self.delete_grace}s")
+                dropped.append(row)
+            elif deleted:
+                self.held_deletes += 1
+            else:
+                self.held_renames += 1
+        return ready, dropped
+
+    def _ack(
+        self, items: List[dict], rows: List[dict], dropped: List[dict], seqs: dict
+    ) -> None:
+        """Remove relayed entries; seqs maps each entry id to its position."""
+        if items:
+            self.items.bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": doc["_id"]},
+                        _ack_pipeline(
+                            [entry["_id"] for entry in doc["_outbox"]],
+                            max(seqs[entry["_id"]] for entry in doc["_outbox"]),
+                        ),
+                    )
+                    for doc in items
+                ],
+                ordered=False,
+            )
+        row_ids = [row["_id"] for row in rows + dropped]
+        if row_ids:
+            self.outbox.delete_many({"_id": {"$in": row_ids}})
+
+    def run_once(self) -> int:
+        """
+        Relay one batch, if this process holds the lease.
+
+        Returns:
+            int: number of outbox entries handled
+        """
+        if self.lease.acquire() is None:
+            return 0
+        started = time.monotonic()
+        items, rows = self._read()
+        rows, dropped = self._ready_rows(rows)
+        entries = order_entries(items, rows)
+        if not entries and not dropped:
+            return 0
+
+        ids = [entry["_id"] for entry in entries]
+        seqs = {
+            doc["_id"]: doc["seq"]
+            for doc in self.events.find({"_id": {"$in": ids}}, {"seq": 1})
+        }
+        fresh = [entry for entry in entries if entry["_id"] not in seqs]
+        if fresh:
+            event_docs = outbox_event_docs(fresh)
+            seqs.update((doc["_id"], doc["seq"]) for doc in event_docs)
+            # Publish first: if storing fails the batch is published again,
+            # but nothing is stored that was never published
+            if self.publish is not None:
+                self.publish(event_docs)
+                self.published += len(event_docs)
+            store_events(event_docs)
+        self._ack(items, rows, dropped, seqs)
+
+        self.relayed += len(fresh)
+        for row in dropped:
+            if row["type"] == "ItemDeleted":
+                self.dropped_deletes += 1
+            else:
+                self.dropped_renames += 1
+        self.batches += 1
+        self.last_batch_ms = (time.monotonic() - started) * 1000
+        return len(entries) + len(dropped)
+
+    def run_forever(self, stop: threading.Event, interval: float) -> None:
+        """Poll until stop is set; a full batch is followed up immediately."""
+        logger.info(f"Outbox relay {self.lease.owner} started")
+        while not stop.is_set():
+            try:
+                handled = self.run_once()
+            except Exception as e:
+                # Broker outages land here too; the batch is retried
+                logger.error(f"Outbox relay batch failed: {e}", exc_info=True)
+                handled = 0
+            if handled < self.batch_size:
+                stop.wait(interval)
+        logger.info(f"Outbox relay {self.lease.owner} stopped")
+
+    def stats(self) -> dict:
+        return {
+            "leader": self.lease.held,
+            "relayed": self.relayed,
+            "published": self.published,
+            "batches": self.batches,
+            "avg_batch_size": (
+                round(self.relayed / self.batches, 1) if self.batches else 0.0
+            ),
+            "last_batch_ms": round(self.last_batch_ms, 2),
+            "held_deletes": self.held_deletes,
+            "dropped_deletes": self.dropped_deletes,
+            "held_renames": self.held_renames,
+            "dropped_renames": self.dropped_renames,
+        }
+
+    def pending(self) -> dict:
+        """How much is waiting to be relayed (two count queries)."""
+        try:
+            return {
+                "items": self.items.count_documents({"_pending": True}),
+                "rows": self.outbox.count_documents({}),
+            }
+        except PyMongoError as e:
+            return {"error": str(e)}
+
+
+# -------------------- Background Runner --------------------
+_relay: Optional[OutboxRelay] = None
+_stop = threading.Event()
+
+
+def start_relay_in_background(
+    interval: float,
+    batch_size: int = 500,
+    delete_grace: float = 30.0,
+    publish: Optional[Callable[[list], None]] = None,
+) -> threading.Thread:
+    """Run an OutboxRelay on a daemon thread until stop_relay()."""
+    global _relay
+    _relay = OutboxRelay(
+        publish=publish, batch_size=batch_size, delete_grace=delete_grace
+    )
+    _stop.clear()
+    thread = threading.Thread(
+        target=_relay.run_forever,
+        args=(_stop, interval),
+        name="outbox-relay",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def stop_relay() -> None:
+    _stop.set()
+
+
+def relay_stats() -> dict:
+    if _relay is None:
+        return {"running": False}
+    return {**_relay.stats(), "pending": _relay.pending()}
@@ -0,0 +1,725 @@
+# backend/inventory_management/event_sourcing/projector.py
+import argparse
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
+from pymongo import DeleteOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+from shared_utils.db.mongo_client import get_collection
+from shared_utils.logging.logger import get_logger
+
+from ..db.mongo_queries import (
+    CATEGORY_CACHE,
+    ITEMS_COLLECTION,
+    LOCATION_CACHE,
+    SUMMARY_COLLECTION,
+    _object_ids,
+    get_categories_by_ids,
+    get_locations_by_ids,
+    rebuild_inventory_summaries,
+)
+from ..db.summary import merge_deltas, summary_delta
+from .lease import Lease
+
+logger = get_logger("projector")
+
+# Checkpoint document id, and the name of the collection it maintains
+PROJECTION = "inventory_view"
+# Item fields copied into the view; the rest of an event payload is ignored
+VIEW_FIELDS = ("user_id", "name", "quantity", "category_id", "location_id")
+# What a snapshot reads of an item: its view fields plus what tells which
+# of its events it already reflects (see InventoryProjector.snapshot)
+SNAPSHOT_FIELDS = {
+    **{name: 1 for name in VIEW_FIELDS},
+    "updated_at": 1,
+    "_relayed_seq": 1,
+    "_outbox._id": 1,
+}
+REBUILD_BATCH_SIZE = 1000
+# Catalog renames: event type -> (id field, name field) of the view rows
+RENAMES = {
+    "CategoryRenamed": ("category_id", "category_name"),
+    "LocationRenamed": ("location_id", "location_name"),
+}
+# Numbered log of what each applied batch changed; see ChangeFollower
+CHANGES_COLLECTION = "projection_changes"
+
+
+# -------------------- Event -> View Operations --------------------
+def _view_fields(fields: dict, categories: dict, locations: dict) -> dict:
+    view = {name: fields[name] for name in VIEW_FIELDS if name in fields}
+    if "category_id" in view:
+        view["category_name"] = categories.get(view["category_id"])
+    if "location_id" in view:
+        view["location_name"] = locations.get(view["location_id"])
+    return view
+
+
+def view_operation(event: dict, categories: dict, locations: dict):
+    """
+    The write that applies one event to the view, or None if it does not
+    touch it. categories and locations map ids to names.
+
+    Every write is guarded by the position of the last event applied to the
+    document (last_seq), so replaying events after a crash between applying
+    them and saving the checkpoint changes nothing; and by the ids of the
+    events a snapshot row already reflects (_reflected).
+
+    A rename sets the new name on every row that refers to the category or
+    location. Renames are applied in stream order, so a replay ends on the
+    latest name.
+    """
+    payload = event.get("payload") or {}
+    if event.get("type") in RENAMES:
+        field, name_field = RENAMES[event["type"]]
+        return UpdateMany(
+            {field: payload.get(field)}, {"$set": {name_field: payload.get("name")}}
+        )
+    try:
+        item_id = ObjectId(payload["item_id"])
+    except (KeyError, InvalidId, TypeError):
+        return None
+    seq = event["seq"]
+    unseen = {"_id": item_id, "last_seq": {"$lt": seq}}
+    if "_id" in event:
+        unseen["_reflected"] = {"$ne": event["_id"]}
+    stamp = {"last_seq": seq, "updated_at": event.get("timestamp")}
+
+    kind = event.get("type")
+    if kind == "ItemCreated":
+        fields = {"quantity": 0, "category_id": None, "location_id": None, **payload}
+        return UpdateOne(
+            unseen,
+            {"$set": {**_view_fields(fields, categories, locations), **stamp}},
+            upsert=True,
+        )
+    if kind == "ItemUpdated":
+        fields = payload.get("updated_fields") or {}
+        return UpdateOne(
+            unseen, {"$set": {**_view_fields(fields, categories, locations), **stamp}}
+        )
+    if kind == "QuantityUpdated":
+        return UpdateOne(
+            unseen, {"$inc": {"quantity": int(payload.get("delta", 0))}, "$set": stamp}
+        )
+    if kind == "ItemDeleted":
+        return DeleteOne(unseen)
+    return None
+
+
+def snapshot_row(doc: dict, position: int, categories: dict, locations: dict) -> dict:
+    """
+    The view row for an item read by a snapshot taken at position: it
+    reflects every event up to position, any relayed since (_relayed_seq),
+    and the ones still waiting in its outbox.
+    """
+    row = {
+        **_view_fields(
+            {"category_id": None, "location_id": None, **doc}, categories, locations
+        ),
+        "updated_at": doc.get("updated_at"),
+        "last_seq": max(position, doc.get("_relayed_seq", 0)),
+    }
+    reflected = [entry["_id"] for entry in doc.get("_outbox") or ()]
+    if reflected:
+        row["_reflected"] = reflected
+    return row
+
+
+# -------------------- Event -> Summary Deltas --------------------
+def _summary_state(event: dict, state: Optional[dict]) -> Optional[dict]:
+    """What summary_delta() needs of an item (None: gone) after event."""
+    payload = event.get("payload") or {}
+    kind = event.get("type")
+    if kind == "ItemCreated":
+        return {
+            "user_id": payload.get("user_id"),
+            "quantity": payload.get("quantity") or 0,
+            "category_id": payload.get("category_id"),
+        }
+    if state is None or kind == "ItemDeleted":
+        return None
+    if kind == "ItemUpdated":
+        fields = payload.get("updated_fields") or {}
+        return {
+            **state,
+            **{
+                name: fields[name]
+                for name in ("quantity", "category_id")
+                if name in fields
+            },
+        }
+    if kind == "QuantityUpdated":
+        return {
+            **state,
+            "quantity": (state.get("quantity") or 0) + int(payload.get("delta", 0)),
+        }
+    return state
+
+
+def summary_deltas(events: List[dict], rows: dict, counted: dict) -> dict:
+    """
+    Per-user summary $inc for events, replayed over the view rows as read
+    before applying them (item_id -> row). Events a row already reflects
+    (by its last_seq or _reflected) are skipped, and so are events up to
+    the position a user's summary has counted (user -> last_seq), so a
+    batch replayed after a crash is not counted twice.
+    """
+    states = dict(rows)
+    deltas = {}
+    for event in events:
+        item_id = (event.get("payload") or {}).get("item_id")
+        if item_id is None:
+            continue
+        row = rows.get(item_id) or {}
+        if event["seq"] <= row.get("last_seq", 0) or event.get("_id") in row.get(
+            "_reflected", ()
+        ):
+            continue
+        before = states.get(item_id)
+        after = _summary_state(event, before)
+        states[item_id] = after
+        owner = (after or before or {}).get("user_id")
+        if owner is None or event["seq"] <= counted.get(owner, 0):
+            continue
+        deltas[owner] = merge_deltas(
+            deltas.get(owner, {}), summary_delta(before, after)
+        )
+    return {owner: delta for owner, delta in deltas.items() if delta}
+
+
+def _referenced_ids(events: List[dict], field: str) -> set:
+    ids = set()
+    for event in events:
+        payload = event.get("payload") or {}
+        fields = payload.get("updated_fields") or payload
+        if fields.get(field):
+            ids.add(fields[field])
+    return ids
+
+
+def _names(models: Dict) -> dict:
+    return {model_id: model.name for model_id, model in models.items()}
+
+
+# -------------------- Projector --------------------
+class InventoryProjector:
+    """
+    Keeps the inventory_view collection in step with the event stream.
+
+    Events are read in position (seq) order from the last checkpoint, in
+    batches; each batch is applied with one ordered bulk write and then
+    the checkpoint moves past it, so a restarted projector resumes where
+    the last one stopped. Positions are reserved before events are inserted,
+    so a missing position usually means an insert still in flight: the
+    projector waits up to gap_timeout seconds for it before skipping it.
+
+    Only the holder of the checkpoint lease projects, so running one
+    projector per API worker is safe. The first run with no checkpoint
+    builds the view from a snapshot of the items (see snapshot()), while
+    writes go on, and follows the stream from there.
+
+    Each batch also moves the owners' inventory summaries, counted from the
+    same events, so commands do not have to: a summary is written before
+    the view and carries the last position it counted (last_seq).
+
+    Every applied batch also leaves a numbered record of the users and
+    categories whose rows it changed in projection_changes, which each
+    worker's ChangeFollower reads to invalidate its query cache. Records
+    carry the epoch of the lease tenure that wrote them, so followers can
+    tell when a new holder numbers them from a different point.
+    """
+
+    def __init__(
+        self,
+        events=None,
+        view=None,
+        checkpoints=None,
+        changes=None,
+        items=None,
+        summaries=None,
+        batch_size: int = 500,
+        gap_timeout: float = 5.0,
+        lease_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.events = events if events is not None else get_collection("events")
+        self.view = view if view is not None else get_collection(PROJECTION)
+        self.checkpoints = (
+            checkpoints
+            if checkpoints is not None
+            else get_collection("projection_checkpoints")
+        )
+        self.changes = (
+            changes if changes is not None else get_collection(CHANGES_COLLECTION)
+        )
+        self.items = items if items is not None else ITEMS_COLLECTION
+        self.summaries = summaries if summaries is not None else SUMMARY_COLLECTION
+        self.batch_size = batch_size
+        self.gap_timeout = gap_timeout
+        self.clock = clock
+        self.lease = Lease(self.checkpoints, PROJECTION, lease_seconds)
+        self.position: Optional[int] = None
+        self.change_seq = 0
+        self.epoch: Optional[str] = None
+        self._gap = None  # (missing position, clock() when first seen)
+        self.applied = 0
+        self.skipped = 0
+        self.rebuilds = 0
+
+    # ---- Checkpoint ----
+    def _acquire_lease(self) -> bool:
+        was_held = self.lease.held
+        doc = self.lease.acquire()
+        if doc is None:
+            return False
+        if not was_held:
+            # Whoever held it before may have moved the checkpoint, and may
+            # have logged changes past it that this tenure will number again
+            self.position = doc.get("position")
+            self.change_seq = doc.get("changes", 0)
+            self.epoch = str(ObjectId())
+        return True
+
+    def _save_checkpoint(self, position: int) -> bool:
+        if not self.lease.update({"position": position, "changes": self.change_seq}):
+            return False
+        self.position = position
+        return True
+
+    def _record_changes(self, users: set, categories: set, reset: bool = False):
+        """
+        Log one change record, before the checkpoint that covers it is saved.
+        A batch replayed after a crash merges into the same record, under
+        the new tenure's epoch, so followers that already read it reset.
+        """
+        self.change_seq += 1
+        update = {
+            "$addToSet": {
+                "users": {"$each": sorted(users)},
+                "categories": {"$each": sorted(categories)},
+            },
+            "$set": {"at": datetime.now(timezone.utc), "epoch": self.epoch},
+        }
+        if reset:
+            update["$set"]["reset"] = True
+        self.changes.update_one({"_id": self.change_seq}, update, upsert=True)
+
+    def _last_position(self) -> int:
+        doc = self.events.find_one(
+            {"seq": {"$exists": True}}, {"seq": 1}, sort=[("seq", -1)]
+        )
+        return doc["seq"] if doc else 0
+
+    def _start(self) -> bool:
+        """Build a view with no checkpoint from a snapshot of the items."""
+        logger.info(f"{PROJECTION} has no checkpoint; building it from the items")
+        return self.snapshot() is not None
+
+    # ---- Snapshot ----
+    def snapshot(self) -> Optional[int]:
+        """
+        Replace the view (and the summaries counted from it) with one built
+        from the items collection, and move the checkpoint to the position
+        of the stream read before the scan. Writes need not be paused.
+
+        A row read by the scan may already reflect events past that
+        position: ones relayed before the read, which the relay records in
+        the item as _relayed_seq and the row takes as its last_seq, and ones
+        still in the item's outbox, whose ids the row keeps in _reflected.
+        Both are skipped when the stream reaches them, so no change is
+        applied twice. The lease is renewed between batches; a projector
+        that loses it stops without saving a checkpoint.
+
+        Returns:
+            int: number of items projected, or None if the lease was lost
+        """
+        position = self._last_position()
+        self.view.delete_many({})
+        count = 0
+        batch = []
+        cursor = self.items.find({}, SNAPSHOT_FIELDS, batch_size=REBUILD_BATCH_SIZE)
+        with cursor.sort("_id", 1):
+            for doc in cursor:
+                batch.append(doc)
+                if len(batch) < REBUILD_BATCH_SIZE:
+                    continue
+                if not self._acquire_lease():
+                    return None
+                count += self._insert_snapshot(batch, position)
+                batch = []
+        count += self._insert_snapshot(batch, position)
+        rebuild_inventory_summaries(position=position)
+        self._record_changes(set(), set(), reset=True)
+        if not self._save_checkpoint(position):
+            return None
+        logger.info(f"Built {PROJECTION} from {count} items at position {position}")
+        return count
+
+    def rebuild(self) -> Optional[int]:
+        """Rebuild the view from the items, e.g. after changing VIEW_FIELDS."""
+        count = self.snapshot()
+        if count is not None:
+            self.rebuilds += 1
+        return count
+
+    def _insert_snapshot(self, docs: List[dict], position: int) -> int:
+        if not docs:
+            return 0
+        categories = _names(
+            get_categories_by_ids({doc.get("category_id") for doc in docs} - {None})
+        )
+        locations = _names(
+            get_locations_by_ids({doc.get("location_id") for doc in docs} - {None})
+        )
+        self.view.bulk_write(
+            [
+                ReplaceOne(
+                    {"_id": doc["_id"]},
+                    snapshot_row(doc, position, categories, locations),
+                    upsert=True,
+                )
+                for doc in docs
+            ],
+            ordered=False,
+        )
+        return len(docs)
+
+    # ---- Catch-up ----
+    def _gap_expired(self, missing: int) -> bool:
+        if self._gap is None or self._gap[0] != missing:
+            self._gap = (missing, self.clock())
+            return False
+        return self.clock() - self._gap[1] >= self.gap_timeout
+
+    def _contiguous(self, events: List[dict]) -> List[dict]:
+        """
+        The leading run of events that follows the checkpoint without a
+        hole. A hole older than gap_timeout is skipped: its insert failed.
+        """
+        ready = []
+        expected = self.position + 1
+        for event in events:
+            if event["seq"] != expected:
+                if not self._gap_expired(expected):
+                    break
+                logger.warning(
+                    f"Skipping event positions {expected}..{event['seq'] - 1}: "
+                    f"not recorded after {self.gap_timeout}s"
+                )
+                self.skipped += event["seq"] - expected
+            ready.append(event)
+            expected = event["seq"] + 1
+        return ready
+
+    def _rows(self, events: List[dict]) -> Dict[str, dict]:
+        """The view rows events refer to, by item id, read before applying."""
+        item_ids = _object_ids(
+            (event.get("payload") or {}).get("item_id") for event in events
+        )
+        fields = {
+            "user_id": 1,
+            "category_id": 1,
+            "quantity": 1,
+            "last_seq": 1,
+            "_reflected": 1,
+        }
+        return {
+            str(doc["_id"]): doc
+            for doc in self.view.find({"_id": {"$in": item_ids}}, fields)
+        }
+
+    def _touched(self, events: List[dict], rows: Dict[str, dict]) -> Tuple[set, set]:
+        """
+        Users and categories whose rows events change: as the view has them
+        now (rows) and as the payloads set them, plus every user with a row
+        that a rename changes.
+        """
+        users, categories = set(), set()
+        for doc in rows.values():
+            users.add(doc.get("user_id"))
+            categories.add(doc.get("category_id"))
+        for event in events:
+            payload = event.get("payload") or {}
+            fields = payload.get("updated_fields") or payload
+            users.add(payload.get("user_id"))
+            categories.add(fields.get("category_id"))
+            if event.get("type") in RENAMES:
+                field = RENAMES[event["type"]][0]
+                users.update(self.view.distinct("user_id", {field: payload.get(field)}))
+        return users - {None}, categories - {None}
+
+    def _apply_summaries(
+        self, events: List[dict], rows: Dict[str, dict], users: set
+    ) -> None:
+        """Count events into their owners' summaries, before the view moves."""
+        counted = {
+            doc["_id"]: doc.get("last_seq", 0)
+            for doc in self.summaries.find(
+                {"_id": {"$in": sorted(users)}}, {"last_seq": 1}
+            )
+        }
+        deltas = summary_deltas(events, rows, counted)
+        if not deltas:
+            return
+        now = datetime.now(timezone.utc)
+        self.summaries.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": owner},
+                    {
+                        "$inc": delta,
+                        "$set": {"last_seq": events[-1]["seq"], "updated_at": now},
+                    },
+                    upsert=True,
+                )
+                for owner, delta in deltas.items()
+            ],
+            ordered=False,
+        )
+
+    def _apply(self, events: List[dict]) -> None:
+        # This process may have cached a renamed category or location before
+        # the rename; rows the batch creates must get the new name
+        for event in events:
+            payload = event.get("payload") or {}
+            if event.get("type") == "CategoryRenamed":
+                CATEGORY_CACHE.invalidate(payload.get("category_id"))
+            elif event.get("type") == "LocationRenamed":
+                LOCATION_CACHE.invalidate(payload.get("location_id"))
+        categories = _names(
+            get_categories_by_ids(_referenced_ids(events, "category_id"))
+        )
+        locations = _names(get_locations_by_ids(_referenced_ids(events, "location_id")))
+        operations = [
+            operation
+            for operation in (
+                view_operation(event, categories, locations) for event in events
+            )
+            if operation is not None
+        ]
+        # Ordered: a later event for an item must land after an earlier one.
+        # An upsert whose guard fails on an already-applied document raises
+        # a duplicate key error; skip it and carry on with the rest.
+        while operations:
+            try:
+                self.view.bulk_write(operations, ordered=True)
+                return
+            except BulkWriteError as e:
+                error = e.details["writeErrors"][0]
+                if error.get("code") != 11000:
+                    raise
+                operations = operations[error["index"] + 1 :]
+
+    def run_once(self) -> int:
+        """
+        Apply the next batch of events, if this projector holds the lease.
+
+        Returns:
+            int: number of events applied
+        """
+        if not self._acquire_lease():
+            return 0
+        if self.position is None and not self._start():
+            return 0
+        events = list(
+            self.events.find({"seq": {"$gt": self.position}})
+            .sort("seq", 1)
+            .limit(self.batch_size)
+        )
+        ready = self._contiguous(events)
+        if not ready:
+            return 0
+        rows = self._rows(ready)
+        users, categories = self._touched(ready, rows)
+        self._apply_summaries(ready, rows, users)
+        self._apply(ready)
+        self._record_changes(users, categories)
+        if self._save_checkpoint(ready[-1]["seq"]):
+            self.applied += len(ready)
+        return len(ready)
+
+    def run_forever(self, stop: threading.Event, interval: float) -> None:
+        """Poll until stop is set; a full batch is followed up immediately."""
+        logger.info(f"Projector {self.lease.owner} started")
+        while not stop.is_set():
+            try:
+                applied = self.run_once()
+            except PyMongoError as e:
+                logger.error(f"Projector batch failed: {e}", exc_info=True)
+                applied = 0
+            if applied < self.batch_size:
+                stop.wait(interval)
+        logger.info(f"Projector {self.lease.owner} stopped")
+
+    def stats(self) -> dict:
+        return {
+            "leader": self.lease.held,
+            "position": self.position,
+            "applied": self.applied,
+            "skipped_positions": self.skipped,
+            "rebuilds": self.rebuilds,
+            "waiting_for": self._gap[0] if self._gap else None,
+        }
+
+
+class ChangeFollower:
+    """
+    Reads the projector's change log and hands each new record to on_change
+    (users, categories), so this process can drop what it derived from the
+    view. There is one per process and it needs no lease.
+
+    on_reset is called instead when records cannot be trusted to be
+    complete: on the first poll, after a rebuild, when records were missed
+    (they expire, or the follower fell behind the log's TTL), and when a
+    record's epoch shows another projector tenure numbered it, possibly
+    reusing numbers this follower has already read.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[List[str], List[str]], None],
+        on_reset: Callable[[], None],
+        changes=None,
+    ):
+        self.changes = (
+            changes if changes is not None else get_collection(CHANGES_COLLECTION)
+        )
+        self.on_change = on_change
+        self.on_reset = on_reset
+        self.last: Optional[int] = None
+        self.epoch: Optional[str] = None
+        self.followed = 0
+        self.resets = 0
+
+    def _reset(self, record: Optional[dict]) -> None:
+        self.on_reset()
+        self.last = record["_id"] if record else 0
+        self.epoch = record.get("epoch") if record else None
+        self.resets += 1
+
+    def _newest(self) -> Optional[dict]:
+        newest = list(
+            self.changes.find({}, {"_id": 1, "epoch": 1}).sort("_id", -1).limit(1)
+        )
+        return newest[0] if newest else None
+
+    def run_once(self) -> int:
+        """Apply new change records; returns how many were read."""
+        if self.last is None:
+            self._reset(self._newest())
+            return 0
+        records = list(self.changes.find({"_id": {"$gt": self.last}}).sort("_id", 1))
+        if not records:
+            # A new tenure numbering from below last writes nothing past it
+            newest = self._newest()
+            if newest and newest.get("epoch") != self.epoch:
+                self._reset(newest)
+            return 0
+        for record in records:
+            if (
+                record["_id"] != self.last + 1
+                or record.get("reset")
+                or record.get("epoch") != self.epoch
+            ):
+                self._reset(record)
+                continue
+            self.on_change(record.get("users", []), record.get("categories", []))
+            self.last = record["_id"]
+            self.followed += 1
+        return len(records)
+
+    def run_forever(self, stop: threading.Event, interval: float) -> None:
+        while not stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Change follower poll failed: {e}", exc_info=True)
+                # Whatever changed meanwhile is unknown
+                self.last = None
+            stop.wait(interval)
+
+    def stats(self) -> dict:
+        return {"last": self.last, "followed": self.followed, "resets": self.resets}
+
+
+# -------------------- Background Runner --------------------
+_projector: Optional[InventoryProjector] = None
+_follower: Optional[ChangeFollower] = None
+_stop = threading.Event()
+_follower_stop = threading.Event()
+
+
+def start_projector_in_background(
+    interval: float, batch_size: int = 500, gap_timeout: float = 5.0
+) -> threading.Thread:
+    """Run an InventoryProjector on a daemon thread until stop_projector()."""
+    global _projector
+    _projector = InventoryProjector(batch_size=batch_size, gap_timeout=gap_timeout)
+    _stop.clear()
+    thread = threading.Thread(
+        target=_projector.run_forever,
+        args=(_stop, interval),
+        name="inventory-projector",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def stop_projector() -> None:
+    _stop.set()
+
+
+def projector_stats() -> dict:
+    return _projector.stats() if _projector else {"running": False}
+
+
+def start_follower_in_background(
+    interval: float,
+    on_change: Callable[[List[str], List[str]], None],
+    on_reset: Callable[[], None],
+) -> threading.Thread:
+    """Run a ChangeFollower on a daemon thread until stop_follower()."""
+    global _follower
+    _follower = ChangeFollower(on_change, on_reset)
+    _follower_stop.clear()
+    thread = threading.Thread(
+        target=_follower.run_forever,
+        args=(_follower_stop, interval),
+        name="projection-follower",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def stop_follower() -> None:
+    _follower_stop.set()
+
+
+def follower_stats() -> dict:
+    return _follower.stats() if _follower else {"running": False}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inventory read model projector")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Rebuild the view from the items collection",
+    )
+    args = parser.parse_args()
+
+    projector = InventoryProjector()
+    if not projector._acquire_lease():
+        parser.exit(1, "Another projector holds the lease; stop it first\n")
+    if args.rebuild and projector.rebuild() is None:
+        parser.exit(1, "Lost the lease while rebuilding\n")
+    while projector.run_once():
+        pass
+    print(projector.stats())
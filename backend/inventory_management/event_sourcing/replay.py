@@ -1,6 +1,5 @@
 # components/inventory_management/event_sourcing/replay.py
-import os
-from pymongo import MongoClient
+from shared_utils.db.mongo_client import get_collection
 from shared_utils.logging.logger import get_logger
 from ..db.mongo_queries import (
     delete_item,
@@ -8,30 +7,10 @@ from ..db.mongo_queries import (
     update_item,
     update_quantity,
 )
-from dotenv import load_dotenv
-from pathlib import Path
-
-# Load dev.env from repo root
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[3] / "dev.env")
 
 logger = get_logger("replay")
 
-# -------------------- MongoDB Connection from dev.env --------------------
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = int(os.getenv("DB_PORT", 27017))
-DB_NAME = os.getenv("DB_NAME", "inventory_db")
-DB_USER = os.getenv("DB_USER", "")
-DB_PASS = os.getenv("DB_PASS", "")
-
-if DB_USER and DB_PASS:
-    MONGO_URI = f"mongodb://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}"
-else:
-    MONGO_URI = f"mongodb://{DB_HOST}:{DB_PORT}"
-
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
-
-events_collection = db["events"]  # default collection name
+events_collection = get_collection("events")  # default collection name
 
 
 # -------------------- Event Replay Functions --------------------
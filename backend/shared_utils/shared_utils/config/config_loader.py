@@ -62,16 +62,32 @@ class ConfigLoader:
         """Get the dictionary of config for a specific service from services.yml"""
         return self.services_config.get("services", {}).get(service_name, {})
 
-    def get_mongo_client(self):
-        """Build and return a MongoClient using mongo_config.yml + env overrides."""
-        if not self.mongo_config:
-            raise ValueError("[ConfigLoader] MongoDB config not loaded")
+    def get_mongo_settings(self) -> dict:
+        """
+        Resolve MongoDB connection settings from mongo_config.yml + env overrides.
+
+        Environment variables (MONGO_URI, DB_HOST/DB_PORT, DB_USER/DB_PASS,
+        DB_NAME, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE) take precedence over
+        the YAML file, so the same settings apply whichever module connects.
+        """
+        mongo_cfg = (
+            self.mongo_config.get("mongo") or self.mongo_config.get("mongodb") or {}
+        )
 
-        mongo_cfg = self.mongo_config.get("mongo", {})
+        host = os.getenv("MONGO_URI")
+        if not host and os.getenv("DB_HOST"):
+            host = f"mongodb://{os.getenv('DB_HOST')}:{os.getenv('DB_PORT', 27017)}"
+        if not host:
+            host = mongo_cfg.get("uri") or mongo_cfg.get(
+                "host", "mongodb://localhost:27017"
+            )
 
-        username = os.getenv("MONGO_USER", mongo_cfg.get("username"))
-        password = os.getenv("MONGO_PASS", mongo_cfg.get("password"))
-        host = mongo_cfg.get("host", "mongodb://localhost:27017")
+        username = (
+            os.getenv("MONGO_USER") or os.getenv("DB_USER") or mongo_cfg.get("username")
+        )
+        password = (
+            os.getenv("MONGO_PASS") or os.getenv("DB_PASS") or mongo_cfg.get("password")
+        )
 
         # Build full URI with optional auth
         if username and password and "@" not in host:
@@ -79,20 +95,51 @@ class ConfigLoader:
         else:
             uri = host
 
-        client = MongoClient(
-            uri,
-            authSource=mongo_cfg.get("authSource", "admin"),
-            maxPoolSize=mongo_cfg.get("maxPoolSize", 50),
-            minPoolSize=mongo_cfg.get("minPoolSize", 5),
-            serverSelectionTimeoutMS=mongo_cfg.get("serverSelectionTimeoutMS", 5000),
-            tls=mongo_cfg.get("ssl", False),
-            replicaSet=mongo_cfg.get("replicaSet") or None,
+        return {
+            "uri": uri,
+            "database": os.getenv("DB_NAME")
+            or mongo_cfg.get("database")
+            or mongo_cfg.get("db_name", "inventory_db"),
+            "authSource": mongo_cfg.get("authSource", "admin"),
+            "maxPoolSize": int(
+                os.getenv("MONGO_MAX_POOL_SIZE", mongo_cfg.get("maxPoolSize", 50))
+            ),
+            "minPoolSize": int(
+                os.getenv("MONGO_MIN_POOL_SIZE", mongo_cfg.get("minPoolSize", 5))
+            ),
+            "serverSelectionTimeoutMS": mongo_cfg.get("serverSelectionTimeoutMS", 5000),
+            "tls": mongo_cfg.get("ssl", False),
+            "replicaSet": mongo_cfg.get("replicaSet") or None,
+        }
+
+    def build_mongo_client(self, client_class=MongoClient, **kwargs):
+        """
+        Build a *new* client from get_mongo_settings().
+
+        Application code should use get_mongo_client()/get_mongo_db(), which
+        go through the shared process-wide registry; this is the factory that
+        registry calls. client_class lets the registry build Motor clients
+        with the same settings.
+        """
+        settings = self.get_mongo_settings()
+        return client_class(
+            settings["uri"],
+            authSource=settings["authSource"],
+            maxPoolSize=settings["maxPoolSize"],
+            minPoolSize=settings["minPoolSize"],
+            serverSelectionTimeoutMS=settings["serverSelectionTimeoutMS"],
+            tls=settings["tls"],
+            replicaSet=settings["replicaSet"],
+            **kwargs,
         )
 
-        return client
+    def get_mongo_client(self):
+        """Return the shared MongoClient for this config (one pool per process)."""
+        from ..db.mongo_client import get_client
+
+        return get_client(self)
 
     def get_mongo_db(self):
         """Helper to directly return the Mongo database instance."""
-        client = self.get_mongo_client()
-        db_name = self.mongo_config.get("mongo", {}).get("database", "inventory_db")
-        return client[db_name]
+        db_name = self.get_mongo_settings()["database"]
+        return self.get_mongo_client()[db_name]
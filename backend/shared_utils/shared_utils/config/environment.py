@@ -0,0 +1,20 @@
+# shared_utils/config/environment.py
+from functools import lru_cache
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[4]
+ENV_FILE = ROOT_DIR / "config/environment/dev.env"
+MONGO_CONFIG_FILE = ROOT_DIR / "config/database/mongo_config.yml"
+
+
+@lru_cache(maxsize=None)
+def load_environment() -> None:
+    """
+    Load dev.env into os.environ, once, on first use. Variables already set
+    in the environment win. Everything that reads settings (core.config, the
+    Mongo and message queue clients) calls this first, so what they resolve
+    does not depend on which of them is used first.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=ENV_FILE)
@@ -0,0 +1,292 @@
+# shared_utils/db/mongo_client.py
+import asyncio
+import os
+import threading
+from typing import Dict, Optional
+
+from pymongo import MongoClient, monitoring
+
+from ..config.config_loader import ConfigLoader
+from ..config.environment import MONGO_CONFIG_FILE, load_environment
+
+_lock = threading.Lock()
+_default_loader: Optional[ConfigLoader] = None
+# One client (and therefore one connection pool) per distinct settings set
+_clients: Dict[tuple, MongoClient] = {}
+_monitors: Dict[tuple, "PoolMonitor"] = {}
+# Motor clients for the async data access layer, keyed by settings and event
+# loop: a Motor client is bound to the loop it first ran on
+_async_clients: Dict[tuple, tuple] = {}
+_async_monitors: Dict[tuple, "PoolMonitor"] = {}
+# Bumped by close_clients() so LazyCollection handles re-resolve
+_generation = 0
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Counts connection pool events so utilization can be reported without
+    touching pymongo internals.
+    """
+
+    def __init__(self, max_pool_size: int, min_pool_size: int):
+        self.max_pool_size = max_pool_size
+        self.min_pool_size = min_pool_size
+        self._lock = threading.Lock()
+        self.created = 0
+        self.closed = 0
+        self.checked_out = 0
+        self.checked_in = 0
+        self.checkout_started = 0
+        self.checkout_failed = 0
+        self.pool_cleared = 0
+
+    def _inc(self, attr: str):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._inc("pool_cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._inc("created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._inc("closed")
+
+    def connection_check_out_started(self, event):
+        self._inc("checkout_started")
+
+    def connection_check_out_failed(self, event):
+        self._inc("checkout_failed")
+
+    def connection_checked_out(self, event):
+        self._inc("checked_out")
+
+    def connection_checked_in(self, event):
+        self._inc("checked_in")
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_use = self.checked_out - self.checked_in
+            return {
+                "max_pool_size": self.max_pool_size,
+                "min_pool_size": self.min_pool_size,
+                "open_connections": self.created - self.closed,
+                "in_use": in_use,
+                "waiting": self.checkout_started
+                - self.checked_out
+                - self.checkout_failed,
+                "utilization": (
+                    in_use / self.max_pool_size if self.max_pool_size else 0.0
+                ),
+                "total_checkouts": self.checked_out,
+                "checkout_failures": self.checkout_failed,
+                "pool_clears": self.pool_cleared,
+            }
+
+
+def get_config_loader() -> ConfigLoader:
+    """
+    Return the process-wide ConfigLoader, created on first use. dev.env is
+    loaded first, through the same load_environment() as core.config, so
+    both resolve the same DB_* settings whichever is used first; those win
+    over mongo_config.yml (or the file MONGO_CONFIG_FILE names), which
+    supplies the pool sizes and whatever else the environment leaves unset.
+    """
+    global _default_loader
+    if _default_loader is None:
+        with _lock:
+            if _default_loader is None:
+                load_environment()
+                _default_loader = ConfigLoader(
+                    mongo_file=os.getenv("MONGO_CONFIG_FILE", str(MONGO_CONFIG_FILE))
+                )
+    return _default_loader
+
+
+def _settings_key(settings: dict) -> tuple:
+    return tuple(sorted(settings.items()))
+
+
+def get_client(loader: Optional[ConfigLoader] = None) -> MongoClient:
+    """
+    Return the shared MongoClient for the given config (default: the
+    process-wide loader). The client is built lazily on first call and
+    reused by every module afterwards.
+    """
+    loader = loader or get_config_loader()
+    settings = loader.get_mongo_settings()
+    key = _settings_key(settings)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            monitor = PoolMonitor(settings["maxPoolSize"], settings["minPoolSize"])
+            client = loader.build_mongo_client(event_listeners=[monitor])
+            _clients[key] = client
+            _monitors[key] = monitor
+    return client
+
+
+def get_database(name: Optional[str] = None, loader: Optional[ConfigLoader] = None):
+    """Return a database handle on the shared client."""
+    loader = loader or get_config_loader()
+    db_name = name or loader.get_mongo_settings()["database"]
+    return get_client(loader)[db_name]
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _drop_closed_loops() -> None:
+    # Caller holds _lock. Clients of a closed loop can never run again.
+    for key, (loop, client) in list(_async_clients.items()):
+        if loop is not None and loop.is_closed():
+            client.close()
+            del _async_clients[key]
+            del _async_monitors[key]
+
+
+def get_async_client(loader: Optional[ConfigLoader] = None):
+    """
+    Return the shared Motor client for the given config on the running
+    event loop. Each loop gets its own client, so a new loop (a test client,
+    a worker restart) never reuses one bound to a closed loop. Motor is only
+    imported here so sync-only services do not need it installed.
+    """
+    loader = loader or get_config_loader()
+    settings = loader.get_mongo_settings()
+    loop = _running_loop()
+    key = (_settings_key(settings), id(loop))
+
+    cached = _async_clients.get(key)
+    if cached is not None and cached[0] is loop:
+        return cached[1]
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    with _lock:
+        _drop_closed_loops()
+        cached = _async_clients.get(key)
+        if cached is not None and cached[0] is loop:
+            return cached[1]
+        monitor = PoolMonitor(settings["maxPoolSize"], settings["minPoolSize"])
+        client = loader.build_mongo_client(
+            client_class=AsyncIOMotorClient, event_listeners=[monitor]
+        )
+        _async_clients[key] = (loop, client)
+        _async_monitors[key] = monitor
+    return client
+
+
+def get_async_database(
+    name: Optional[str] = None, loader: Optional[ConfigLoader] = None
+):
+    """Return a Motor database handle on the shared async client."""
+    loader = loader or get_config_loader()
+    db_name = name or loader.get_mongo_settings()["database"]
+    return get_async_client(loader)[db_name]
+
+
+def get_pool_stats(loader: Optional[ConfigLoader] = None) -> dict:
+    """
+    Pool utilization for the shared clients of the given config: the sync
+    pool's figures, with each Motor pool's under "async". Returns an empty
+    dict if no client has been created yet.
+    """
+    loader = loader or get_config_loader()
+    key = _settings_key(loader.get_mongo_settings())
+    monitor = _monitors.get(key)
+    stats = monitor.stats() if monitor else {}
+    async_pools = [m.stats() for k, m in list(_async_monitors.items()) if k[0] == key]
+    if async_pools:
+        stats["async"] = async_pools
+    return stats
+
+
+def close_clients() -> None:
+    """Close every registered client (shutdown hooks and tests)."""
+    global _generation
+    with _lock:
+        _generation += 1
+        async_clients = [client for _, client in _async_clients.values()]
+        for client in list(_clients.values()) + async_clients:
+            client.close()
+        _clients.clear()
+        _monitors.clear()
+        _async_clients.clear()
+        _async_monitors.clear()
+
+
+class LazyCollection:
+    """
+    Collection handle that resolves against the shared client on first use,
+    so modules can declare their collections at import time without
+    connecting to MongoDB.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        db_name: Optional[str] = None,
+        database_getter=None,
+        per_loop: bool = False,
+    ):
+        self.name = name
+        self.db_name = db_name
+        self._database_getter = database_getter or get_database
+        # Motor handles belong to one event loop; re-resolve when it changes
+        self._per_loop = per_loop
+        self._resolved = None
+        self._resolved_generation = -1
+        self._resolved_loop = None
+
+    def _collection(self):
+        loop = _running_loop() if self._per_loop else None
+        if (
+            self._resolved is None
+            or self._resolved_generation != _generation
+            or self._resolved_loop is not loop
+        ):
+            self._resolved = self._database_getter(self.db_name)[self.name]
+            self._resolved_generation = _generation
+            self._resolved_loop = loop
+        return self._resolved
+
+    def __getattr__(self, attr):
+        return getattr(self._collection(), attr)
+
+    def __repr__(self):
+        return f"LazyCollection({self.name!r})"
+
+
+def get_collection(name: str, db_name: Optional[str] = None) -> LazyCollection:
+    """Return a lazily-bound collection on the shared client."""
+    return LazyCollection(name, db_name)
+
+
+def get_async_collection(name: str, db_name: Optional[str] = None) -> LazyCollection:
+    """Return a lazily-bound Motor collection on the shared async client."""
+    return LazyCollection(
+        name, db_name, database_getter=get_async_database, per_loop=True
+    )
@@ -2,33 +2,42 @@
 import os
 import json
 import threading
-from typing import Callable
-from pathlib import Path
-
-import pika
-from dotenv import load_dotenv
-
-# Load environment (adjust path if necessary)
-load_dotenv(
-    dotenv_path=Path(__file__).resolve().parents[4] / "config/environment/dev.env"
-)  # expects dev.env in repo root or env already exported
-
-MQ_HOST = os.getenv("MQ_HOST", "localhost")
-MQ_PORT = int(os.getenv("EVENT_QUEUE_PORT", os.getenv("MQ_PORT", 5672)))
-MQ_USER = os.getenv("MQ_USER", "guest")
-MQ_PASS = os.getenv("MQ_PASS", "guest")
-EVENT_EXCHANGE = os.getenv(
-    "EVENT_QUEUE_NAME", "inventory_events"
-)  # used as exchange name
-
-_credentials = pika.PlainCredentials(MQ_USER, MQ_PASS)
-_parameters = pika.ConnectionParameters(
-    host=MQ_HOST,
-    port=MQ_PORT,
-    credentials=_credentials,
-    heartbeat=600,
-    blocked_connection_timeout=300,
-)
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable
+
+from ..config.environment import load_environment
+
+if TYPE_CHECKING:
+    import pika
+
+
+@lru_cache(maxsize=None)
+def _settings() -> dict:
+    # Read on first use rather than at import, so importing this module does
+    # no file I/O and the exchange name / broker address can come from a
+    # dev.env that is only present at runtime
+    load_environment()
+    return {
+        "host": os.getenv("MQ_HOST", "localhost"),
+        "port": int(os.getenv("EVENT_QUEUE_PORT", os.getenv("MQ_PORT", 5672))),
+        "user": os.getenv("MQ_USER", "guest"),
+        "password": os.getenv("MQ_PASS", "guest"),
+        "exchange": os.getenv("EVENT_QUEUE_NAME", "inventory_events"),
+    }
+
+
+@lru_cache(maxsize=None)
+def _parameters():
+    import pika
+
+    settings = _settings()
+    return pika.ConnectionParameters(
+        host=settings["host"],
+        port=settings["port"],
+        credentials=pika.PlainCredentials(settings["user"], settings["password"]),
+        heartbeat=600,
+        blocked_connection_timeout=300,
+    )
 
 
 def publish_event(event_type: str, payload: dict) -> None:
@@ -36,16 +45,19 @@ def publish_event(event_type: str, payload: dict) -> None:
     Publish an event to the shared exchange. Lightweight (opens/closes connection per publish).
     Used by auth service after signup/login events.
     """
+    import pika
+
+    exchange = _settings()["exchange"]  # used as exchange name
     message = json.dumps({"type": event_type, "payload": payload})
-    connection = pika.BlockingConnection(_parameters)
+    connection = pika.BlockingConnection(_parameters())
     try:
         channel = connection.channel()
         # Use a durable fanout exchange so consumers bind a queue and all receive events
         channel.exchange_declare(
-            exchange=EVENT_EXCHANGE, exchange_type="fanout", durable=True
+            exchange=exchange, exchange_type="fanout", durable=True
         )
         channel.basic_publish(
-            exchange=EVENT_EXCHANGE,
+            exchange=exchange,
             routing_key="",
             body=message,
             properties=pika.BasicProperties(delivery_mode=2),
@@ -54,11 +66,51 @@ def publish_event(event_type: str, payload: dict) -> None:
         connection.close()
 
 
-def create_consuming_connection() -> pika.BlockingConnection:
+def publish_events(events: list) -> None:
+    """
+    Publish a batch of stored events (dicts with _id, seq, type, payload and
+    timestamp) to the shared exchange over one connection. Delivery is at
+    least once: consumers should skip ids they have already seen.
+    """
+    import pika
+
+    if not events:
+        return
+    exchange = _settings()["exchange"]
+    connection = pika.BlockingConnection(_parameters())
+    try:
+        channel = connection.channel()
+        channel.exchange_declare(
+            exchange=exchange, exchange_type="fanout", durable=True
+        )
+        for event in events:
+            message = json.dumps(
+                {
+                    "id": str(event["_id"]),
+                    "seq": event["seq"],
+                    "type": event["type"],
+                    "payload": event["payload"],
+                    "timestamp": event["timestamp"],
+                },
+                default=str,  # ObjectIds and datetimes in payloads
+            )
+            channel.basic_publish(
+                exchange=exchange,
+                routing_key="",
+                body=message,
+                properties=pika.BasicProperties(delivery_mode=2),
+            )
+    finally:
+        connection.close()
+
+
+def create_consuming_connection() -> "pika.BlockingConnection":
     """
     Returns a new BlockingConnection for consumers (long-running).
     """
-    return pika.BlockingConnection(_parameters)
+    import pika
+
+    return pika.BlockingConnection(_parameters())
 
 
 # Helper to run consumer in separate thread if desired (utility)
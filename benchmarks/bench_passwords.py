@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Login throughput and event-loop responsiveness under a burst of logins:
+bcrypt verify on the default thread pool (the old run_in_threadpool path)
+vs the PasswordHasher process pool.
+
+"tick lag" is how late a 10 ms timer on the same event loop fires while
+the burst runs, i.e. what every other endpoint waits on.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_passwords [--logins 64] [--rounds 12] [--workers N]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+from backend.inventory_management.core.passwords import PasswordHasher, _context
+
+TICK = 0.01
+
+
+async def measure(label: str, verify, logins: int, cores: int) -> None:
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append((time.perf_counter() - start - TICK) * 1000)
+
+    tick_task = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(verify() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick_task
+
+    lags.sort()
+    p99 = lags[max(int(len(lags) * 0.99) - 1, 0)] if lags else 0.0
+    rate = logins / elapsed
+    print(
+        f"{label:<22} {rate:7.1f} logins/s  {rate / cores:7.1f} per core"
+        f"   tick lag p99 {p99:7.1f} ms"
+    )
+
+
+async def main_async(args) -> None:
+    password_hash = _context(args.rounds).hash("correct horse")
+    loop = asyncio.get_running_loop()
+
+    def verify_inline():
+        return _context(args.rounds).verify("correct horse", password_hash)
+
+    await measure(
+        "thread pool (inline)",
+        lambda: loop.run_in_executor(None, verify_inline),
+        args.logins,
+        args.workers,
+    )
+
+    hasher = PasswordHasher(
+        rounds=args.rounds, workers=args.workers, max_pending=args.workers * 2
+    )
+    await hasher.verify("warm", password_hash)  # spawn the workers first
+    try:
+        await measure(
+            f"process pool ({args.workers}w)",
+            lambda: hasher.verify("correct horse", password_hash),
+            args.logins,
+            args.workers,
+        )
+        stats = hasher.stats()
+        print(
+            f"{'':<22} avg queue {stats['avg_queue_ms']} ms,"
+            f" avg run {stats['avg_run_ms']} ms"
+        )
+    finally:
+        hasher.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bcrypt login throughput")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
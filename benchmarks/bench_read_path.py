@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Per-document cost of turning Mongo documents into InventoryItem models:
+full pydantic validation vs the trusted read path (slotted records).
+
+Usage (from the repo root): python -m benchmarks.bench_read_path [--docs 100000]
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from bson.objectid import ObjectId
+
+from backend.inventory_management.db.models import InventoryItem, from_mongo
+
+
+def make_docs(n: int) -> list:
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": "bench-user",
+            "name": f"Item {i}",
+            "category_id": f"cat{i % 20}",
+            "location_id": f"loc{i % 5}",
+            "quantity": i % 100,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(n)
+    ]
+
+
+def bench(label: str, fn, docs: list) -> float:
+    start = time.perf_counter()
+    for doc in docs:
+        fn(doc)
+    elapsed = time.perf_counter() - start
+    per_doc_us = elapsed / len(docs) * 1e6
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms total  {per_doc_us:7.2f} us/doc")
+    return per_doc_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-path model construction")
+    parser.add_argument("--docs", type=int, default=100_000)
+    args = parser.parse_args()
+
+    docs = make_docs(args.docs)
+    print(f"Listing {args.docs} documents")
+    before = bench(
+        "validated InventoryItem(**)",
+        lambda d: from_mongo(InventoryItem, d, True),
+        docs,
+    )
+    after = bench(
+        "trusted slotted record", lambda d: from_mongo(InventoryItem, d), docs
+    )
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
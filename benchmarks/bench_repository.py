@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Per-operation cost of get / update / delete by id as the store grows, for
+the old list-scan routers vs the repository backends.
+
+The in-memory backend needs nothing. The mongo backend writes to the
+configured database (see shared_utils.db.mongo_client) and drops its
+collections afterwards, so point it at a scratch database.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_repository [--sizes 1000 100000 1000000]
+    python -m benchmarks.bench_repository --backend mongo --sizes 1000 1000000
+"""
+
+import argparse
+import random
+import time
+
+from backend.inventory_management.db.repository import (
+    InMemoryRepository,
+    mongo_inventory_repository,
+)
+
+LOOKUPS = 1000
+
+
+def per_op_us(fn, ids: list) -> float:
+    start = time.perf_counter()
+    for item_id in ids:
+        fn(item_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def bench_list_scan(size: int, lookups: int) -> float:
+    """The pre-repository router: next(...) over a list of dicts."""
+    items = [{"id": i, "name": f"Item {i}", "quantity": i} for i in range(1, size + 1)]
+    ids = [random.randint(1, size) for _ in range(lookups)]
+    return per_op_us(
+        lambda item_id: next(item for item in items if item["id"] == item_id), ids
+    )
+
+
+def bench_repository(repo, ids: list) -> dict:
+    sample = random.sample(ids, min(LOOKUPS, len(ids)))
+    return {
+        "get": per_op_us(repo.get, sample),
+        "update": per_op_us(lambda i: repo.update(i, {"quantity": 1}), sample),
+        "delete": per_op_us(repo.delete, sample),
+    }
+
+
+def fill_memory(size: int):
+    repo = InMemoryRepository()
+    ids = [
+        str(repo.add({"name": f"Item {i}", "quantity": i})["id"]) for i in range(size)
+    ]
+    return repo, ids
+
+
+def fill_mongo(size: int, chunk: int = 10_000):
+    from backend.inventory_management.db import mongo_queries as mq
+
+    mq.ITEMS_COLLECTION.delete_many({"user_id": "bench-user"})
+    ids = []
+    for start in range(0, size, chunk):
+        docs = [
+            {"user_id": "bench-user", "name": f"Item {i}", "quantity": i}
+            for i in range(start, min(start + chunk, size))
+        ]
+        ids += [str(oid) for oid in mq.ITEMS_COLLECTION.insert_many(docs).inserted_ids]
+    return mongo_inventory_repository(), ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Repository lookup scaling")
+    parser.add_argument("--backend", choices=["memory", "mongo"], default="memory")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+    fill = fill_mongo if args.backend == "mongo" else fill_memory
+
+    print(
+        f"{'entries':>10}  {'list scan':>10}  {'get':>8}  {'update':>8}  {'delete':>8}"
+    )
+    for size in args.sizes:
+        # Scanning 1M entries costs milliseconds; fewer samples keep it quick
+        scan = bench_list_scan(size, max(10, LOOKUPS * 1000 // size))
+        repo, ids = fill(size)
+        ops = bench_repository(repo, ids)
+        print(
+            f"{size:>10}  {scan:>8.1f}us  {ops['get']:>6.2f}us  "
+            f"{ops['update']:>6.2f}us  {ops['delete']:>6.2f}us"
+        )
+    if args.backend == "mongo":
+        from backend.inventory_management.db import mongo_queries as mq
+
+        mq.ITEMS_COLLECTION.delete_many({"user_id": "bench-user"})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Name search latency over one tenant's items: a regex scan over the names
+(what list_items with a $regex filter does server-side) vs NameIndex
+prefix, substring and typo-tolerant queries.
+
+Usage (from the repo root): python -m benchmarks.bench_search [--items 1000000]
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+
+from backend.inventory_management.db.search import NameIndex
+
+WORDS = (
+    "apple banana cherry grape lemon mango orange peach pear plum "
+    "milk butter cheese yogurt cream bread bagel flour sugar salt "
+    "rice pasta beans lentils oats coffee tea juice water soda "
+    "chicken beef pork salmon tuna shrimp eggs tofu spinach kale "
+    "carrot potato onion garlic pepper tomato cucumber lettuce celery basil "
+    "organic frozen fresh dried canned sliced whole large small family"
+).split()
+
+QUERIES = {
+    "prefix": ["app", "straw", "chick", "org", "fro"],
+    "substring": ["cheese", "juice", "pepper", "basil", "lentils"],
+    "typo": ["bananna", "chikcen", "yougurt", "spinnach", "tomatoe"],
+    "multi-word": ["fresh milk", "organic app", "frozn chiken", "tea 42"],
+    "no match": ["xylophone", "qqq", "zz"],
+}
+
+
+def make_names(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        (str(i), " ".join(rng.sample(WORDS, rng.randint(2, 3))) + f" {i % 997}")
+        for i in range(count)
+    ]
+
+
+def latencies_ms(fn, queries: list, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            fn(query)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: list) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(
+        f"{label:<28} p50 {statistics.median(samples):8.2f} ms"
+        f"   p95 {p95:8.2f} ms   max {samples[-1]:8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inventory name search")
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    items = make_names(args.items)
+    start = time.perf_counter()
+    index = NameIndex.from_items(items)
+    print(f"Built index over {len(index)} items in {time.perf_counter() - start:.1f} s")
+
+    names = [name for _, name in items]
+    report(
+        "regex scan (substring)",
+        latencies_ms(
+            lambda q: [n for n in names if re.search(q, n, re.I)][: args.limit],
+            QUERIES["substring"],
+            1,
+        ),
+    )
+    for kind, queries in QUERIES.items():
+        report(
+            f"index ({kind})",
+            latencies_ms(
+                lambda q: index.search(q, limit=args.limit), queries, args.repeat
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
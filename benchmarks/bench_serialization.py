@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Cost of rendering an /api/items page: FastAPI's default path
+(jsonable_encoder + JSONResponse) vs FastJSONResponse, plus what gzip and
+brotli do to the payload size.
+
+Usage (from the repo root): python -m benchmarks.bench_serialization [--items 10000]
+"""
+
+import argparse
+import gzip
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from backend.inventory_management.api.compression import brotli
+from backend.inventory_management.api.responses import FastJSONResponse
+from backend.inventory_management.db.models import InventoryItem, from_mongo
+
+from .bench_read_path import make_docs
+
+
+def timed(label: str, fn, repeat: int) -> tuple:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+    print(f"{label:<40} {elapsed_ms:8.2f} ms")
+    return elapsed_ms, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/api/items payload rendering")
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    page = {
+        "items": [from_mongo(InventoryItem, doc) for doc in make_docs(args.items)],
+        "next_cursor": None,
+    }
+    print(f"Rendering a page of {args.items} items")
+    before, _ = timed(
+        "jsonable_encoder + JSONResponse",
+        lambda: JSONResponse(jsonable_encoder(page)).body,
+        args.repeat,
+    )
+    after, body = timed(
+        "FastJSONResponse (orjson)",
+        lambda: FastJSONResponse(page).body,
+        args.repeat,
+    )
+    print(f"speedup: {before / after:.1f}x\n")
+
+    print(f"{'identity':<40} {len(body) / 1024:8.1f} KiB")
+    _, gzipped = timed("gzip level 6", lambda: gzip.compress(body, 6), args.repeat)
+    print(f"{'  size':<40} {len(gzipped) / 1024:8.1f} KiB")
+    if brotli is None:
+        print("brotli not installed; skipping")
+        return
+    _, compressed = timed(
+        "brotli quality 4", lambda: brotli.compress(body, quality=4), args.repeat
+    )
+    print(f"{'  size':<40} {len(compressed) / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
-from fastapi import FastAPI
-from components.inventory_management.api.auth import router as auth_router
+from backend.app import create_app
+from backend.inventory_management.api.auth import router as auth_router
 
-app = FastAPI()
-
-app.include_router(auth_router, prefix="/api")
+app = create_app()
+# main.py has always served auth under /api; create_app() mounts it at /auth
+app.include_router(auth_router, prefix="/api", tags=["Auth"])
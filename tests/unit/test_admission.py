@@ -0,0 +1,130 @@
+# tests/unit/test_admission.py
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.inventory_management.api.admission import (
+    AdaptiveLimiter,
+    AdmissionControlMiddleware,
+    route_class,
+)
+
+
+def make_limiter(**overrides):
+    settings = dict(
+        min_limit=1, max_limit=2, max_queue=1, target_latency=0.1, queue_timeout=0.05
+    )
+    return AdaptiveLimiter("test", **{**settings, **overrides})
+
+
+def test_route_classes():
+    assert route_class("POST", "/auth/login") == "auth"
+    assert route_class("POST", "/api/login") == "auth"
+    assert route_class("GET", "/api/items") == "read"
+    assert route_class("GET", "/api/items/export") == "export"
+    assert route_class("DELETE", "/inventory/1") == "write"
+    assert route_class("GET", "/metrics/admission") is None
+    assert route_class("GET", "/") is None
+
+
+def test_queue_then_shed_beyond_depth():
+    async def run():
+        limiter = make_limiter(queue_timeout=1)
+        assert await limiter.acquire()
+        assert await limiter.acquire()
+
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.stats()["queue_depth"] == 1
+        assert not await limiter.acquire()  # queue full: shed at once
+
+        limiter.release(0.01)
+        assert await queued
+        return limiter.stats()
+
+    stats = asyncio.run(run())
+    assert stats["shed"] == 1
+    assert stats["admitted"] == 3
+    assert stats["in_flight"] == 2
+
+
+def test_queued_request_times_out():
+    async def run():
+        limiter = make_limiter(max_limit=1)
+        await limiter.acquire()
+        admitted = await limiter.acquire()
+        limiter.release(0.01)
+        return admitted, limiter.stats()
+
+    admitted, stats = asyncio.run(run())
+    assert not admitted
+    assert stats["timed_out"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_limit_backs_off_when_slow_and_recovers_when_fast():
+    limiter = make_limiter(min_limit=1, max_limit=10)
+    limiter.in_flight = 1
+    limiter.release(1.0)
+    assert limiter.limit == 9
+
+    for _ in range(50):
+        limiter.in_flight = 1
+        limiter.release(0.001)
+    assert limiter.limit == 10
+
+
+def test_middleware_rejects_with_retry_after():
+    app = FastAPI()
+
+    @app.get("/api/items")
+    def items():
+        return {"items": []}
+
+    full = make_limiter(max_limit=1, max_queue=0)
+    full.in_flight = 1
+    limiters = {"auth": make_limiter(), "read": full, "write": make_limiter()}
+    app.add_middleware(AdmissionControlMiddleware, limiters=limiters)
+    client = TestClient(app)
+
+    response = client.get("/api/items")
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+
+    full.in_flight = 0
+    assert client.get("/api/items").status_code == 200
+    assert full.stats()["in_flight"] == 0
+
+
+def test_streamed_export_holds_an_export_slot_not_a_read_slot():
+    app = FastAPI()
+    read = make_limiter()
+    export = make_limiter(target_latency=0.25)
+    during_stream = []
+
+    async def slow_body():
+        yield "first\n"
+        await asyncio.sleep(0.3)
+        during_stream.append((read.in_flight, export.in_flight))
+        yield "last\n"
+
+    @app.get("/api/items/export")
+    def export_items():
+        return StreamingResponse(slow_body())
+
+    limiters = {
+        "auth": make_limiter(),
+        "read": read,
+        "write": make_limiter(),
+        "export": export,
+    }
+    app.add_middleware(AdmissionControlMiddleware, limiters=limiters)
+
+    assert TestClient(app).get("/api/items/export").text == "first\nlast\n"
+    assert during_stream == [(0, 1)]
+    assert export.stats()["in_flight"] == 0
+    # Only the time to first byte counts as latency
+    assert export.ewma_latency < 0.25
@@ -3,10 +3,12 @@
 import pytest
 from fastapi.testclient import TestClient
 from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
 from fastapi import FastAPI
-from components.inventory_management.api.auth import router as auth_router
-from components.inventory_management.db import mongo_queries as mq
+from backend.inventory_management.api.auth import router as auth_router
+from backend.inventory_management.db import mongo_queries as mq
+from backend.inventory_management.db import async_mongo_queries as amq
 
 # --- Create FastAPI app for testing ---
 app = FastAPI()
@@ -20,6 +22,10 @@ def setup_test_db():
     test_client = MongoClient("mongodb://localhost:27017")
     test_db = test_client["test_inventory_db_auth"]
     mq.USERS_COLLECTION = test_db["users"]
+    # The auth router reads/writes through the async layer
+    amq.USERS_COLLECTION = AsyncIOMotorClient("mongodb://localhost:27017")[
+        "test_inventory_db_auth"
+    ]["users"]
     mq.USERS_COLLECTION.delete_many({})
     yield
     mq.USERS_COLLECTION.delete_many({})
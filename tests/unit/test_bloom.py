@@ -0,0 +1,54 @@
+# tests/unit/test_bloom.py
+
+import pytest
+
+from backend.inventory_management.db.bloom import BloomFilter, EmailFilter
+
+
+def test_no_false_negatives_and_rate_near_target():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    added = [f"user{i}@example.com" for i in range(10_000)]
+    for email in added:
+        bloom.add(email)
+
+    assert all(email in bloom for email in added)
+    false_positives = sum(f"new{i}@example.com" in bloom for i in range(10_000))
+    assert false_positives / 10_000 < 0.02
+    assert bloom.stats()["estimated_error_rate"] == pytest.approx(0.01, rel=0.2)
+
+
+def test_size_follows_capacity_and_error_rate():
+    loose = BloomFilter(capacity=1_000_000, error_rate=0.01).stats()
+    tight = BloomFilter(capacity=1_000_000, error_rate=0.001).stats()
+    assert loose["memory_bytes"] == pytest.approx(1_198_132, rel=0.01)
+    assert loose["num_hashes"] == 7
+    assert tight["memory_bytes"] > loose["memory_bytes"]
+
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0, error_rate=0.01)
+
+
+def test_email_filter_reads_until_seeded():
+    emails = EmailFilter()
+    assert emails.may_contain("a@example.com")
+    assert emails.stats()["skipped_reads"] == 0
+
+    emails.seed(["a@example.com"], capacity=100, error_rate=0.01)
+    assert emails.may_contain("a@example.com")
+    assert not emails.may_contain("b@example.com")
+    assert emails.stats()["skipped_reads"] == 1
+
+
+def test_signups_during_seed_are_kept():
+    emails = EmailFilter()
+
+    def registered():
+        yield "a@example.com"
+        emails.add("late@example.com")  # inserted after the scan passed it
+        yield "b@example.com"
+
+    emails.seed(registered(), capacity=100, error_rate=0.01)
+    assert emails.may_contain("late@example.com")
+    emails.add("c@example.com")
+    assert emails.may_contain("c@example.com")
+    assert emails.stats()["count"] == 4
@@ -0,0 +1,121 @@
+# tests/unit/test_bulk_write.py
+
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from backend.inventory_management.api import routes
+from backend.inventory_management.db import mongo_queries as mq
+
+
+def test_parse_bulk_ops_reports_bad_operations_in_place():
+    oid = ObjectId()
+    parsed, results = mq._parse_bulk_ops(
+        [
+            {"op": "create", "item": {"name": "Apple", "quantity": 2}},
+            {"op": "quantity", "item_id": str(oid), "delta": -1},
+            {"op": "explode", "item_id": str(oid)},
+            {"op": "delete", "item_id": "not-an-object-id"},
+            {"op": "update", "item_id": str(oid), "fields": {"user_id": "other"}},
+            {"op": "update", "item_id": str(oid), "fields": {"quantity": "lots"}},
+            {"op": "update", "item_id": str(oid), "fields": {"id": "x"}},
+            {"op": "update", "item_id": str(oid), "fields": {"colour": "red"}},
+            {"op": "update", "item_id": str(oid), "fields": {"quantity": "3"}},
+        ],
+        user_id="u1",
+    )
+
+    assert [p[0] for p in parsed] == [0, 1, 8]
+    assert parsed[0][3]["user_id"] == "u1"
+    assert parsed[1] == (1, "quantity", oid, -1)
+    # Update values are coerced to the model's types before they are written
+    assert parsed[2] == (8, "update", oid, {"quantity": 3})
+    assert [r["status"] for r in results] == ["ok", "ok"] + ["error"] * 6 + ["ok"]
+
+
+def test_bulk_requests_skip_missing_items_and_scope_to_user():
+    present, missing = ObjectId(), ObjectId()
+    parsed, results = mq._parse_bulk_ops(
+        [
+            {"op": "update", "item_id": str(present), "fields": {"name": "Pear"}},
+            {"op": "delete", "item_id": str(missing)},
+            {"op": "delete", "item_id": str(present)},
+            {"op": "create", "item": {"name": "Kiwi"}},
+        ],
+        user_id="u1",
+    )
+
+    requests, positions = mq._bulk_requests(parsed, {present}, results, "u1")
+
+    assert positions == [0, 2, 3]
+    assert [type(r) for r in requests] == [UpdateOne, DeleteOne, InsertOne]
+    assert requests[0]._filter == {"_id": present, "user_id": "u1"}
+    assert results[1]["status"] == "not_found"
+
+
+def test_finish_bulk_results_maps_write_errors_back_to_input_index():
+    parsed, results = mq._parse_bulk_ops(
+        [
+            {"op": "delete", "item_id": "zzz"},
+            {"op": "create", "item": {"name": "A", "user_id": "u1"}},
+            {"op": "create", "item": {"name": "B", "user_id": "u1"}},
+        ]
+    )
+    requests, positions = mq._bulk_requests(parsed, set(), results)
+    for _, _, _, payload in parsed:
+        payload["_id"] = ObjectId()  # what pymongo does on insert
+
+    mq._finish_bulk_results(
+        parsed, positions, results, [{"index": 1, "errmsg": "duplicate key"}]
+    )
+
+    assert results[0]["status"] == "error"
+    assert results[1]["status"] == "ok" and len(results[1]["item_id"]) == 24
+    assert results[2] == {
+        "index": 2,
+        "op": "create",
+        "status": "error",
+        "error": "duplicate key",
+    }
+
+
+def test_bulk_endpoint_rejects_malformed_operations(monkeypatch):
+    seen = []
+    monkeypatch.setattr(
+        routes.comands,
+        "bulk_change_items",
+        lambda operations, user_id: seen.append((operations, user_id)) or [],
+    )
+    app = FastAPI()
+    app.include_router(routes.router)
+    app.dependency_overrides[routes.get_current_user] = lambda: "u1"
+    client = TestClient(app)
+
+    for operation in [
+        {"op": "explode", "item_id": "x"},
+        {"op": "update", "item_id": "x"},
+        {"op": "quantity", "item_id": "x", "delta": "lots"},
+        {"op": "create", "item": {"quantity": 1}},
+        {"op": "delete"},
+    ]:
+        response = client.post("/api/items/bulk", json=[operation])
+        assert response.status_code == 422, operation
+    assert seen == []
+
+    response = client.post(
+        "/api/items/bulk",
+        json=[
+            {"op": "create", "item": {"name": "Apple"}},
+            {"op": "update", "id": "x", "fields": {"quantity": 3}},
+        ],
+    )
+    assert response.status_code == 200
+    assert seen == [
+        (
+            [
+                {"op": "create", "item": {"name": "Apple", "quantity": 0}},
+                {"op": "update", "item_id": "x", "fields": {"quantity": 3}},
+            ],
+            "u1",
+        )
+    ]
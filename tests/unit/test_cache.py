@@ -0,0 +1,118 @@
+# tests/unit/test_cache.py
+
+from bson import ObjectId
+
+from backend.inventory_management.db import cache as cache_module
+from backend.inventory_management.db import mongo_queries as mq
+from backend.inventory_management.db.cache import MISSING, LRUCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.finds = 0
+
+    def find_one(self, query):
+        self.finds += 1
+        return self.docs.get(query["_id"])
+
+    def find(self, query):
+        self.finds += 1
+        return [self.docs[oid] for oid in query["_id"]["$in"] if oid in self.docs]
+
+
+def test_lru_eviction_and_stats():
+    cache = LRUCache("t", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a is now most recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = LRUCache("t", maxsize=10, ttl=5)
+    cache.set("a", None)
+
+    clock.now += 4
+    assert cache.get("a") is None
+    clock.now += 2
+    assert cache.get("a") is MISSING
+    assert cache.stats()["size"] == 0
+
+
+def test_get_item_by_id_reads_through_and_invalidates(monkeypatch):
+    oid = ObjectId()
+    doc = {"_id": oid, "name": "Milk", "quantity": 1, "user_id": "u1"}
+    collection = CountingCollection({oid: doc})
+    monkeypatch.setattr(mq, "ITEMS_COLLECTION", collection)
+    monkeypatch.setattr(mq, "ITEM_CACHE", LRUCache("items", maxsize=10, ttl=60))
+
+    first = mq.get_item_by_id(str(oid))
+    first.name = "mutated by caller"
+    second = mq.get_item_by_id(str(oid))
+    assert collection.finds == 1
+    assert (second.id, second.name) == (str(oid), "Milk")
+
+    mq.invalidate_item(oid)
+    mq.get_item_by_id(str(oid))
+    assert collection.finds == 2
+
+    # Misses are not cached, so a later insert is visible immediately
+    missing = str(ObjectId())
+    assert mq.get_item_by_id(missing) is None
+    assert mq.get_item_by_id(missing) is None
+    assert collection.finds == 4
+
+
+def test_items_by_ids_carry_their_ids(monkeypatch):
+    cached, fetched = ObjectId(), ObjectId()
+    docs = {
+        oid: {"_id": oid, "name": name, "user_id": "u1"}
+        for oid, name in [(cached, "Milk"), (fetched, "Eggs")]
+    }
+    collection = CountingCollection(docs)
+    monkeypatch.setattr(mq, "ITEMS_COLLECTION", collection)
+    monkeypatch.setattr(mq, "ITEM_CACHE", LRUCache("items", maxsize=10, ttl=60))
+    mq.get_item_by_id(str(cached))
+
+    found = mq.get_items_by_ids([str(cached), str(fetched)])
+    assert collection.finds == 2
+    assert {item_id: item.id for item_id, item in found.items()} == {
+        str(cached): str(cached),
+        str(fetched): str(fetched),
+    }
+
+
+def test_batch_inserts_move_the_items_version(monkeypatch):
+    bumped = []
+
+    class Inserted:
+        inserted_ids = [ObjectId(), ObjectId()]
+
+    class Items:
+        def insert_many(self, docs):
+            return Inserted()
+
+    monkeypatch.setattr(mq, "ITEMS_COLLECTION", Items())
+    monkeypatch.setattr(mq, "bump_version", lambda *args: bumped.append(args))
+
+    mq.insert_inventory_for_user("u1")
+    mq.add_inventory_batch([{"name": "Milk"}, {"name": "Eggs"}], user_id="u2")
+    assert bumped == [(mq.ITEMS_VERSION, "u1"), (mq.ITEMS_VERSION, "u2")]
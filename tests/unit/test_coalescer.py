@@ -0,0 +1,72 @@
+# tests/unit/test_coalescer.py
+
+import asyncio
+
+import pytest
+
+from backend.inventory_management.db.coalescer import WriteCoalescer
+
+
+def run_concurrently(coalescer, values):
+    async def run():
+        return await asyncio.gather(
+            *(coalescer.submit(value) for value in values), return_exceptions=True
+        )
+
+    return asyncio.run(run())
+
+
+def test_concurrent_submits_share_batches():
+    batches = []
+
+    async def flush(values):
+        batches.append(values)
+        return [f"id-{value}" for value in values]
+
+    coalescer = WriteCoalescer(flush, max_batch=4, max_delay=0.01)
+    results = run_concurrently(coalescer, range(10))
+
+    assert results == [f"id-{i}" for i in range(10)]
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert coalescer.stats()["batches"] == 3
+
+
+def test_each_caller_gets_its_own_error():
+    async def flush(values):
+        return [ValueError(v) if v == "bad" else v.upper() for v in values]
+
+    results = run_concurrently(WriteCoalescer(flush), ["a", "bad", "c"])
+
+    assert results[0] == "A" and results[2] == "C"
+    assert isinstance(results[1], ValueError)
+
+
+def test_failed_flush_rejects_the_whole_batch():
+    async def flush(values):
+        raise ConnectionError("db down")
+
+    results = run_concurrently(WriteCoalescer(flush), ["a", "b"])
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_single_submit_waits_at_most_max_delay():
+    async def flush(values):
+        return values
+
+    async def run():
+        coalescer = WriteCoalescer(flush, max_delay=0.001)
+        return await asyncio.wait_for(coalescer.submit("only"), timeout=1)
+
+    assert asyncio.run(run()) == "only"
+
+
+@pytest.mark.parametrize("max_batch", [1, 3])
+def test_batches_never_exceed_max_batch(max_batch):
+    sizes = []
+
+    async def flush(values):
+        sizes.append(len(values))
+        return values
+
+    run_concurrently(WriteCoalescer(flush, max_batch=max_batch), range(7))
+    assert max(sizes) <= max_batch
@@ -0,0 +1,119 @@
+# tests/unit/test_compression.py
+
+import gzip
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.inventory_management.api import compression
+from backend.inventory_management.api.compression import (
+    CompressionMiddleware,
+    choose_encoding,
+)
+from backend.inventory_management.api.conditional import not_modified
+from backend.inventory_management.api.responses import FastJSONResponse
+from backend.inventory_management.db.models import InventoryItem, record_type
+
+
+def make_app():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/big")
+    def big():
+        return {"rows": ["x" * 50] * 100}
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (f'{{"row": {i}}}\n' for i in range(50)),
+            media_type="application/x-ndjson",
+        )
+
+    @app.get("/tagged")
+    def tagged(request: Request):
+        if not_modified(request, '"v1"'):
+            return Response(status_code=304, headers={"ETag": '"v1"'})
+        return FastJSONResponse({"rows": ["x" * 50] * 100}, headers={"ETag": '"v1"'})
+
+    return app
+
+
+def test_choose_encoding_respects_q_values(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert choose_encoding("br;q=0, *") == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("") is None
+
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding("br") is None
+
+
+def test_large_responses_are_gzipped_small_ones_are_not():
+    client = TestClient(make_app())
+    big = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert big.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in big.headers["vary"].lower()
+    assert big.json() == {"rows": ["x" * 50] * 100}
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_streaming_body_is_a_single_valid_gzip_stream():
+    client = TestClient(make_app())
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as resp:
+        assert resp.headers["content-encoding"] == "gzip"
+        raw = b"".join(resp.iter_raw())
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert [json.loads(line)["row"] for line in lines] == list(range(50))
+
+
+def test_compressed_response_gets_its_own_etag():
+    client = TestClient(make_app())
+
+    zipped = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["etag"] == '"v1-gzip"'
+    plain = client.get("/tagged", headers={"Accept-Encoding": "identity"})
+    assert plain.headers["etag"] == '"v1"'
+
+    again = client.get(
+        "/tagged",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'},
+    )
+    assert again.status_code == 304
+    assert again.headers["etag"] == '"v1-gzip"'
+    assert (
+        client.get(
+            "/tagged",
+            headers={"Accept-Encoding": "identity", "If-None-Match": '"v1"'},
+        ).status_code
+        == 304
+    )
+
+
+def test_fast_json_response_handles_bson_and_records():
+    oid = ObjectId()
+    record = record_type(InventoryItem)(
+        str(oid), "u1", "Milk", None, None, 2, datetime(2024, 1, 2, 3, 4, 5), None
+    )
+    body = FastJSONResponse(
+        {"_id": oid, "items": [record], "model": InventoryItem(user_id="u", name="n")}
+    ).body
+
+    data = json.loads(body)
+    assert data["_id"] == str(oid)
+    assert data["items"][0]["name"] == "Milk"
+    assert data["items"][0]["created_at"] == "2024-01-02T03:04:05"
+    assert data["model"]["name"] == "n"
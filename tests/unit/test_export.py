@@ -0,0 +1,54 @@
+# tests/unit/test_export.py
+
+import asyncio
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.inventory_management.api import routes
+
+
+async def fake_items(n):
+    for i in range(n):
+        yield {
+            "_id": ObjectId(),
+            "user_id": "u1",
+            "name": f"Item {i}",
+            "created_at": datetime(2024, 1, 1),
+        }
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def test_ndjson_stream_flushes_first_row_then_batches():
+    chunks = asyncio.run(collect(routes.ndjson_stream(fake_items(7), flush_every=3)))
+    assert [chunk.count(b"\n") for chunk in chunks] == [1, 3, 3]
+
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [row["name"] for row in rows] == [f"Item {i}" for i in range(7)]
+    assert rows[0]["created_at"] == "2024-01-01T00:00:00"
+    assert "_id" not in rows[0] and len(rows[0]["id"]) == 24
+
+
+def test_export_endpoint_streams_current_users_items(monkeypatch):
+    seen_filters = []
+
+    def fake_iter_items(filter):
+        seen_filters.append(filter)
+        return fake_items(2)
+
+    monkeypatch.setattr(routes.amq, "iter_items", fake_iter_items)
+    app = FastAPI()
+    app.include_router(routes.router)
+    app.dependency_overrides[routes.get_current_user] = lambda: "u1"
+
+    response = TestClient(app).get("/api/items/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert len(response.text.splitlines()) == 2
+    assert seen_filters == [{"user_id": "u1"}]
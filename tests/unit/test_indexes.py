@@ -0,0 +1,64 @@
+# tests/unit/test_indexes.py
+
+from backend.inventory_management.db import indexes
+
+
+class FakeCursor:
+    def __init__(self, plan):
+        self.plan = plan
+
+    def sort(self, *args):
+        return self
+
+    def explain(self):
+        return {"queryPlanner": {"winningPlan": self.plan}}
+
+
+class FakeCollection:
+    def __init__(self, plan):
+        self.plan = plan
+
+    def find(self, filter):
+        return FakeCursor(self.plan)
+
+
+class FakeDB(dict):
+    def __init__(self, plans):
+        super().__init__({name: FakeCollection(plan) for name, plan in plans.items()})
+
+
+IXSCAN_PLAN = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}
+COLLSCAN_PLAN = {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}
+
+
+def test_every_registered_shape_has_a_collection_spec():
+    for shape in indexes.QUERY_SHAPES:
+        assert shape["collection"] in indexes.INDEX_SPECS
+
+
+def test_users_email_index_is_unique():
+    (email_index,) = indexes.INDEX_SPECS["users"]
+    assert email_index.document["unique"] is True
+
+
+def test_verify_passes_when_all_shapes_use_indexes():
+    db = FakeDB({name: IXSCAN_PLAN for name in indexes.INDEX_SPECS})
+    assert indexes.verify_indexes(db) == []
+
+
+def test_verify_reports_collscan():
+    plans = {name: IXSCAN_PLAN for name in indexes.INDEX_SPECS}
+    plans["shopping_lists"] = COLLSCAN_PLAN
+    failures = indexes.verify_indexes(FakeDB(plans))
+    assert {f["collection"] for f in failures} == {"shopping_lists"}
+    assert "COLLSCAN" in failures[0]["stages"]
+
+
+def test_plan_stages_walks_sbe_and_or_plans():
+    plan = {
+        "queryPlan": {
+            "stage": "OR",
+            "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}],
+        }
+    }
+    assert indexes._plan_stages(plan) == ["OR", "IXSCAN", "COLLSCAN"]
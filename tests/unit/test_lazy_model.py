@@ -0,0 +1,90 @@
+# tests/unit/test_lazy_model.py
+
+import sys
+import threading
+
+from backend.computer_vision.model import predict
+from backend.computer_vision.model.predict import LazyModel
+
+
+class FakeYOLO:
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, source, **kwargs):
+        self.calls.append(source)
+        return []
+
+
+def test_import_does_not_load_the_model():
+    assert "ultralytics" not in sys.modules
+    assert "cv2" not in sys.modules
+    assert not predict.model.loaded
+    assert not predict.is_ready()
+
+
+def test_loads_once_on_first_use_even_when_concurrent():
+    loads = []
+
+    def loader(path):
+        loads.append(path)
+        return FakeYOLO()
+
+    handle = LazyModel("best.pt", loader=loader)
+    assert not handle.loaded
+
+    threads = [threading.Thread(target=handle.get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert handle.loaded and not handle.ready
+
+
+def test_ready_only_after_warmup_inference():
+    fake = FakeYOLO()
+    handle = LazyModel("best.pt", loader=lambda path: fake)
+
+    handle.get()
+    assert not handle.ready
+
+    handle.warmup(source="blank")
+    assert fake.calls == ["blank"]
+    assert handle.ready
+    assert handle.status()["warmup_seconds"] is not None
+
+
+def test_failed_background_warmup_is_recorded(monkeypatch):
+    def broken(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(predict, "model", LazyModel("missing.pt", loader=broken))
+    predict.warmup_in_background().join()
+
+    assert not predict.is_ready()
+    assert "FileNotFoundError" in predict.model.status()["warmup_error"]
+
+
+def test_ready_route_waits_for_warmup_when_enabled(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from backend.app import create_app
+    from backend.inventory_management.core import config
+
+    fake = FakeYOLO()
+    monkeypatch.setattr(predict, "model", LazyModel("best.pt", loader=lambda p: fake))
+    monkeypatch.setattr(config, "CV_MODEL_WARMUP", True, raising=False)
+    client = TestClient(create_app())
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["model"]["ready"] is False
+
+    predict.model.warmup(source="blank")
+    assert client.get("/ready").json()["ready"] is True
+
+    monkeypatch.setattr(config, "CV_MODEL_WARMUP", False)
+    monkeypatch.setattr(predict, "model", LazyModel("best.pt", loader=lambda p: fake))
+    assert client.get("/ready").status_code == 200
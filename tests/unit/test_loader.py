@@ -0,0 +1,111 @@
+# tests/unit/test_loader.py
+
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from backend.inventory_management.db import async_mongo_queries as amq
+from backend.inventory_management.db.cache import LRUCache
+from backend.inventory_management.db.loader import (
+    BatchLoader,
+    RequestLoaders,
+    enrich_items,
+)
+from backend.inventory_management.db.models import InventoryItem, record_type
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class CountingCollection:
+    def __init__(self, docs):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.queries = []
+
+    def find(self, query):
+        self.queries.append(query)
+        wanted = query["_id"]["$in"]
+        return FakeCursor([self.docs[oid] for oid in wanted if oid in self.docs])
+
+
+def test_loads_in_one_tick_share_a_batch():
+    calls = []
+
+    async def batch(keys):
+        calls.append(keys)
+        return {key: key.upper() for key in keys if key != "missing"}
+
+    async def run():
+        loader = BatchLoader(batch)
+        first = await asyncio.gather(
+            loader.load("a"), loader.load("b"), loader.load("a"), loader.load(None)
+        )
+        second = await loader.load_many(["a", "missing"])
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == ["A", "B", "A", None]
+    assert second == ["A", None]
+    assert calls == [["a", "b"], ["missing"]]
+
+
+def test_failed_batch_rejects_every_waiter():
+    async def batch(keys):
+        raise RuntimeError("db down")
+
+    async def run():
+        loader = BatchLoader(batch)
+        return await asyncio.gather(
+            loader.load("a"), loader.load("b"), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    dairy, produce = ObjectId(), ObjectId()
+    fridge = ObjectId()
+    categories = CountingCollection(
+        [{"_id": dairy, "name": "Dairy"}, {"_id": produce, "name": "Produce"}]
+    )
+    locations = CountingCollection([{"_id": fridge, "name": "Fridge"}])
+    monkeypatch.setattr(amq, "CATEGORIES_COLLECTION", categories)
+    monkeypatch.setattr(amq, "LOCATIONS_COLLECTION", locations)
+    monkeypatch.setattr(amq, "CATEGORY_CACHE", LRUCache("categories"))
+    monkeypatch.setattr(amq, "LOCATION_CACHE", LRUCache("locations"))
+    return categories, locations, str(dairy), str(produce), str(fridge)
+
+
+def test_enrich_page_costs_one_query_per_collection(collections):
+    categories, locations, dairy, produce, fridge = collections
+    Record = record_type(InventoryItem)
+    items = [
+        Record(str(ObjectId()), "u1", f"item{i}", cat, fridge, i, None, None)
+        for i, cat in enumerate([dairy, produce, dairy, None, "not-an-id"])
+    ]
+
+    enriched = asyncio.run(enrich_items(items, RequestLoaders()))
+
+    assert len(categories.queries) == 1
+    assert len(locations.queries) == 1
+    assert len(categories.queries[0]["_id"]["$in"]) == 2
+    assert [row["category_name"] for row in enriched] == [
+        "Dairy",
+        "Produce",
+        "Dairy",
+        None,
+        None,
+    ]
+    assert {row["location_name"] for row in enriched} == {"Fridge"}
@@ -0,0 +1,47 @@
+# tests/unit/test_models.py
+
+from dataclasses import asdict
+from datetime import datetime
+
+from bson import ObjectId
+from backend.inventory_management.db.models import (
+    InventoryItem,
+    User,
+    from_mongo,
+    projection_for,
+    record_type,
+)
+
+
+def test_projection_covers_model_fields_only():
+    projection = projection_for(User)
+    assert projection == {
+        "full_name": 1,
+        "email": 1,
+        "password_hash": 1,
+        "created_at": 1,
+    }
+
+
+def test_trusted_read_returns_slotted_record():
+    oid = ObjectId()
+    now = datetime.utcnow()
+    doc = {"_id": oid, "user_id": "u1", "name": "Apple", "updated_at": now}
+
+    item = from_mongo(InventoryItem, doc)
+
+    assert isinstance(item, record_type(InventoryItem))
+    assert not hasattr(item, "__dict__")
+    assert item.id == str(oid)
+    assert item.name == "Apple"
+    assert item.quantity == 0  # model default
+    assert item.category_id is None
+    assert item.updated_at == now
+    assert asdict(item)["user_id"] == "u1"
+
+
+def test_validated_read_returns_model():
+    doc = {"_id": ObjectId(), "user_id": "u1", "name": "Apple", "quantity": "3"}
+    item = from_mongo(InventoryItem, doc, validate=True)
+    assert isinstance(item, InventoryItem)
+    assert item.quantity == 3
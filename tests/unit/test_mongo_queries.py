@@ -1,9 +1,15 @@
 # tests/test_inventory_category_location.py
 
 import pytest
+from bson import ObjectId
 from pymongo import MongoClient
 from components.inventory_management.db import mongo_queries as mq
-from components.inventory_management.db.models import InventoryItem, Category, Location
+from components.inventory_management.db.models import (
+    InventoryItem,
+    Category,
+    Location,
+    ShoppingListItem,
+)
 
 
 # -------------------- Setup Test DB --------------------
@@ -116,3 +122,116 @@ def test_insert_and_get_location():
     fetched = mq.get_location(loc_id)
     assert fetched is not None
     assert fetched.name == "Warehouse A"
+
+
+# -------------------- Pagination Tests --------------------
+def test_list_items_page_walks_all_items():
+    user_id = "page-user"
+    for i in range(5):
+        mq.insert_item(InventoryItem(name=f"Paged {i}", quantity=i, user_id=user_id))
+
+    names, cursor = [], None
+    while True:
+        page = mq.list_items_page({"user_id": user_id}, cursor=cursor, limit=2)
+        assert len(page["items"]) <= 2
+        names += [item.name for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert names == [f"Paged {i}" for i in range(5)]
+
+
+# -------------------- Bulk Write Tests --------------------
+def test_bulk_write_items_mixed_operations():
+    keep_id = mq.insert_item(InventoryItem(name="Keep", quantity=5, user_id="bulk"))
+    drop_id = mq.insert_item(InventoryItem(name="Drop", quantity=1, user_id="bulk"))
+
+    results = mq.bulk_write_items(
+        [
+            {"op": "create", "item": {"name": "New", "quantity": 3}},
+            {"op": "quantity", "item_id": keep_id, "delta": 4},
+            {"op": "update", "item_id": keep_id, "fields": {"name": "Kept"}},
+            {"op": "delete", "item_id": drop_id},
+            {"op": "delete", "item_id": str(ObjectId())},
+        ],
+        user_id="bulk",
+    )
+
+    assert [r["status"] for r in results] == ["ok", "ok", "ok", "ok", "not_found"]
+    assert mq.get_item_by_id(results[0]["item_id"]).name == "New"
+    kept = mq.get_item_by_id(keep_id)
+    assert kept.quantity == 9 and kept.name == "Kept"
+    assert mq.get_item_by_id(drop_id) is None
+
+
+# -------------------- Shopping List Checkout Tests --------------------
+def test_checkout_shopping_list_upserts_and_archives(test_db, monkeypatch):
+    monkeypatch.setattr(mq, "SHOPPING_LIST_COLLECTION", test_db["shopping_lists"])
+    mq.SHOPPING_LIST_COLLECTION.delete_many({})
+    user_id = "checkout-user"
+    milk_id = mq.insert_item(InventoryItem(name="Milk", quantity=1, user_id=user_id))
+    for name, quantity, purchased in [
+        ("Milk", 2, True),
+        ("Milk", 1, True),
+        ("Eggs", 12, True),
+        ("Bread", 1, False),
+    ]:
+        mq.insert_shopping_item(
+            ShoppingListItem(
+                user_id=user_id,
+                item_name=name,
+                quantity=quantity,
+                purchased=purchased,
+            )
+        )
+
+    result, previous = mq.checkout_shopping_list(user_id)
+
+    assert result["lines"] == 3
+    by_name = {item["name"]: item for item in result["items"]}
+    assert by_name["Milk"] == {
+        "name": "Milk",
+        "delta": 3,
+        "item_id": milk_id,
+        "created": False,
+    }
+    assert by_name["Eggs"]["created"] is True
+    assert previous["Milk"]["quantity"] == 1
+    assert mq.get_item_by_id(milk_id).quantity == 4
+    assert mq.get_item_by_id(by_name["Eggs"]["item_id"]).quantity == 12
+    assert [line.item_name for line in mq.get_shopping_list(user_id)] == ["Bread"]
+    # Checked-out lines are archived, and no listing shows them
+    assert [
+        line.item_name for line in mq.list_shopping_items({"user_id": user_id})
+    ] == ["Bread"]
+    page = mq.list_shopping_items_page({"user_id": user_id})
+    assert [line.item_name for line in page["items"]] == ["Bread"]
+    # Nothing left to check out
+    assert mq.checkout_shopping_list(user_id) == ({"lines": 0, "items": []}, {})
+
+
+# -------------------- Name Search Tests --------------------
+def test_search_items_ranks_and_follows_writes(test_db, monkeypatch):
+    monkeypatch.setattr(mq, "VERSIONS_COLLECTION", test_db["collection_versions"])
+    user_id = "search-user"
+    ids = {
+        name: mq.insert_item(InventoryItem(name=name, quantity=1, user_id=user_id))
+        for name in ["Apple", "Pineapple", "Apple Juice", "Banana"]
+    }
+    mq.bump_version(mq.ITEMS_VERSION, user_id)
+
+    page = mq.search_items(user_id, "apple", limit=2)
+    assert [item.name for item in page["items"]] == ["Apple", "Apple Juice"]
+    assert [item.id for item in page["items"]] == [ids["Apple"], ids["Apple Juice"]]
+    page = mq.search_items(user_id, "apple", cursor=page["next_cursor"], limit=2)
+    assert [item.name for item in page["items"]] == ["Pineapple"]
+    assert page["items"][0].id == ids["Pineapple"]
+    assert page["next_cursor"] is None
+
+    kiwi = InventoryItem(name="Kiwi", quantity=1, user_id=user_id)
+    kiwi_id = mq.insert_item(kiwi)
+    mq.bump_version(mq.ITEMS_VERSION, user_id)
+    mq.update_search_index(user_id, [(kiwi_id, None, kiwi.to_dict())])
+    (found,) = mq.search_items(user_id, "kiwii")["items"]
+    assert (found.id, found.name) == (kiwi_id, "Kiwi")
@@ -0,0 +1,428 @@
+# tests/unit/test_outbox.py
+
+from datetime import datetime, timedelta
+
+import pytest
+from bson.objectid import ObjectId
+from pymongo.errors import BulkWriteError
+
+from backend.inventory_management.db import mongo_queries as mq
+from backend.inventory_management.event_sourcing import outbox
+from backend.inventory_management.event_sourcing.outbox import (
+    OutboxRelay,
+    order_entries,
+)
+
+T0 = datetime(2024, 1, 1)
+
+
+def entry(event_type, item_id, seconds=0, **payload):
+    return {
+        "_id": ObjectId(),
+        "type": event_type,
+        "payload": {"item_id": str(item_id), **payload},
+        "at": T0 + timedelta(seconds=seconds),
+    }
+
+
+def test_update_carries_its_events():
+    item_id = ObjectId()
+    update = mq._with_entries(
+        {"$inc": {"quantity": 2}, "$set": {"updated_at": T0}},
+        mq._item_entries(item_id, [("QuantityUpdated", {"delta": 2})]),
+    )
+    assert update["$inc"] == {"quantity": 2}
+    assert update["$set"] == {"updated_at": T0, "_pending": True}
+    (pushed,) = update["$push"]["_outbox"]["$each"]
+    assert pushed["type"] == "QuantityUpdated"
+    assert pushed["payload"] == {"item_id": str(item_id), "delta": 2}
+
+    # Without events the update is left alone
+    assert mq._with_entries({"$set": {"a": 1}}, []) == {"$set": {"a": 1}}
+
+
+def test_new_item_gets_its_id_before_the_insert():
+    item = mq.InventoryItem(user_id="u1", name="Apple")
+    doc = mq._new_item_doc(item, [("ItemCreated", {"name": "Apple"})])
+    assert isinstance(doc["_id"], ObjectId)
+    assert doc["_pending"] is True
+    assert doc["_outbox"][0]["payload"] == {"item_id": str(doc["_id"]), "name": "Apple"}
+
+    assert "_outbox" not in mq._new_item_doc(item)
+
+
+def test_bulk_requests_with_events():
+    present = ObjectId()
+    parsed, results = mq._parse_bulk_ops(
+        [
+            {"op": "create", "item": {"name": "Pear"}},
+            {"op": "quantity", "item_id": str(present), "delta": 3},
+            {"op": "update", "item_id": str(present), "fields": {"_outbox": []}},
+        ],
+        user_id="u1",
+    )
+    assert results[2]["status"] == "error"
+
+    requests, positions = mq._bulk_requests(
+        parsed, {present}, results, "u1", with_events=True
+    )
+    assert positions == [0, 1]
+    create, quantity = requests
+    created = create._doc
+    assert created["_outbox"][0]["type"] == "ItemCreated"
+    assert created["_outbox"][0]["payload"]["item_id"] == str(created["_id"])
+    assert "_outbox" not in created["_outbox"][0]["payload"]
+    assert quantity._doc["$push"]["_outbox"]["$each"][0]["payload"] == {
+        "item_id": str(present),
+        "delta": 3,
+    }
+
+
+def test_order_entries_keeps_per_item_order_and_drops_repeats():
+    first, second = ObjectId(), ObjectId()
+    late = [entry("ItemUpdated", first, 5), entry("QuantityUpdated", first, 1)]
+    early = [entry("ItemCreated", second, 2)]
+    rescued = entry("ItemUpdated", ObjectId(), 0)
+    rows = [rescued, late[0]]
+
+    ordered = order_entries(
+        [{"_id": first, "_outbox": late}, {"_id": second, "_outbox": early}], rows
+    )
+    # Items by their oldest entry, array order within an item, rows last
+    assert ordered == early + late + [rescued]
+
+
+class FakeCursor(list):
+    def sort(self, *args, **kwargs):
+        return self
+
+    def limit(self, count):
+        return FakeCursor(self[:count])
+
+
+class FakeCollection:
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+        self.calls = []
+
+    def find(self, filter=None, projection=None):
+        filter = filter or {}
+        if "_id" in filter:
+            wanted = set(filter["_id"]["$in"])
+            return FakeCursor(doc for doc in self.docs if doc["_id"] in wanted)
+        if filter.get("_pending"):
+            return FakeCursor(doc for doc in self.docs if doc.get("_pending"))
+        return FakeCursor(self.docs)
+
+    def find_one_and_update(self, *args, **kwargs):
+        return {"_id": outbox.RELAY}
+
+    def bulk_write(self, requests, ordered):
+        self.calls.append(("bulk_write", requests))
+
+    def delete_many(self, filter):
+        self.calls.append(("delete_many", filter["_id"]["$in"]))
+
+
+@pytest.fixture
+def relay(monkeypatch):
+    stored = []
+    monkeypatch.setattr(
+        outbox,
+        "outbox_event_docs",
+        lambda entries: [
+            {"_id": e["_id"], "seq": i, "type": e["type"]}
+            for i, e in enumerate(entries, 1)
+        ],
+    )
+    monkeypatch.setattr(outbox, "store_events", lambda docs: stored.append(docs))
+    published = []
+
+    def build(items=(), rows=(), events=(), categories=()):
+        relay = OutboxRelay(
+            items=FakeCollection(items),
+            outbox=FakeCollection(rows),
+            events=FakeCollection(events),
+            leases=FakeCollection(),
+            categories=FakeCollection(categories),
+            locations=FakeCollection(),
+            publish=published.append,
+        )
+        relay.stored, relay.published_batches = stored, published
+        return relay
+
+    return build
+
+
+def test_relay_publishes_stores_then_acks(relay):
+    item_id = ObjectId()
+    entries = [entry("ItemCreated", item_id), entry("QuantityUpdated", item_id, 1)]
+    already = entry("ItemUpdated", ObjectId())
+    relay = relay(
+        items=[{"_id": item_id, "_pending": True, "_outbox": entries}],
+        rows=[already],
+        events=[{"_id": already["_id"], "seq": 7}],
+    )
+
+    assert relay.run_once() == 3
+    (published,) = relay.published_batches
+    assert [doc["_id"] for doc in published] == [e["_id"] for e in entries]
+    assert relay.stored == [published]
+    (ack_items,) = relay.items.calls
+    assert ack_items[0] == "bulk_write"
+    # The item records the last position its events were relayed at
+    (ack,) = ack_items[1]
+    relayed = ack._doc[0]["$set"]["_relayed_seq"]
+    assert relayed == {"$max": [{"$ifNull": ["$_relayed_seq", 0]}, 2]}
+    assert relay.outbox.calls == [("delete_many", [already["_id"]])]
+    assert relay.stats()["relayed"] == 2
+
+
+def test_relay_holds_deletes_of_items_that_still_exist(relay):
+    alive, gone = ObjectId(), ObjectId()
+    now = datetime.utcnow()
+    fresh = {**entry("ItemDeleted", alive), "at": now}
+    stale = {**entry("ItemDeleted", alive), "at": now - timedelta(seconds=60)}
+    done = {**entry("ItemDeleted", gone), "at": now}
+    relay = relay(items=[{"_id": alive}], rows=[fresh, stale, done])
+
+    assert relay.run_once() == 2
+    (published,) = relay.published_batches
+    assert [doc["_id"] for doc in published] == [done["_id"]]
+    assert relay.outbox.calls == [("delete_many", [done["_id"], stale["_id"]])]
+    assert relay.stats()["held_deletes"] == 1
+    assert relay.stats()["dropped_deletes"] == 1
+
+
+def test_relay_holds_renames_until_the_name_is_set(relay):
+    category = ObjectId()
+    now = datetime.utcnow()
+
+    def renamed(name, age):
+        return {
+            "_id": ObjectId(),
+            "type": "CategoryRenamed",
+            "payload": {"category_id": str(category), "name": name},
+            "at": now - timedelta(seconds=age),
+        }
+
+    applied, waiting, failed = renamed("Fruit", 0), renamed("Veg", 0), renamed("X", 60)
+    relay = relay(
+        rows=[applied, waiting, failed],
+        categories=[{"_id": category, "name": "Fruit"}],
+    )
+
+    assert relay.run_once() == 2
+    (published,) = relay.published_batches
+    assert [doc["_id"] for doc in published] == [applied["_id"]]
+    assert relay.outbox.calls == [("delete_many", [applied["_id"], failed["_id"]])]
+    assert relay.stats()["held_renames"] == 1
+    assert relay.stats()["dropped_renames"] == 1
+
+
+class RecordingCollection:
+    def __init__(self, found=None):
+        self.found = found
+        self.calls = []
+
+    def insert_many(self, docs, ordered=True):
+        self.calls.append(("insert_many", [doc["_id"] for doc in docs]))
+
+    def delete_many(self, filter):
+        self.calls.append(("delete_many", filter["_id"]["$in"]))
+
+    def find_one_and_delete(self, filter):
+        self.calls.append(("find_one_and_delete", filter["_id"]))
+        return self.found
+
+    def find_one(self, filter, projection=None):
+        return self.found
+
+
+def test_delete_of_a_missing_item_leaves_no_event(monkeypatch):
+    items, rows = RecordingCollection(found=None), RecordingCollection()
+    monkeypatch.setattr(mq, "ITEMS_COLLECTION", items)
+    monkeypatch.setattr(mq, "OUTBOX_COLLECTION", rows)
+
+    assert mq.delete_item_and_get_previous("not-an-id", [("ItemDeleted", {})]) is None
+    assert items.calls == [] and rows.calls == []
+
+    assert (
+        mq.delete_item_and_get_previous(str(ObjectId()), [("ItemDeleted", {})]) is None
+    )
+    written, discarded = rows.calls
+    assert written[0] == "insert_many"
+    assert discarded == ("delete_many", written[1])
+
+
+def _matches(doc, filter):
+    for key, wanted in filter.items():
+        if isinstance(wanted, dict) and "$in" in wanted:
+            if doc.get(key) not in wanted["$in"]:
+                return False
+        elif isinstance(wanted, dict) and "$exists" in wanted:
+            if (key in doc) != wanted["$exists"]:
+                return False
+        elif doc.get(key) != wanted:
+            return False
+    return True
+
+
+def _stored_at(doc):
+    # Stored datetimes come back naive, as pymongo returns them
+    return doc.get("at", T0).replace(tzinfo=None)
+
+
+class MemoryCollection(FakeCollection):
+    """Just enough of a collection for a delete and a relay run to share."""
+
+    def find(self, filter=None, projection=None):
+        found = [doc for doc in self.docs if _matches(doc, filter or {})]
+        return FakeCursor(sorted(found, key=_stored_at))
+
+    def find_one(self, filter, projection=None):
+        found = self.find(filter)
+        return dict(found[0]) if found else None
+
+    def insert_many(self, docs, ordered=True):
+        self.docs += [dict(doc) for doc in docs]
+
+    def find_one_and_delete(self, filter):
+        doc = self.find_one(filter)
+        if doc is not None:
+            self.docs = [d for d in self.docs if d["_id"] != doc["_id"]]
+        return doc
+
+    def delete_many(self, filter):
+        wanted = filter["_id"]["$in"]
+        self.docs = [doc for doc in self.docs if doc["_id"] not in wanted]
+
+
+def test_relay_between_delete_and_return_keeps_event_order(relay, monkeypatch):
+    item_id = ObjectId()
+    updated = entry("ItemUpdated", item_id, updated_fields={"name": "Pear"})
+    items = MemoryCollection(
+        [{"_id": item_id, "user_id": "u1", "_pending": True, "_outbox": [updated]}]
+    )
+    rows = MemoryCollection()
+    monkeypatch.setattr(mq, "ITEMS_COLLECTION", items)
+    monkeypatch.setattr(mq, "OUTBOX_COLLECTION", rows)
+    relay = relay()
+    relay.items, relay.outbox = items, rows
+
+    delete = items.find_one_and_delete
+
+    def delete_then_relay(filter):
+        doc = delete(filter)
+        if doc is not None:
+            relay.run_once()  # lands right after the delete
+        return doc
+
+    items.find_one_and_delete = delete_then_relay
+    doc = mq.delete_item_and_get_previous(str(item_id), [("ItemDeleted", {})], "u1")
+
+    assert doc["_id"] == item_id
+    (published,) = relay.published_batches
+    # The item's pending update goes ahead of its delete, and nothing is lost
+    assert [event["type"] for event in published] == ["ItemUpdated", "ItemDeleted"]
+    assert published[0]["_id"] == updated["_id"]
+    assert rows.docs == []
+
+
+class CheckoutItems:
+    """Items collection where "Milk" is created by someone else mid-checkout."""
+
+    def __init__(self):
+        self.milk = {"_id": ObjectId(), "name": "Milk", "quantity": 7}
+        self.reads = 0
+        self.fixes = []
+
+    def find(self, filter, projection=None):
+        self.reads += 1
+        return [] if self.reads == 1 else [self.milk]
+
+    def bulk_write(self, requests, ordered):
+        class Result:
+            upserted_ids = {}
+
+        self.requests = requests
+        return Result()
+
+    def update_one(self, filter, update, array_filters):
+        self.fixes.append((filter, update, array_filters))
+
+
+class CheckoutLines:
+    def update_many(self, filter, update):
+        pass
+
+    def find(self, filter, projection=None):
+        return [{"_id": ObjectId(), "item_name": "Milk", "quantity": 2}]
+
+
+def test_checkout_racing_a_create_records_a_quantity_update(monkeypatch):
+    items = CheckoutItems()
+    monkeypatch.setattr(mq, "ITEMS_COLLECTION", items)
+    monkeypatch.setattr(mq, "SHOPPING_LIST_COLLECTION", CheckoutLines())
+    monkeypatch.setattr(mq, "invalidate_item", lambda item_id: None)
+
+    result, previous = mq.checkout_shopping_list("u1")
+
+    (item,) = result["items"]
+    assert item["item_id"] == str(items.milk["_id"]) and not item["created"]
+    assert previous["Milk"]["quantity"] == 5
+    bogus_id = items.requests[0]._doc["$setOnInsert"]["_id"]
+    ((filter, update, array_filters),) = items.fixes
+    assert filter == {"_id": items.milk["_id"]}
+    assert update["$set"]["_outbox.$[entry].type"] == "QuantityUpdated"
+    assert array_filters == [{"entry.payload.item_id": str(bogus_id)}]
+
+
+class PartlyFailingItems:
+    """Items collection whose checkout upsert fails for the second name only."""
+
+    def find(self, filter, projection=None):
+        return []
+
+    def bulk_write(self, requests, ordered):
+        assert not ordered
+        self.requests = requests
+        inserted = requests[0]._doc["$setOnInsert"]["_id"]
+        raise BulkWriteError(
+            {
+                "writeErrors": [{"index": 1, "code": 121, "errmsg": "invalid"}],
+                "upserted": [{"index": 0, "_id": inserted}],
+            }
+        )
+
+
+class ReleasedLines(CheckoutLines):
+    def __init__(self, lines):
+        self.lines = lines
+        self.released = []
+
+    def update_many(self, filter, update):
+        if "$unset" in update:
+            self.released.extend(filter["_id"]["$in"])
+
+    def find(self, filter, projection=None):
+        return self.lines
+
+
+def test_checkout_gives_back_only_the_lines_that_failed(monkeypatch):
+    bread, milk, more_milk = (
+        {"_id": ObjectId(), "item_name": name, "quantity": quantity}
+        for name, quantity in (("Bread", 1), ("Milk", 2), ("Milk", 1))
+    )
+    lines = ReleasedLines([bread, milk, more_milk])
+    items = PartlyFailingItems()
+    monkeypatch.setattr(mq, "ITEMS_COLLECTION", items)
+    monkeypatch.setattr(mq, "SHOPPING_LIST_COLLECTION", lines)
+    monkeypatch.setattr(mq, "invalidate_item", lambda item_id: None)
+
+    result, _ = mq.checkout_shopping_list("u1")
+
+    assert lines.released == [milk["_id"], more_milk["_id"]]
+    assert result["lines"] == 1
+    (item,) = result["items"]
+    assert item["name"] == "Bread" and item["created"]
@@ -0,0 +1,51 @@
+# tests/unit/test_pagination.py
+
+import pytest
+from bson import ObjectId
+from backend.inventory_management.db import pagination
+from backend.inventory_management.db.models import InventoryItem
+
+
+def test_cursor_round_trip():
+    oid = ObjectId()
+    cursor = pagination.encode_cursor(oid)
+    assert "=" not in cursor
+    assert pagination.decode_cursor(cursor) == oid
+
+
+def test_invalid_cursor_raises():
+    with pytest.raises(pagination.InvalidCursorError):
+        pagination.decode_cursor("not-a-cursor")
+
+
+def test_page_size_is_capped():
+    assert pagination.clamp_page_size(None) == pagination.DEFAULT_PAGE_SIZE
+    assert pagination.clamp_page_size(0) == pagination.DEFAULT_PAGE_SIZE
+    assert pagination.clamp_page_size(10) == 10
+    assert pagination.clamp_page_size(10_000) == pagination.MAX_PAGE_SIZE
+
+
+def test_keyset_filter_adds_id_bound():
+    oid = ObjectId()
+    query = pagination.keyset_filter({"user_id": "u1"}, pagination.encode_cursor(oid))
+    assert query == {"user_id": "u1", "_id": {"$gt": oid}}
+    assert pagination.keyset_filter({"user_id": "u1"}, None) == {"user_id": "u1"}
+
+
+def test_build_page_uses_extra_doc_as_has_more_marker():
+    docs = [{"_id": ObjectId(), "user_id": "u1", "name": f"Item {i}"} for i in range(3)]
+
+    page = pagination.build_page(docs, 2, InventoryItem)
+    assert [item.name for item in page["items"]] == ["Item 0", "Item 1"]
+    assert page["items"][0].id == str(docs[0]["_id"])
+    assert pagination.decode_cursor(page["next_cursor"]) == docs[1]["_id"]
+
+    last_page = pagination.build_page(docs[2:], 2, InventoryItem)
+    assert last_page["next_cursor"] is None
+
+
+def test_build_page_validate_returns_pydantic_models():
+    docs = [{"_id": ObjectId(), "user_id": "u1", "name": "Validated"}]
+    page = pagination.build_page(docs, 10, InventoryItem, validate=True)
+    assert isinstance(page["items"][0], InventoryItem)
+    assert page["items"][0].id == str(docs[0]["_id"])
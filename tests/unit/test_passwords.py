@@ -0,0 +1,75 @@
+# tests/unit/test_passwords.py
+
+import asyncio
+
+import pytest
+
+from backend.inventory_management.core.passwords import PasswordHasher
+
+
+@pytest.fixture
+def hashers():
+    # bcrypt's minimum cost keeps the real process pool fast enough for tests
+    created = []
+
+    def make(rounds=4, **kwargs):
+        hasher = PasswordHasher(
+            rounds=rounds, **{"workers": 1, "max_pending": 2, **kwargs}
+        )
+        created.append(hasher)
+        return hasher
+
+    yield make
+    for hasher in created:
+        hasher.shutdown()
+
+
+def test_hash_and_verify_in_the_pool(hashers):
+    hasher = hashers()
+
+    async def run():
+        password_hash = await hasher.hash("s3cret")
+        return (
+            password_hash,
+            await hasher.verify("s3cret", password_hash),
+            await hasher.verify("wrong", password_hash),
+        )
+
+    password_hash, good, bad = asyncio.run(run())
+    assert password_hash.startswith("$2b$04$")
+    assert good == (True, None)
+    assert bad == (False, None)
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["in_flight"] == stats["waiting"] == 0
+
+
+def test_changed_cost_rehashes_on_verify(hashers):
+    old_hash = asyncio.run(hashers(rounds=4).hash("s3cret"))
+
+    valid, new_hash = asyncio.run(hashers(rounds=5).verify("s3cret", old_hash))
+    assert valid
+    assert new_hash.startswith("$2b$05$")
+
+    # A wrong password never yields a replacement hash
+    assert asyncio.run(hashers(rounds=5).verify("wrong", old_hash)) == (False, None)
+
+
+def test_concurrency_is_bounded_by_max_pending(hashers):
+    hasher = hashers(max_pending=1)
+    seen = []
+
+    async def watch():
+        while len(seen) < 50:
+            seen.append((hasher.in_flight, hasher.waiting))
+            await asyncio.sleep(0.005)
+
+    async def run():
+        watcher = asyncio.ensure_future(watch())
+        await asyncio.gather(*(hasher.hash(f"pw{i}") for i in range(3)))
+        watcher.cancel()
+
+    asyncio.run(run())
+    assert max(in_flight for in_flight, _ in seen) == 1
+    assert max(waiting for _, waiting in seen) >= 1
+    assert hasher.stats()["completed"] == 3
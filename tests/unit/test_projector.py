@@ -0,0 +1,390 @@
+# tests/unit/test_projector.py
+
+from datetime import datetime
+
+import pytest
+from bson.objectid import ObjectId
+from pymongo import DeleteOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from backend.inventory_management.event_sourcing import projector as module
+from backend.inventory_management.event_sourcing.projector import (
+    ChangeFollower,
+    InventoryProjector,
+    summary_deltas,
+    view_operation,
+)
+
+ITEM_ID = str(ObjectId())
+CATEGORY_ID = str(ObjectId())
+NOW = datetime(2024, 1, 1)
+
+
+def event(seq, kind, **payload):
+    return {
+        "seq": seq,
+        "type": kind,
+        "payload": {"item_id": ITEM_ID, **payload},
+        "timestamp": NOW,
+    }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def projector(clock):
+    projector = InventoryProjector(
+        events=object(),
+        view=object(),
+        checkpoints=object(),
+        changes=object(),
+        summaries=object(),
+        clock=clock,
+    )
+    projector.position = 10
+    return projector
+
+
+def test_created_event_upserts_view_row_with_names():
+    operation = view_operation(
+        event(
+            7,
+            "ItemCreated",
+            user_id="u1",
+            name="Apple",
+            category_id=CATEGORY_ID,
+            created_at=NOW,
+        ),
+        categories={CATEGORY_ID: "Fruit"},
+        locations={},
+    )
+    doc = operation._doc
+    assert isinstance(operation, UpdateOne)
+    assert operation._filter == {"_id": ObjectId(ITEM_ID), "last_seq": {"$lt": 7}}
+    assert operation._upsert
+    assert doc["$set"] == {
+        "user_id": "u1",
+        "name": "Apple",
+        "quantity": 0,
+        "category_id": CATEGORY_ID,
+        "category_name": "Fruit",
+        "location_id": None,
+        "location_name": None,
+        "last_seq": 7,
+        "updated_at": NOW,
+    }
+
+
+def test_update_quantity_and_delete_events():
+    updated = view_operation(
+        event(8, "ItemUpdated", updated_fields={"name": "Green apple", "extra": 1}),
+        {},
+        {},
+    )
+    assert updated._doc["$set"] == {
+        "name": "Green apple",
+        "last_seq": 8,
+        "updated_at": NOW,
+    }
+    assert not updated._upsert
+
+    quantity = view_operation(event(9, "QuantityUpdated", delta=-2), {}, {})
+    assert quantity._doc["$inc"] == {"quantity": -2}
+    assert quantity._filter["last_seq"] == {"$lt": 9}
+
+    deleted = view_operation(event(10, "ItemDeleted"), {}, {})
+    assert isinstance(deleted, DeleteOne)
+    assert deleted._filter == {"_id": ObjectId(ITEM_ID), "last_seq": {"$lt": 10}}
+
+
+def test_unknown_or_malformed_events_are_ignored():
+    assert view_operation(event(1, "UserSignedUp"), {}, {}) is None
+    assert (
+        view_operation({"seq": 2, "type": "ItemDeleted", "payload": {}}, {}, {}) is None
+    )
+    assert (
+        view_operation(
+            {"seq": 3, "type": "ItemDeleted", "payload": {"item_id": "nope"}}, {}, {}
+        )
+        is None
+    )
+
+
+def test_contiguous_stops_at_a_fresh_gap(projector):
+    events = [event(11, "ItemDeleted"), event(13, "ItemDeleted")]
+    assert [e["seq"] for e in projector._contiguous(events)] == [11]
+
+
+def test_gap_is_skipped_once_it_times_out(projector, clock):
+    events = [event(12, "ItemDeleted"), event(13, "ItemDeleted")]
+    assert projector._contiguous(events) == []
+
+    clock.now = projector.gap_timeout - 0.1
+    assert projector._contiguous(events) == []
+
+    clock.now = projector.gap_timeout
+    assert [e["seq"] for e in projector._contiguous(events)] == [12, 13]
+    assert projector.skipped == 1
+
+
+def test_gap_filled_in_time_is_not_skipped(projector, clock):
+    assert projector._contiguous([event(12, "ItemDeleted")]) == []
+    clock.now = 1
+    events = [event(11, "ItemDeleted"), event(12, "ItemDeleted")]
+    assert [e["seq"] for e in projector._contiguous(events)] == [11, 12]
+    assert projector.skipped == 0
+
+
+class FakeView:
+    """Fails the first bulk_write with a duplicate key error at index 0."""
+
+    def __init__(self):
+        self.writes = []
+
+    def bulk_write(self, operations, ordered):
+        self.writes.append(list(operations))
+        if len(self.writes) == 1:
+            raise BulkWriteError(
+                {"writeErrors": [{"index": 0, "code": 11000, "errmsg": "dup"}]}
+            )
+
+
+def test_apply_skips_already_applied_upserts(projector, monkeypatch):
+    monkeypatch.setattr(module, "get_categories_by_ids", lambda ids: {})
+    monkeypatch.setattr(module, "get_locations_by_ids", lambda ids: {})
+    projector.view = FakeView()
+
+    projector._apply(
+        [
+            event(11, "ItemCreated", user_id="u1", name="Apple"),
+            event(12, "QuantityUpdated", delta=1),
+        ]
+    )
+    first, second = projector.view.writes
+    assert len(first) == 2
+    assert len(second) == 1 and second[0]._doc["$inc"] == {"quantity": 1}
+
+
+class FakeRows(list):
+    def find(self, filter=None, projection=None):
+        wanted = (filter or {}).get("_id", {})
+        rows = FakeRows(self)
+        if "$in" in wanted:
+            rows = FakeRows(row for row in self if row["_id"] in wanted["$in"])
+        if "$gt" in wanted:
+            rows = FakeRows(row for row in self if row["_id"] > wanted["$gt"])
+        return rows
+
+    def sort(self, key, direction):
+        return FakeRows(sorted(self, key=lambda row: row[key], reverse=direction < 0))
+
+    def limit(self, count):
+        return FakeRows(self[:count])
+
+    def distinct(self, key, filter):
+        matching = (
+            row for row in self if all(row.get(k) == v for k, v in filter.items())
+        )
+        return sorted({row[key] for row in matching})
+
+
+def test_touched_covers_rows_before_and_after(projector):
+    users, categories = projector._touched(
+        [
+            event(11, "ItemUpdated", updated_fields={"category_id": "new"}),
+            event(12, "QuantityUpdated", delta=1),
+        ],
+        {ITEM_ID: {"user_id": "u1", "category_id": "old"}},
+    )
+    assert users == {"u1"}
+    assert categories == {"old", "new"}
+
+
+def test_summary_deltas_skip_events_already_counted():
+    events = [
+        event(11, "ItemCreated", user_id="u1", quantity=2, category_id="c1"),
+        event(12, "QuantityUpdated", delta=3),
+        event(13, "ItemUpdated", updated_fields={"category_id": "c2"}),
+    ]
+    assert summary_deltas(events, {}, {}) == {
+        "u1": {"item_count": 1, "total_units": 5, "units_by_category.c2": 5}
+    }
+
+    # Replayed after a crash: the view row has seen 11, the summary 12
+    rows = {
+        ITEM_ID: {"user_id": "u1", "quantity": 2, "category_id": "c1", "last_seq": 11}
+    }
+    assert summary_deltas(events, rows, {"u1": 12}) == {
+        "u1": {"units_by_category.c1": -5, "units_by_category.c2": 5}
+    }
+    assert summary_deltas(events, rows, {"u1": 13}) == {}
+
+    # A snapshot row already reflects the events still in the item's outbox
+    reflected = {**events[2], "_id": ObjectId()}
+    rows[ITEM_ID]["_reflected"] = [reflected["_id"]]
+    assert summary_deltas([events[1], reflected], rows, {}) == {
+        "u1": {"total_units": 3, "units_by_category.c1": 3}
+    }
+
+
+def test_rename_reaches_every_row_with_the_name(projector):
+    renamed = {
+        "_id": ObjectId(),
+        "seq": 11,
+        "type": "CategoryRenamed",
+        "payload": {"category_id": CATEGORY_ID, "name": "Produce"},
+    }
+    operation = view_operation(renamed, {}, {})
+    assert isinstance(operation, UpdateMany)
+    assert operation._filter == {"category_id": CATEGORY_ID}
+    assert operation._doc == {"$set": {"category_name": "Produce"}}
+
+    projector.view = FakeRows(
+        [
+            {"_id": 1, "user_id": "u1", "category_id": CATEGORY_ID},
+            {"_id": 2, "user_id": "u2", "category_id": CATEGORY_ID},
+            {"_id": 3, "user_id": "u3", "category_id": "other"},
+        ]
+    )
+    assert projector._touched([renamed], {}) == ({"u1", "u2"}, {CATEGORY_ID})
+    assert summary_deltas([renamed], {}, {}) == {}
+
+
+def test_follower_invalidates_in_order_and_resets_on_gaps():
+    changes = FakeRows([{"_id": 3, "users": ["u0"]}])
+    seen, resets = [], []
+    follower = ChangeFollower(
+        lambda users, categories: seen.append((users, categories)),
+        lambda: resets.append(True),
+        changes=changes,
+    )
+
+    # Nothing before the first poll is known to be cached
+    follower.run_once()
+    assert follower.last == 3 and len(resets) == 1
+
+    changes += [
+        {"_id": 4, "users": ["u1"], "categories": ["c1"]},
+        {"_id": 6, "users": ["u2"]},
+        {"_id": 7, "users": [], "categories": [], "reset": True},
+        {"_id": 8, "users": ["u3"], "categories": []},
+    ]
+    assert follower.run_once() == 4
+    assert seen == [(["u1"], ["c1"]), (["u3"], [])]
+    assert len(resets) == 3
+    assert follower.stats() == {"last": 8, "followed": 2, "resets": 3}
+
+
+def test_follower_resets_when_a_new_tenure_renumbers_the_log():
+    changes = FakeRows([{"_id": 5, "users": ["u0"], "epoch": "a"}])
+    seen, resets = [], []
+    follower = ChangeFollower(
+        lambda users, categories: seen.append(users),
+        lambda: resets.append(True),
+        changes=changes,
+    )
+    follower.run_once()
+
+    # A successor merges its replayed batch into the record already read
+    changes[0] = {"_id": 5, "users": ["u0", "u1"], "epoch": "b"}
+    assert follower.run_once() == 0
+    assert len(resets) == 2 and follower.epoch == "b"
+
+    # A fresh projector numbers from 1 again, below what was read
+    changes[:] = [{"_id": 1, "users": ["u2"], "epoch": "c"}]
+    follower.run_once()
+    assert len(resets) == 3 and follower.last == 1
+
+    changes.append({"_id": 2, "users": ["u3"], "epoch": "c"})
+    assert follower.run_once() == 1
+    assert seen == [["u3"]]
+
+
+class Stream:
+    def find_one(self, *args, **kwargs):
+        return {"seq": 42}
+
+
+class ItemScan(list):
+    def find(self, filter, projection, batch_size):
+        return self
+
+    def sort(self, key, direction):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class SnapshotView:
+    def __init__(self):
+        self.writes = []
+
+    def delete_many(self, filter):
+        self.writes.clear()
+
+    def bulk_write(self, operations, ordered):
+        self.writes.extend(operations)
+
+
+def test_first_run_snapshots_the_items_while_writes_go_on(projector, monkeypatch):
+    saved, summarized = [], []
+    monkeypatch.setattr(module, "get_categories_by_ids", lambda ids: {})
+    monkeypatch.setattr(module, "get_locations_by_ids", lambda ids: {})
+    monkeypatch.setattr(
+        module,
+        "rebuild_inventory_summaries",
+        lambda position: summarized.append(position),
+    )
+    monkeypatch.setattr(projector, "_record_changes", lambda *args, **kw: None)
+    monkeypatch.setattr(
+        projector, "_save_checkpoint", lambda p: saved.append(p) or True
+    )
+    projector.events = Stream()
+    pending = ObjectId()
+    projector.items = ItemScan(
+        [
+            # Relayed up to 45 before the scan read it, one event still pending
+            {
+                "_id": ObjectId(ITEM_ID),
+                "user_id": "u1",
+                "name": "Apple",
+                "quantity": 2,
+                "_relayed_seq": 45,
+                "_outbox": [{"_id": pending}],
+            },
+            {"_id": ObjectId(), "user_id": "u1", "name": "Pear"},
+        ]
+    )
+    projector.view = SnapshotView()
+
+    assert projector._start()
+    assert saved == [42] and summarized == [42]
+    apple, pear = projector.view.writes
+    assert isinstance(apple, ReplaceOne) and apple._upsert
+    assert apple._doc["last_seq"] == 45 and apple._doc["_reflected"] == [pending]
+    assert pear._doc["last_seq"] == 42 and "_reflected" not in pear._doc
+
+    # The stream resumes after 42; what the rows reflect is not applied again
+    operation = view_operation(
+        {**event(44, "QuantityUpdated", delta=1), "_id": pending}, {}, {}
+    )
+    assert operation._filter == {
+        "_id": ObjectId(ITEM_ID),
+        "last_seq": {"$lt": 44},
+        "_reflected": {"$ne": pending},
+    }
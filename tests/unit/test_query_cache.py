@@ -0,0 +1,120 @@
+# tests/unit/test_query_cache.py
+
+import pytest
+
+from backend.inventory_management.cqrs import comands, queries
+from backend.inventory_management.cqrs.queries import filter_tags, query_key
+from backend.inventory_management.db.cache import MISSING, QueryCache
+
+
+def test_entries_are_dropped_by_their_tags_only():
+    cache = QueryCache("test")
+    started = cache.begin()
+    cache.set("u1", [1], {"user:u1"}, started)
+    cache.set("u2", [2], {"user:u2", "category:c1"}, started)
+    cache.set("any", [3], set(), started)
+
+    assert cache.invalidate({"category:c1"}) == 2
+    assert cache.get("u1") == [1]
+    assert cache.get("u2") is MISSING
+    # Untagged entries depend on everything
+    assert cache.get("any") is MISSING
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_lru_eviction_is_counted():
+    cache = QueryCache("test", maxsize=2)
+    started = cache.begin()
+    cache.set("a", 1, {"user:a"}, started)
+    cache.set("b", 2, {"user:b"}, started)
+    cache.get("a")
+    cache.set("c", 3, {"user:c"}, started)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+    # The evicted entry no longer answers to its tag
+    assert cache.invalidate({"user:b"}) == 0
+
+
+def test_entry_from_another_version_is_stale():
+    cache = QueryCache("test")
+    cache.set("k", "old", {"user:u1"}, cache.begin(), version="1.1")
+    assert cache.get("k", version="1.1") == "old"
+    assert cache.get("k", version="1.2") is MISSING
+    assert cache.stats()["stale"] == 1
+
+
+def test_fill_racing_an_invalidation_is_not_cached():
+    cache = QueryCache("test")
+    started = cache.begin()
+    cache.invalidate({"user:u1"})
+    cache.set("k", "read before the change", {"user:u1"}, started)
+    assert cache.get("k") is MISSING
+    assert cache.stats()["skipped_fills"] == 1
+
+
+def test_query_key_ignores_key_and_set_order():
+    assert query_key("q", {"user_id": "u1", "category_id": "c1"}) == query_key(
+        "q", {"category_id": "c1", "user_id": "u1"}
+    )
+    assert query_key("q", {"user_id": {"$in": ["b", "a"]}}) == query_key(
+        "q", {"user_id": {"$in": ["a", "b"]}}
+    )
+    assert query_key("q", {"user_id": "u1"}) != query_key("r", {"user_id": "u1"})
+    assert query_key("q") == query_key("q", {})
+
+
+@pytest.mark.parametrize(
+    "filters, tags",
+    [
+        ({"user_id": "u1", "category_id": "c1"}, {"user:u1"}),
+        ({"user_id": {"$in": ["u1", "u2"]}}, {"user:u1", "user:u2"}),
+        ({"category_id": "c1"}, {"category:c1"}),
+        ({"user_id": {"$ne": "u1"}}, {QueryCache.ALL}),
+        (None, {QueryCache.ALL}),
+    ],
+)
+def test_filter_tags(filters, tags):
+    assert filter_tags(filters) == tags
+
+
+def test_list_all_items_is_served_from_cache_until_invalidated(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        queries, "list_view_items", lambda filters: calls.append(filters) or ["item"]
+    )
+    monkeypatch.setattr(queries, "ITEM_QUERIES", QueryCache("items"))
+
+    for _ in range(3):
+        assert queries.list_all_items({"user_id": "u1"}) == ["item"]
+    assert len(calls) == 1
+
+    queries.invalidate_item_queries(users=["u2"], categories=["c1"])
+    queries.list_all_items({"user_id": "u1"})
+    assert len(calls) == 1
+
+    queries.invalidate_item_queries(users=["u1"])
+    queries.list_all_items({"user_id": "u1"})
+    assert len(calls) == 2
+
+
+def test_commands_drop_the_owner_and_category_entries(monkeypatch):
+    cache = QueryCache("items")
+    monkeypatch.setattr(queries, "ITEM_QUERIES", cache)
+    monkeypatch.setattr(queries, "list_view_items", lambda filters: ["item"])
+    monkeypatch.setattr(queries, "get_view_items_by_category", lambda c: ["item"])
+    monkeypatch.setattr(
+        comands,
+        "delete_item_and_get_previous",
+        lambda item_id, events, user_id: {"user_id": "u1", "category_id": "c1"},
+    )
+    monkeypatch.setattr(comands, "bump_version", lambda *args: None)
+    monkeypatch.setattr(comands, "update_search_index", lambda *args: None)
+
+    queries.list_all_items({"user_id": "u1"})
+    queries.list_items_by_category("c1")
+    queries.list_all_items({"user_id": "u2"})
+    assert comands.delete_inventory_item("i1", user_id="u1")
+
+    assert cache.stats()["size"] == 1
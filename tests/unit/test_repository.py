@@ -0,0 +1,181 @@
+# tests/unit/test_repository.py
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import pytest
+from bson import ObjectId
+
+from backend.inventory_management.api import inventory
+from backend.inventory_management.db.models import InventoryItem
+from backend.inventory_management.db.repository import (
+    InMemoryRepository,
+    InvalidItemError,
+    MongoRepository,
+)
+
+
+def test_ids_are_not_reused_after_delete():
+    repo = InMemoryRepository([{"name": "Laptop"}, {"name": "Phone"}])
+    assert repo.delete("1")
+    added = repo.add({"name": "Tablet", "id": 99})
+
+    assert added["id"] == 3
+    assert [item["id"] for item in repo.list()["items"]] == [2, 3]
+    assert repo.get("1") is None
+    assert not repo.delete("1")
+
+
+def test_update_keeps_id_and_rejects_unknown():
+    repo = InMemoryRepository([{"name": "Laptop", "quantity": 5}])
+    updated = repo.update("1", {"quantity": 7, "id": 42})
+
+    assert updated == {"name": "Laptop", "quantity": 7, "id": 1}
+    assert repo.update("2", {"quantity": 1}) is None
+    assert repo.get("not-a-number") is None
+
+
+def test_inventory_router_uses_injected_repository():
+    app = FastAPI()
+    app.include_router(inventory.router, prefix="/inventory")
+    repo = InMemoryRepository([{"name": "Laptop", "quantity": 5}])
+    app.dependency_overrides[inventory.get_repository] = lambda: repo
+    client = TestClient(app)
+
+    created = client.post("/inventory/", json={"name": "Phone"}).json()
+    assert created["id"] == 2
+    assert client.put("/inventory/2", json={"quantity": 3}).json()["quantity"] == 3
+    client.delete("/inventory/1")
+
+    assert client.get("/inventory/1").status_code == 404
+    assert client.get("/inventory/").json() == {
+        "inventory": [{"name": "Phone", "quantity": 3, "id": 2}],
+        "next_cursor": None,
+    }
+
+
+def test_inventory_listing_revalidates_with_etag():
+    app = FastAPI()
+    app.include_router(inventory.router, prefix="/inventory")
+    repo = InMemoryRepository([{"name": "Laptop", "quantity": 5}])
+    app.dependency_overrides[inventory.get_repository] = lambda: repo
+    client = TestClient(app)
+
+    first = client.get("/inventory/")
+    etag = first.headers["ETag"]
+    cached = client.get("/inventory/", headers={"If-None-Match": f"W/{etag}"})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    client.put("/inventory/1", json={"quantity": 6})
+    changed = client.get("/inventory/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+    # A failed write does not change the version
+    client.put("/inventory/99", json={"quantity": 1})
+    assert client.get("/inventory/").headers["ETag"] == changed.headers["ETag"]
+
+
+def test_listing_is_paginated():
+    repo = InMemoryRepository([{"name": f"Item {n}"} for n in range(5)])
+    repo.delete("2")
+    first = repo.list(limit=2)
+    assert [item["id"] for item in first["items"]] == [1, 3]
+    second = repo.list(cursor=first["next_cursor"], limit=2)
+    assert [item["id"] for item in second["items"]] == [4, 5]
+    assert second["next_cursor"] is None
+
+
+def test_page_reads_from_its_cursor_past_deleted_keys():
+    repo = InMemoryRepository([{"name": f"Item {n}"} for n in range(300)])
+    for item_id in range(100, 291):
+        repo.delete(str(item_id))
+    # Deletes compact the key list once most of it is dead
+    assert len(repo._keys) < 300
+
+    page = repo.list(cursor=repo.list(limit=98)["next_cursor"], limit=3)
+    assert [item["id"] for item in page["items"]] == [99, 291, 292]
+
+
+class Commands:
+    """Records the CQRS command calls a MongoRepository makes."""
+
+    def __init__(self):
+        self.calls = []
+        self.item_id = str(ObjectId())
+
+    def create(self, data):
+        self.calls.append(("create", data["user_id"], data["name"]))
+        return self.item_id
+
+    def update(self, item_id, fields, user_id):
+        self.calls.append(("update", user_id, fields))
+        return InventoryItem(user_id=user_id, name="Milk", **fields)
+
+    def delete(self, item_id, user_id):
+        self.calls.append(("delete", user_id, item_id))
+        return True
+
+    def list_page(self, filter, cursor=None, limit=None):
+        self.calls.append(("list", filter, limit))
+        return {"items": [], "next_cursor": None}
+
+
+@pytest.fixture
+def mongo_repo():
+    commands = Commands()
+    repo = MongoRepository(
+        InventoryItem,
+        "items",
+        create=commands.create,
+        get=lambda item_id: InventoryItem(user_id="u1", name="Milk"),
+        list_page=commands.list_page,
+        update=commands.update,
+        delete=commands.delete,
+    )
+    repo.commands = commands
+    return repo
+
+
+def test_mongo_repository_writes_through_commands_as_the_caller(mongo_repo):
+    added = mongo_repo.add({"name": "Milk", "user_id": "someone-else"}, "u1")
+    assert added["id"] == mongo_repo.commands.item_id
+    assert mongo_repo.update("x", {"quantity": "3"}, "u1")["quantity"] == 3
+    assert mongo_repo.delete("x", "u1")
+    mongo_repo.list("u1", limit=10)
+
+    assert mongo_repo.commands.calls == [
+        ("create", "u1", "Milk"),
+        ("update", "u1", {"quantity": 3}),
+        ("delete", "u1", "x"),
+        ("list", {"user_id": "u1"}, 10),
+    ]
+    # Another user's item is not found
+    assert mongo_repo.get("x", "u1")["name"] == "Milk"
+    assert mongo_repo.get("x", "u2") is None
+
+
+@pytest.mark.parametrize(
+    "fields", [{"user_id": "u2"}, {"_id": "x"}, {"colour": "red"}, {"quantity": "a"}]
+)
+def test_mongo_repository_rejects_bad_updates(mongo_repo, fields):
+    with pytest.raises(InvalidItemError):
+        mongo_repo.update("x", fields, "u1")
+    assert mongo_repo.commands.calls == []
+
+
+def test_mongo_repository_rejects_invalid_items(mongo_repo):
+    with pytest.raises(InvalidItemError):
+        mongo_repo.add({"quantity": 1}, "u1")
+
+
+def test_versions_are_unique_across_instances():
+    # Same seed, same write count: a restarted worker must not reuse the tag
+    first, second = InMemoryRepository([{"name": "A"}]), InMemoryRepository(
+        [{"name": "A"}]
+    )
+    assert first.version() != second.version()
+    before = first.version()
+    first.add({"name": "B"})
+    assert first.version() != before
@@ -66,3 +66,32 @@ if __name__ == "__main__":
     test_auth_signup()
     test_auth_login()
     print("All tests passed!")
+
+
+def test_create_item_rejects_a_bad_body():
+    from backend.inventory_management.api.routes import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: "u1"
+    try:
+        response = client.post("/api/items", json={"name": "Milk", "quantity": "lots"})
+        assert response.status_code == 422
+        assert client.post("/api/items", json={"quantity": 1}).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_items_view_reads_the_users_items_from_the_query_side(monkeypatch):
+    from backend.inventory_management.api.routes import get_current_user, queries
+
+    calls = []
+    monkeypatch.setattr(
+        queries, "list_all_items", lambda filters: calls.append(filters) or []
+    )
+    app.dependency_overrides[get_current_user] = lambda: "u1"
+    try:
+        response = client.get("/api/items/view", params={"category_id": "c1"})
+        assert response.status_code == 200
+        assert response.json() == {"items": []}
+        assert calls == [{"user_id": "u1", "category_id": "c1"}]
+    finally:
+        app.dependency_overrides.clear()
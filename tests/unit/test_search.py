@@ -0,0 +1,128 @@
+# tests/unit/test_search.py
+
+import threading
+import time
+
+import pytest
+
+from backend.inventory_management.db.pagination import (
+    InvalidCursorError,
+    decode_offset_cursor,
+    encode_offset_cursor,
+)
+from backend.inventory_management.db.search import (
+    NameIndex,
+    SearchIndexes,
+    next_version,
+)
+
+NAMES = {
+    "1": "Apple",
+    "2": "Apple Juice",
+    "3": "Pineapple",
+    "4": "Green apple",
+    "5": "Banana",
+    "6": "Orange juice",
+    "7": "Aple sauce",
+}
+
+
+@pytest.fixture
+def index():
+    return NameIndex.from_items(NAMES.items())
+
+
+def names(index, query, limit=10, offset=0):
+    return [NAMES[i] for i in index.search(query, limit=limit, offset=offset)]
+
+
+def test_exact_then_prefix_then_substring(index):
+    assert names(index, "apple")[:4] == [
+        "Apple",
+        "Apple Juice",
+        "Green apple",
+        "Pineapple",
+    ]
+
+
+def test_short_query_matches_word_starts(index):
+    assert names(index, "ju") == ["Apple Juice", "Orange juice"]
+    assert names(index, "ui") == []
+
+
+def test_typo_tolerant_match(index):
+    assert "Banana" in names(index, "bananna")
+    assert names(index, "aple")[0] == "Aple sauce"
+    assert "Apple" in names(index, "aple")
+
+
+def test_pages_do_not_overlap(index):
+    first = index.search("apple", limit=2)
+    second = index.search("apple", limit=2, offset=2)
+    assert len(first) == len(second) == 2
+    assert not set(first) & set(second)
+
+
+def test_add_rename_and_remove(index):
+    index.add("8", "Apricot")
+    assert index.search("apri", limit=10) == ["8"]
+
+    index.apply([("8", {"name": "Apricot"}, {"name": "Plum"})])
+    assert index.search("apri", limit=10) == []
+    assert index.search("plum", limit=10) == ["8"]
+
+    index.apply([("8", {"name": "Plum"}, None)])
+    assert index.search("plum", limit=10) == []
+    assert len(index) == len(NAMES)
+
+
+def test_registry_applies_only_consecutive_versions():
+    indexes = SearchIndexes()
+    built = indexes.get_or_build("u1", "e.1", NameIndex)
+    assert indexes.get_or_build("u1", "e.1", lambda: None) is built
+
+    assert indexes.apply("u1", [("1", None, {"name": "Kiwi"})], "e.2")
+    assert built.search("kiwi", limit=1) == ["1"]
+
+    # A write this process did not see (e.3) leaves the index due a rebuild
+    assert not indexes.apply("u1", [("2", None, {"name": "Fig"})], "e.4")
+    assert built.search("fig", limit=1) == ["2"]
+
+
+def test_stale_index_is_served_while_rebuilding():
+    indexes = SearchIndexes()
+    stale = indexes.get_or_build("u1", "e.1", NameIndex)
+    release = threading.Event()
+
+    def slow_build():
+        release.wait(5)
+        return NameIndex.from_items([("9", "Fresh")])
+
+    assert indexes.get_or_build("u1", "e.7", slow_build) is stale
+    assert indexes.get_or_build("u1", "e.7", slow_build) is stale
+    assert indexes.stats()["rebuilding"] == 1
+
+    release.set()
+    for _ in range(500):
+        if not indexes.stats()["rebuilding"]:
+            break
+        time.sleep(0.01)
+    fresh = indexes.get_or_build("u1", "e.7", lambda: None)
+    assert fresh.search("fresh", limit=1) == ["9"]
+    assert indexes.stats()["builds"] == 2
+
+
+def test_registry_evicts_least_recently_used():
+    indexes = SearchIndexes(max_users=2)
+    for user in ("a", "b", "c"):
+        indexes.get_or_build(user, "e.1", NameIndex)
+    assert not indexes.tracks("a")
+    assert indexes.tracks("b") and indexes.tracks("c")
+
+
+def test_version_and_cursor_helpers():
+    assert next_version("abc.41") == "abc.42"
+    assert next_version("0") is None
+    assert decode_offset_cursor(encode_offset_cursor(40)) == 40
+    with pytest.raises(InvalidCursorError):
+        decode_offset_cursor("bogus")
@@ -0,0 +1,76 @@
+# tests/unit/test_startup.py
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Cold-start budget for `create_app()`, measured with `python -X importtime`.
+# The total is dominated by fastapi/pydantic/pymongo and varies by machine,
+# so it is generous and can be raised through the environment; what keeps
+# startup fast is checked by what gets imported and built, not by timing.
+TOTAL_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", 2500))
+
+# Never needed to serve requests: only the event bus or the vision model use them
+HEAVY_MODULES = ("pika", "torch", "ultralytics", "cv2")
+
+BUILD_APP = """
+import sys
+from backend.app import create_app
+from backend.inventory_management.core import config
+from shared_utils.db import mongo_client
+
+create_app()
+print(config.load_environment.cache_info().currsize)
+print(len(mongo_client._clients) + len(mongo_client._async_clients))
+print(",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def run_importtime(code: str):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    timings = []  # (module, self_us, cumulative_us, top_level)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        timings.append(
+            (
+                name.strip(),
+                int(self_us),
+                int(cumulative_us),
+                not name.startswith("  "),
+            )
+        )
+    return result.stdout.splitlines(), timings
+
+
+def test_create_app_within_import_budget():
+    output, timings = run_importtime(BUILD_APP.format(heavy=HEAVY_MODULES))
+    env_loaded, clients, heavy = output
+
+    total_ms = sum(cum for _, _, cum, top in timings if top) / 1000
+    assert total_ms <= TOTAL_BUDGET_MS, f"imports took {total_ms:.0f} ms"
+
+    # Building the app reads no settings and opens no connections
+    assert env_loaded == "0"
+    assert clients == "0"
+    assert heavy == ""
+
+
+def test_importing_backend_app_does_not_build_it():
+    output, timings = run_importtime(
+        "import sys, backend.app; "
+        "print('backend.inventory_management.api.routes' in sys.modules)"
+    )
+    assert output == ["False"]
+    assert not any(name.startswith("pymongo") for name, _, _, _ in timings)
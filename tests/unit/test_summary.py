@@ -0,0 +1,42 @@
+# tests/unit/test_summary.py
+
+from backend.inventory_management.db.summary import (
+    UNCATEGORIZED,
+    category_key,
+    merge_deltas,
+    summary_delta,
+)
+
+
+def test_create_and_delete_are_inverse():
+    item = {"quantity": 4, "category_id": "dairy"}
+    created = summary_delta(None, item)
+    assert created == {
+        "item_count": 1,
+        "total_units": 4,
+        "units_by_category.dairy": 4,
+    }
+    assert merge_deltas(created, summary_delta(item, None)) == {}
+
+
+def test_quantity_to_zero_counts_as_out_of_stock():
+    delta = summary_delta(
+        {"quantity": 2, "category_id": None}, {"quantity": 0, "category_id": None}
+    )
+    assert delta == {
+        "total_units": -2,
+        "zero_stock_count": 1,
+        f"units_by_category.{UNCATEGORIZED}": -2,
+    }
+
+
+def test_category_move_shifts_units():
+    delta = summary_delta(
+        {"quantity": 3, "category_id": "a"}, {"quantity": 3, "category_id": "b"}
+    )
+    assert delta == {"units_by_category.a": -3, "units_by_category.b": 3}
+
+
+def test_category_key_is_field_safe():
+    assert category_key("a.b$c") == "a_b_c"
+    assert category_key("") == UNCATEGORIZED
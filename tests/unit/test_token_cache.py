@@ -0,0 +1,98 @@
+# tests/unit/test_token_cache.py
+
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.inventory_management.api.auth import router as auth_router
+from backend.inventory_management.core import security
+from backend.inventory_management.core.security import (
+    TOKEN_CACHE,
+    create_access_token,
+    revoke_access_token,
+    verify_access_token,
+)
+
+SECRET = "test-secret"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    TOKEN_CACHE.clear()
+    TOKEN_CACHE.hits = TOKEN_CACHE.misses = 0
+    security._revoked.clear()
+    security._revoked_expiry.clear()
+    yield
+    TOKEN_CACHE.clear()
+    security._revoked.clear()
+    security._revoked_expiry.clear()
+
+
+def test_repeat_verification_is_served_from_cache():
+    token = create_access_token({"sub": "u1"}, secret_key=SECRET)
+    assert verify_access_token(token, SECRET) == "u1"
+    assert verify_access_token(token, SECRET) == "u1"
+    assert TOKEN_CACHE.stats()["hits"] == 1
+    assert TOKEN_CACHE.stats()["misses"] == 1
+
+
+def test_cache_entry_does_not_outlive_the_token(monkeypatch):
+    token = create_access_token(
+        {"sub": "u1"}, expires_delta=timedelta(minutes=1), secret_key=SECRET
+    )
+    assert verify_access_token(token, SECRET) == "u1"
+
+    real_time = security.time.time
+    monkeypatch.setattr(security.time, "time", lambda: real_time() + 120)
+    assert verify_access_token(token, SECRET) is None
+
+
+def test_cache_is_keyed_by_secret():
+    token = create_access_token({"sub": "u1"}, secret_key=SECRET)
+    assert verify_access_token(token, SECRET) == "u1"
+    assert verify_access_token(token, "another-secret") is None
+
+
+def test_revoked_token_is_rejected():
+    token = create_access_token({"sub": "u1"}, secret_key=SECRET)
+    assert verify_access_token(token, SECRET) == "u1"
+    assert revoke_access_token(token, SECRET)
+    assert verify_access_token(token, SECRET) is None
+    assert not revoke_access_token("not-a-token", SECRET)
+
+
+def test_revocations_are_only_forgotten_once_the_token_expires(monkeypatch):
+    def token(user_id, minutes):
+        return create_access_token(
+            {"sub": user_id},
+            expires_delta=timedelta(minutes=minutes),
+            secret_key=SECRET,
+        )
+
+    short, long = token("u1", 1), token("u2", 60)
+    assert revoke_access_token(short, SECRET)
+    assert revoke_access_token(long, SECRET)
+
+    real_time = security.time.time
+    monkeypatch.setattr(security.time, "time", lambda: real_time() + 120)
+    assert revoke_access_token(token("u3", 60), SECRET)
+
+    # The expired one made room; the long-lived one is still rejected
+    assert len(security._revoked) == 2
+    assert verify_access_token(long, SECRET) is None
+
+
+def test_logout_revokes_the_cookie_token():
+    app = FastAPI()
+    app.include_router(auth_router, prefix="/auth")
+    client = TestClient(app)
+    token = create_access_token({"sub": "u1"})
+
+    client.cookies.set("access_token", token)
+    assert client.get("/auth/me").json() == {"user_id": "u1"}
+    assert client.post("/auth/logout").status_code == 200
+
+    client.cookies.set("access_token", token)  # a client replaying the cookie
+    assert client.get("/auth/me").status_code == 401